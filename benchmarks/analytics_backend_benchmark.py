@@ -0,0 +1,179 @@
+# benchmarks/analytics_backend_benchmark.py
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from src.analysis.trend_analyzer import FashionTrendAnalyzer
+from src.data_collection.dataset_profiles import DATASET_PROFILES, get_profile_database
+from src.database.analytics_backend import available_backends
+from src.database.database_setup import DatabaseManager
+from src.database.migrations import migrate
+
+# Trend and post workloads of the dashboard and the predictor, run on a dataset profile
+TREND_QUERIES = {
+    'dashboard trends': "SELECT * FROM trend_history ORDER BY date_recorded DESC, score DESC, trend_id",
+    'monthly trend scores': """
+    SELECT trend_name, substr(date_recorded, 1, 7) AS month, AVG(score) AS avg_score, COUNT(*) AS days
+    FROM trend_history
+    GROUP BY trend_name, month
+    ORDER BY trend_name, month
+    """,
+    '7-day moving average': """
+    SELECT trend_name, date_recorded, score,
+           AVG(score) OVER (PARTITION BY trend_name ORDER BY date_recorded, trend_id
+                            ROWS BETWEEN 6 PRECEDING AND CURRENT ROW) AS score_7d
+    FROM trend_history
+    ORDER BY trend_name, date_recorded, trend_id
+    """,
+    'daily platform engagement': """
+    SELECT platform, substr(created_at, 1, 10) AS day, COUNT(*) AS posts,
+           SUM(likes) AS likes, SUM(comments) AS comments
+    FROM social_posts
+    WHERE duplicate_of IS NULL
+    GROUP BY platform, day
+    ORDER BY platform, day
+    """,
+    'top hashtags': """
+    SELECT t.term, COUNT(*) AS posts, SUM(sp.likes) AS likes
+    FROM post_terms pt
+    JOIN terms t ON t.term_id = pt.term_id
+    JOIN social_posts sp ON sp.post_id = pt.post_id
+    WHERE pt.term_type = 'hashtag'
+    GROUP BY t.term
+    ORDER BY posts DESC, t.term
+    LIMIT 100
+    """
+}
+
+# FashionTrendAnalyzer reports, run on a generated catalogue (the dataset profiles have no products)
+PRICING_REPORTS = {
+    'category pricing': 'analyze_category_pricing',
+    'brand pricing': 'analyze_brand_pricing',
+    'discount patterns': 'analyze_discount_patterns',
+    'brand performance': 'generate_brand_performance_report'
+}
+
+CATEGORIES = ['Jeans', 'Hoodies', 'Sneakers', 'Jackets', 'Dresses', 'Shirts', 'Boots', 'Bags', 'Skirts', 'Coats']
+
+
+def build_catalogue(db_path, products, prices_per_product, seed):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    conn.executemany("INSERT INTO brands (brand_id, brand_name) VALUES (?, ?)",
+                     [(i, f"Brand {i:03d}") for i in range(1, 201)])
+    conn.executemany("INSERT INTO categories (category_id, category_name) VALUES (?, ?)",
+                     list(enumerate(CATEGORIES, start=1)))
+    conn.executemany("""
+    INSERT INTO products (product_id, product_name, brand_id, category_id, created_at)
+    VALUES (?, ?, ?, ?, ?)
+    """, [(i, f"Product {i}", rng.randint(1, 200), rng.randint(1, len(CATEGORIES)),
+           f"2024-{rng.randint(1, 12):02d}-01 00:00:00")
+          for i in range(1, products + 1)])
+
+    started = datetime(2024, 1, 1)
+    for first in range(1, products + 1, 10000):
+        rows = []
+        for product_id in range(first, min(first + 10000, products + 1)):
+            price = round(rng.uniform(10, 400), 2)
+            for day in range(prices_per_product):
+                sale_price = round(price * rng.uniform(0.5, 0.95), 2) if rng.random() < 0.3 else None
+                rows.append((product_id, price, sale_price,
+                             (started + timedelta(days=day * 7)).strftime('%Y-%m-%d')))
+        conn.executemany("INSERT INTO price_history (product_id, price, sale_price, date_recorded) "
+                         "VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def time_query(run, repeat):
+    """Best wall time of `repeat` runs, in milliseconds, and the last result."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def same_frames(expected, actual):
+    try:
+        pd.testing.assert_frame_equal(expected, actual, check_exact=False, rtol=1e-9)
+        return True
+    except AssertionError as e:
+        print(f"    results differ: {e}")
+        return False
+
+
+def compare(db_path, snapshot_path, workloads, repeat, threads):
+    """Run each workload on both backends; returns rows of (name, sqlite ms, duckdb ms, same result)."""
+    managers = {
+        'sqlite': DatabaseManager(db_path, migrate=False, profile='analytics'),
+        'duckdb': DatabaseManager(db_path, migrate=False, profile='analytics', analytics_backend='duckdb',
+                                  snapshot_path=snapshot_path, threads=threads)
+    }
+    build_seconds = managers['duckdb'].analytics().refresh()
+
+    rows = []
+    for name, workload in workloads.items():
+        timings = {}
+        results = {}
+        for backend, db in managers.items():
+            timings[backend], results[backend] = time_query(lambda: workload(db), repeat)
+        rows.append((name, timings['sqlite'], timings['duckdb'], same_frames(results['sqlite'], results['duckdb'])))
+
+    for db in managers.values():
+        db.close()
+    return build_seconds, rows
+
+
+def report(title, build_seconds, rows):
+    print(f"\n{title} (DuckDB snapshot built in {build_seconds:.1f}s)")
+    print(f"{'query':<28}{'sqlite ms':>12}{'duckdb ms':>12}{'speedup':>10}  same result")
+    for name, sqlite_ms, duckdb_ms, same in rows:
+        print(f"{name:<28}{sqlite_ms:>12.1f}{duckdb_ms:>12.1f}{sqlite_ms / duckdb_ms:>9.1f}x  {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the SQLite and DuckDB analytics backends.")
+    parser.add_argument('--profile', choices=sorted(DATASET_PROFILES), default='prod',
+                        help="dataset profile for the trend and post queries")
+    parser.add_argument('--products', type=int, default=100000, help="products in the generated catalogue")
+    parser.add_argument('--prices', type=int, default=20, help="price history rows per product")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per query; the best time is reported")
+    parser.add_argument('--threads', type=int, default=None, help="DuckDB threads (default: one per core)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if 'duckdb' not in available_backends():
+        print("The duckdb package is not installed (pip install duckdb)")
+        sys.exit(1)
+
+    profile_path = get_profile_database(args.profile)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        workloads = {name: (lambda db, sql=sql: db.read_frame(sql)) for name, sql in TREND_QUERIES.items()}
+        build_seconds, rows = compare(profile_path, os.path.join(tmp_dir, 'profile.duckdb'), workloads,
+                                      args.repeat, args.threads)
+        report(f"Trend and post queries on the '{args.profile}' dataset", build_seconds, rows)
+
+        catalogue_path = os.path.join(tmp_dir, 'catalogue.db')
+        print(f"\nGenerating {args.products} products with {args.prices} prices each...")
+        build_catalogue(catalogue_path, args.products, args.prices, args.seed)
+        workloads = {name: (lambda db, method=method: getattr(FashionTrendAnalyzer(db_manager=db), method)())
+                     for name, method in PRICING_REPORTS.items()}
+        build_seconds, rows = compare(catalogue_path, os.path.join(tmp_dir, 'catalogue.duckdb'), workloads,
+                                      args.repeat, args.threads)
+        report(f"Pricing reports on {args.products * args.prices} prices", build_seconds, rows)
@@ -0,0 +1,160 @@
+# benchmarks/concurrency_benchmark.py
+
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from src.database.database_setup import DatabaseManager
+from src.database.migrations import migrate
+
+PLATFORMS = ['reddit', 'instagram', 'tiktok']
+WORDS = ['baggy', 'jeans', 'vintage', 'nike', 'oversized', 'hoodie', 'cargo', 'pants', 'platform', 'sneakers',
+         'thrift', 'haul', 'streetwear', 'denim', 'jacket', 'linen', 'shirt', 'boots', 'y2k', 'gorpcore']
+
+# What a dashboard refresh reads: top trends, the latest posts and a pass over all posts for the
+# per-platform charts (the dashboard itself loads the whole social_posts table)
+DASHBOARD_QUERIES = [
+    "SELECT * FROM trend_history ORDER BY date_recorded DESC, score DESC LIMIT 50",
+    "SELECT * FROM social_posts WHERE duplicate_of IS NULL ORDER BY post_id DESC LIMIT 200",
+    """
+    SELECT platform, COUNT(*), SUM(likes), SUM(comments)
+    FROM social_posts
+    WHERE duplicate_of IS NULL
+    GROUP BY platform
+    """
+]
+
+
+def post_rows(rng, start_id, count):
+    started = datetime(2024, 1, 1)
+    return [(start_id + i, rng.choice(PLATFORMS), f"https://example.com/p/{start_id + i}",
+             ' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))),
+             rng.randint(0, 5000), rng.randint(0, 300),
+             (started + timedelta(minutes=start_id + i)).strftime('%Y-%m-%d %H:%M:%S'))
+            for i in range(count)]
+
+
+def insert_posts(conn, rows):
+    conn.executemany("""
+    INSERT INTO social_posts (post_id, platform, post_url, caption, likes, comments, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+
+
+def build_database(db_path, posts, seed):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    for start in range(0, posts, 50000):
+        insert_posts(conn, post_rows(rng, start + 1, min(50000, posts - start)))
+    conn.executemany("INSERT INTO trend_history (trend_name, score, date_recorded) VALUES (?, ?, ?)",
+                     [(word, rng.random() * 100, f"2024-01-{day:02d}") for word in WORDS for day in range(1, 29)])
+    conn.commit()
+    conn.close()
+
+
+def ingest(db_path, mode, first_id, batches, batch_size, rate, seed, ready, results):
+    """Writer process: insert `batches` transactions of `batch_size` posts, at `rate` posts/sec (0: unthrottled)."""
+    rng = random.Random(seed)
+    if mode == 'baseline':
+        conn = sqlite3.connect(db_path, timeout=60)
+    else:
+        db = DatabaseManager(db_path, migrate=False, profile='ingest')
+        db.start_checkpoints(interval=1.0)
+        conn = db.create_connection()
+
+    ready.set()
+    started = time.perf_counter()
+    transaction_ms = []
+    for batch in range(batches):
+        if rate:
+            time.sleep(max(0.0, started + batch * batch_size / rate - time.perf_counter()))
+        rows = post_rows(rng, first_id + batch * batch_size, batch_size)
+        transaction_started = time.perf_counter()
+        insert_posts(conn, rows)
+        conn.commit()
+        transaction_ms.append((time.perf_counter() - transaction_started) * 1000)
+    conn.close()
+    results.put(transaction_ms)
+
+    if mode != 'baseline':
+        db.close()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def refresh(conn):
+    started = time.perf_counter()
+    for query in DASHBOARD_QUERIES:
+        conn.execute(query).fetchall()
+    return (time.perf_counter() - started) * 1000
+
+
+def run(mode, args):
+    db_path = os.path.join(tempfile.mkdtemp(), f'concurrency_{mode}.db')
+    build_database(db_path, args.posts, args.seed)
+
+    if mode == 'baseline':
+        conn = sqlite3.connect(db_path, timeout=60)
+        conn.execute("PRAGMA journal_mode=DELETE")
+        db = None
+    else:
+        DatabaseManager(db_path, migrate=False).close()  # switches the file to WAL
+        db = DatabaseManager(db_path, migrate=False, profile='analytics')
+        conn = db.create_connection()
+    idle = min(refresh(conn) for _ in range(5))
+
+    ready = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    writer = multiprocessing.Process(target=ingest, args=(db_path, mode, args.posts + 1, args.batches,
+                                                          args.batch_size, args.rate, args.seed + 1, ready, results))
+    writer.start()
+    ready.wait()
+
+    latencies = []
+    ingest_started = time.perf_counter()
+    while writer.is_alive():
+        latencies.append(refresh(conn))
+        time.sleep(args.refresh_interval)
+    transaction_ms = results.get()
+    writer.join()
+    ingest_seconds = time.perf_counter() - ingest_started
+
+    conn.close()
+    if db is not None:
+        db.close()
+
+    inserted = args.batches * args.batch_size
+    print(f"{mode}:")
+    print(f"  ingest     {inserted / ingest_seconds:8.0f} posts/sec, transaction p50 "
+          f"{percentile(transaction_ms, 0.5):7.1f} ms, p95 {percentile(transaction_ms, 0.95):7.1f} ms, "
+          f"max {max(transaction_ms):7.1f} ms")
+    print(f"  dashboard  {len(latencies):8d} refreshes, idle {idle:9.1f} ms, p50 {percentile(latencies, 0.5):7.1f} ms, "
+          f"p95 {percentile(latencies, 0.95):7.1f} ms, max {max(latencies):7.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure dashboard query latency while a bulk ingest is running.")
+    parser.add_argument('--posts', type=int, default=200000, help="posts in the database before the ingest starts")
+    parser.add_argument('--batches', type=int, default=50, help="transactions written by the ingest")
+    parser.add_argument('--batch-size', type=int, default=1000, help="posts per ingest transaction")
+    parser.add_argument('--rate', type=int, default=5000, help="ingest rate in posts/sec, 0 to write flat out")
+    parser.add_argument('--refresh-interval', type=float, default=0.1, help="seconds between dashboard refreshes")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    # Rollback journal with plain connections, as before PRAGMA profiles, then WAL with the ingest/analytics profiles
+    for mode in ['baseline', 'profiles']:
+        run(mode, args)
@@ -0,0 +1,89 @@
+# benchmarks/near_duplicate_benchmark.py
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from src.database.migrations import migrate
+from src.database.near_duplicates import DuplicateDetector
+
+WORDS = ['baggy', 'jeans', 'vintage', 'nike', 'oversized', 'hoodie', 'cargo', 'pants', 'platform', 'sneakers',
+         'thrift', 'haul', 'streetwear', 'fit', 'check', 'today', 'new', 'drop', 'love', 'this', 'look', 'with',
+         'denim', 'jacket', 'carhartt', 'workwear', 'minimal', 'wardrobe', 'essentials', 'y2k', 'aesthetic',
+         'chunky', 'boots', 'linen', 'shirt', 'summer', 'layers', 'gorpcore', 'shell', 'fleece']
+
+
+def random_caption(rng):
+    # Fashion words plus a long tail of rarer ones, like real captions
+    words = [rng.choice(WORDS) if rng.random() < 0.5 else f"w{int(rng.paretovariate(1.0) * 10)}"
+             for _ in range(rng.randint(12, 30))]
+    tags = [f"#{rng.choice(WORDS)}{rng.randint(0, 999)}" for _ in range(rng.randint(1, 4))]
+    return ' '.join(words + tags)
+
+
+def repost(rng, caption):
+    """A copy with a small edit, like a bot or repost account would make."""
+    words = caption.split()
+    edit = rng.choice(['none', 'append', 'case'])
+    if edit == 'append':
+        words.append('#repost')
+    elif edit == 'case':
+        words[0] = words[0].upper()
+    return ' '.join(words)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure near-duplicate lookups against an indexed corpus.")
+    parser.add_argument('--posts', type=int, default=200000, help="original posts indexed first")
+    parser.add_argument('--reposts', type=int, default=2000, help="near-duplicate posts checked one at a time")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    db_path = os.path.join(tempfile.mkdtemp(), 'near_duplicates.db')
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    cursor = conn.cursor()
+    detector = DuplicateDetector()
+
+    captions = [random_caption(rng) for _ in range(args.posts)]
+    cursor.executemany("INSERT INTO social_posts (post_id, platform, caption) VALUES (?, 'benchmark', ?)",
+                       enumerate(captions, start=1))
+
+    started = time.perf_counter()
+    for start in range(0, args.posts, 50000):
+        chunk = pd.DataFrame({'post_id': range(start + 1, min(start + 50000, args.posts) + 1),
+                              'caption': captions[start:start + 50000]})
+        detector.mark_posts(cursor, chunk)
+    conn.commit()
+    index_seconds = time.perf_counter() - started
+    chance = cursor.execute("SELECT COUNT(*) FROM social_posts WHERE duplicate_of IS NOT NULL").fetchone()[0]
+
+    originals = rng.sample(range(1, args.posts + 1), args.reposts)
+    reposts = [(args.posts + i + 1, repost(rng, captions[original - 1])) for i, original in enumerate(originals)]
+    cursor.executemany("INSERT INTO social_posts (post_id, platform, caption) VALUES (?, 'benchmark', ?)", reposts)
+
+    started = time.perf_counter()
+    for post_id, caption in reposts:
+        detector.mark_posts(cursor, pd.DataFrame({'post_id': [post_id], 'caption': [caption]}))
+    lookup_seconds = time.perf_counter() - started
+
+    found = dict(cursor.execute("SELECT post_id, duplicate_of FROM social_posts WHERE post_id > ?", (args.posts,)))
+    recall = sum(found.get(post_id) == original
+                 for (post_id, _), original in zip(reposts, originals)) / len(reposts)
+
+    print(f"indexed {args.posts} posts in {index_seconds:.1f}s ({args.posts / index_seconds:.0f} posts/sec), "
+          f"{chance} flagged by chance")
+    print(f"checked {len(reposts)} reposts one at a time: {lookup_seconds / len(reposts) * 1000:.3f} ms/post "
+          f"(including the DataFrame per call), recall {recall:.1%}")
+    conn.close()
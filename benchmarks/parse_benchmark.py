@@ -0,0 +1,89 @@
+# benchmarks/parse_benchmark.py
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from src.data_collection.product_parser import ProductParser, DEFAULT_SPEC
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixtures(fixtures_dir):
+    """Raw bytes of every saved HTML page in the fixtures directory."""
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, '*.html'))):
+        with open(path, 'rb') as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+
+def full_tree_parse(parser_name):
+    """Build the whole document with `parser_name`, then extract (the old scraper path)."""
+    product_parser = ProductParser(parser=parser_name)
+
+    def parse(content, url):
+        soup = BeautifulSoup(content, parser_name)
+        return product_parser.extract(soup, url, DEFAULT_SPEC)
+    return parse
+
+
+def strained_parse():
+    """lxml with the spec's SoupStrainer (the current scraper path)."""
+    product_parser = ProductParser(specs={})
+    return product_parser.parse
+
+
+def run_benchmark(pages, parse, iterations):
+    """Parse every page `iterations` times. Returns pages per second."""
+    url = 'https://shop.example.com/product'
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for content in pages.values():
+            parse(content, url)
+    elapsed = time.perf_counter() - started
+    return iterations * len(pages) / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure product page parse throughput.")
+    parser.add_argument('--iterations', type=int, default=50, help="passes over the fixture set")
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help="directory of saved product pages")
+    args = parser.parse_args()
+
+    pages = load_fixtures(args.fixtures)
+    if not pages:
+        print(f"No HTML fixtures found in {args.fixtures}")
+        sys.exit(1)
+
+    # Every strategy should extract the same fields
+    url = 'https://shop.example.com/product'
+    for name, content in pages.items():
+        baseline = full_tree_parse('html.parser')(content, url)
+        fast = strained_parse()(content, url)
+        if baseline != fast:
+            print(f"Warning: extraction differs for {name}:\n  {baseline}\n  {fast}")
+
+    size_kb = sum(len(content) for content in pages.values()) / 1024
+    print(f"{len(pages)} fixtures ({size_kb:.0f} KB), {args.iterations} iterations\n")
+
+    strategies = [
+        ('html.parser, full tree', full_tree_parse('html.parser')),
+        ('lxml, full tree', full_tree_parse('lxml')),
+        ('lxml + SoupStrainer', strained_parse())
+    ]
+
+    baseline_rate = None
+    for label, parse in strategies:
+        rate = run_benchmark(pages, parse, args.iterations)
+        if baseline_rate is None:
+            baseline_rate = rate
+        print(f"{label:<25} {rate:8.1f} pages/sec  ({rate / baseline_rate:.1f}x)")
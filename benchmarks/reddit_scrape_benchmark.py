@@ -0,0 +1,58 @@
+# benchmarks/reddit_scrape_benchmark.py
+
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from src.data_collection.reddit_scraper import RedditFashionScraper
+from src.data_collection.fake_reddit import FakeReddit
+
+
+def make_scraper(args):
+    if args.recording:
+        reddit = FakeReddit.load(args.recording, latency=args.latency, budget=args.budget, window=args.window)
+    else:
+        # Subreddit names only matter for the fake listings; take them from a throwaway scraper
+        names = make_scraper_for(FakeReddit({})).fashion_subreddits
+        reddit = FakeReddit.synthetic(names, posts_per_subreddit=args.posts, latency=args.latency,
+                                      budget=args.budget, window=args.window)
+    return make_scraper_for(reddit)
+
+
+def make_scraper_for(reddit):
+    return RedditFashionScraper(None, None, None, db_manager=None, reddit=reddit)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare serial and pooled Reddit scraping against a fake API.")
+    parser.add_argument('--recording', default=None, help="JSON listings recorded with fake_reddit.record_listings")
+    parser.add_argument('--posts', type=int, default=20, help="synthetic posts per subreddit")
+    parser.add_argument('--latency', type=float, default=0.05, help="simulated seconds per API call")
+    parser.add_argument('--budget', type=int, default=1000, help="API calls allowed per window")
+    parser.add_argument('--window', type=int, default=600, help="rate-limit window in seconds")
+    parser.add_argument('--workers', type=int, default=8, help="worker threads for the pooled run")
+    args = parser.parse_args()
+
+    scraper = make_scraper(args)
+    started = time.perf_counter()
+    serial = [row for name in scraper.fashion_subreddits for row in scraper.scrape_subreddit(name)]
+    serial_seconds = time.perf_counter() - started
+    serial_calls = scraper.reddit.request_count
+
+    scraper = make_scraper(args)
+    started = time.perf_counter()
+    results = scraper.scrape_subreddits(scraper.fashion_subreddits, max_workers=args.workers)
+    pooled = [row for name in scraper.fashion_subreddits for row in results[name]]
+    pooled_seconds = time.perf_counter() - started
+
+    if serial != pooled:
+        print("Warning: pooled scrape returned different rows than the serial scrape")
+
+    print(f"serial: {len(serial)} rows, {serial_calls} API calls in {serial_seconds:.2f}s")
+    print(f"pooled: {len(pooled)} rows, {scraper.reddit.request_count} API calls in {pooled_seconds:.2f}s "
+          f"({args.workers} workers, {scraper.rate_limiter.waited:.2f}s spent pacing)")
@@ -0,0 +1,35 @@
+-- Social media posts and the trend scores derived from them
+
+CREATE TABLE IF NOT EXISTS social_posts (
+    post_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    platform TEXT NOT NULL,  -- instagram, tiktok, etc.
+    post_url TEXT,
+    username TEXT,
+    followers INTEGER,
+    caption TEXT,
+    likes INTEGER,
+    comments INTEGER,
+    shares INTEGER,
+    created_at TIMESTAMP,
+    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS trend_history (
+    trend_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    trend_name TEXT NOT NULL,
+    score FLOAT,
+    platform TEXT,
+    date_recorded DATE,
+    UNIQUE(trend_name, platform, date_recorded)
+);
+
+CREATE TABLE IF NOT EXISTS influencer_mentions (
+    mention_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    influencer_name TEXT,
+    follower_count INTEGER,
+    brand_mentioned TEXT,
+    product_mentioned TEXT,
+    sentiment_score FLOAT,
+    engagement_rate FLOAT,
+    date_posted DATE
+);
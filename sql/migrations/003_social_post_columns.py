@@ -0,0 +1,24 @@
+# Columns the Reddit scraper and the enhanced generator used to add on the fly.
+# Older databases may already have some of them, so each is added only if missing.
+
+NEW_COLUMNS = {
+    'social_posts': [
+        ('subreddit', 'TEXT'),
+        ('hashtags', 'TEXT'),
+        ('keywords', 'TEXT'),
+        ('brands', 'TEXT'),
+        ('duplicate_of', 'INTEGER')  # set for near-duplicate reposts, see near_duplicates.py
+    ],
+    'trend_history': [
+        ('category', 'TEXT')
+    ]
+}
+
+
+def upgrade(cursor):
+    for table, columns in NEW_COLUMNS.items():
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for column, column_type in columns:
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
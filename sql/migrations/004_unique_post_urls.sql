@@ -0,0 +1,7 @@
+-- A post URL is stored once: drop repeats (keeping the first) and enforce it
+
+DELETE FROM social_posts
+WHERE post_url IS NOT NULL
+  AND post_id NOT IN (SELECT MIN(post_id) FROM social_posts WHERE post_url IS NOT NULL GROUP BY post_url);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_social_posts_url ON social_posts(post_url);
@@ -0,0 +1,34 @@
+# Natural keys, so a re-scraped product updates its row instead of adding a new one.
+# Existing duplicates are merged into the oldest row before each unique index is created.
+
+UNIQUE_INDEXES = [
+    ('brands', 'idx_brands_name_unique', ['brand_name'], 'brand_id'),
+    ('categories', 'idx_categories_name_unique', ['category_name'], 'category_id'),
+    ('products', 'idx_products_natural_key', ['brand_id', 'product_name'], 'product_id')
+]
+
+# Tables pointing at a row that may be merged away as a duplicate
+DUPLICATE_REFERENCES = {
+    'brands': [('products', 'brand_id')],
+    'categories': [('products', 'category_id'), ('categories', 'parent_category_id')],
+    'products': [('price_history', 'product_id'), ('popularity_metrics', 'product_id')]
+}
+
+
+def upgrade(cursor):
+    for table, index_name, columns, id_column in UNIQUE_INDEXES:
+        key = ', '.join(columns)
+        cursor.execute(f"""
+        SELECT {id_column}, MIN({id_column}) OVER (PARTITION BY {key})
+        FROM {table}
+        WHERE {' AND '.join(f'{column} IS NOT NULL' for column in columns)}
+        """)
+        duplicates = [(keep_id, dup_id) for dup_id, keep_id in cursor.fetchall() if dup_id != keep_id]
+
+        if duplicates:
+            print(f"Merging {len(duplicates)} duplicate rows in {table}")
+            for ref_table, ref_column in DUPLICATE_REFERENCES[table]:
+                cursor.executemany(f"UPDATE {ref_table} SET {ref_column} = ? WHERE {ref_column} = ?", duplicates)
+            cursor.executemany(f"DELETE FROM {table} WHERE {id_column} = ?", [(dup_id,) for _, dup_id in duplicates])
+
+        cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {table}({key})")
@@ -0,0 +1,8 @@
+-- Where each incremental scrape stopped
+
+CREATE TABLE IF NOT EXISTS scrape_checkpoints (
+    source TEXT PRIMARY KEY,  -- e.g. reddit:streetwear
+    last_created_utc REAL,
+    last_post_ids TEXT,  -- JSON list of the newest post ids seen
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,19 @@
+-- Hashtags, keywords and brands normalized out of social_posts at ingest
+
+CREATE TABLE IF NOT EXISTS terms (
+    term_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    term TEXT NOT NULL,
+    term_type TEXT NOT NULL,  -- hashtag, keyword or brand
+    UNIQUE(term, term_type)
+);
+
+CREATE TABLE IF NOT EXISTS post_terms (
+    post_id INTEGER NOT NULL,
+    term_id INTEGER NOT NULL,
+    term_type TEXT NOT NULL,
+    PRIMARY KEY (post_id, term_id),
+    FOREIGN KEY (post_id) REFERENCES social_posts(post_id),
+    FOREIGN KEY (term_id) REFERENCES terms(term_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_post_terms_term ON post_terms(term_id);
@@ -0,0 +1,14 @@
+-- Caption MinHash signatures and their LSH bands, see src/database/near_duplicates.py
+
+CREATE TABLE IF NOT EXISTS caption_signatures (
+    post_id INTEGER PRIMARY KEY,
+    minhash BLOB NOT NULL,  -- 32-bit MinHash values of the caption's shingles
+    FOREIGN KEY (post_id) REFERENCES social_posts(post_id)
+);
+
+CREATE TABLE IF NOT EXISTS minhash_bands (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,  -- hash of the band's MinHash values
+    post_id INTEGER NOT NULL,
+    PRIMARY KEY (band, bucket, post_id)
+) WITHOUT ROWID;
@@ -0,0 +1,19 @@
+-- Resumable crawl queue, see src/data_collection/crawl_frontier.py
+
+CREATE TABLE IF NOT EXISTS crawl_jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,  -- product, hashtag, subreddit
+    target TEXT NOT NULL,  -- URL, hashtag or subreddit name
+    state TEXT NOT NULL DEFAULT 'pending',  -- pending, leased, done, failed
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(source, target)
+);
+
+CREATE INDEX IF NOT EXISTS idx_crawl_jobs_queue ON crawl_jobs(state, priority DESC, job_id);
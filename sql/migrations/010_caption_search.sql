@@ -0,0 +1,28 @@
+-- Full-text index over social_posts.caption, see src/database/caption_search.py
+-- External content: the index stores no copy of the captions, and the triggers keep it in step with social_posts
+
+CREATE VIRTUAL TABLE IF NOT EXISTS caption_fts USING fts5(
+    caption,
+    content='social_posts',
+    content_rowid='post_id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+-- Terms of the index with the number of posts (doc) and mentions (cnt) of each
+CREATE VIRTUAL TABLE IF NOT EXISTS caption_vocab USING fts5vocab(caption_fts, row);
+
+CREATE TRIGGER IF NOT EXISTS social_posts_fts_insert AFTER INSERT ON social_posts BEGIN
+    INSERT INTO caption_fts (rowid, caption) VALUES (new.post_id, new.caption);
+END;
+
+CREATE TRIGGER IF NOT EXISTS social_posts_fts_delete AFTER DELETE ON social_posts BEGIN
+    INSERT INTO caption_fts (caption_fts, rowid, caption) VALUES ('delete', old.post_id, old.caption);
+END;
+
+CREATE TRIGGER IF NOT EXISTS social_posts_fts_update AFTER UPDATE OF caption ON social_posts BEGIN
+    INSERT INTO caption_fts (caption_fts, rowid, caption) VALUES ('delete', old.post_id, old.caption);
+    INSERT INTO caption_fts (rowid, caption) VALUES (new.post_id, new.caption);
+END;
+
+-- Index the posts stored before this migration
+INSERT INTO caption_fts (caption_fts) VALUES ('rebuild');
@@ -0,0 +1,3 @@
+-- Date-range lookups on posts: retention archiving, caption search filters, recent-post windows
+
+CREATE INDEX IF NOT EXISTS idx_social_posts_created ON social_posts(created_at);
@@ -0,0 +1,42 @@
+# Row counts and last-write times per table, kept current by triggers, so status checks
+# read one small table instead of counting every row (see src/database/table_stats.py).
+# Writers must not use INSERT OR REPLACE on these tables: the rows it replaces are
+# deleted without firing the delete trigger. Use INSERT ... ON CONFLICT DO UPDATE.
+
+TRACKED_TABLES = [
+    'brands', 'categories', 'products', 'price_history', 'popularity_metrics',
+    'social_posts', 'trend_history', 'influencer_mentions', 'scrape_checkpoints',
+    'terms', 'post_terms', 'caption_signatures', 'minhash_bands', 'crawl_jobs'
+]
+
+TRIGGERS = {
+    'insert': "AFTER INSERT ON {table} BEGIN UPDATE table_stats SET row_count = row_count + 1, "
+              "last_write_at = CURRENT_TIMESTAMP WHERE table_name = '{table}'; END",
+    'delete': "AFTER DELETE ON {table} BEGIN UPDATE table_stats SET row_count = row_count - 1, "
+              "last_write_at = CURRENT_TIMESTAMP WHERE table_name = '{table}'; END",
+    'update': "AFTER UPDATE ON {table} BEGIN UPDATE table_stats SET "
+              "last_write_at = CURRENT_TIMESTAMP WHERE table_name = '{table}'; END"
+}
+
+
+def upgrade(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS table_stats (
+        table_name TEXT PRIMARY KEY,
+        row_count INTEGER NOT NULL DEFAULT 0,
+        last_write_at TIMESTAMP,  -- last insert, update or delete; NULL if none since tracking began
+        table_bytes INTEGER,  -- on-disk size from dbstat, as of sized_at
+        index_bytes INTEGER,
+        sized_at TIMESTAMP
+    )
+    """)
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    existing = {row[0] for row in cursor.fetchall()}
+    for table in TRACKED_TABLES:
+        if table not in existing:
+            continue
+        cursor.execute(f"INSERT OR IGNORE INTO table_stats (table_name, row_count) "
+                       f"SELECT '{table}', COUNT(*) FROM {table}")
+        for event, body in TRIGGERS.items():
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS table_stats_{table}_{event} {body.format(table=table)}")
@@ -4,8 +4,6 @@ import os
 import sys
 import pandas as pd
 from datetime import datetime
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,46 +11,60 @@ sys.path.append(project_root)
 
 from src.database.database_setup import DatabaseManager
 from src.analysis.social_trend_analyzer import SocialTrendAnalyzer
+from src.visualization.chart_renderer import ChartRenderer
 
 
-def analyze_social_trends():
-    """Run trend analysis on the collected social media data."""
-    # Initialize database manager
-    db = DatabaseManager()
+def count_social_posts(db):
+    """Number of social media posts in the database, leaving out near-duplicate reposts."""
+    conn = db.create_connection()
+    count = conn.execute("SELECT COUNT(*) FROM social_posts WHERE duplicate_of IS NULL").fetchone()[0]
+    conn.close()
 
-    # Create analyzer
-    analyzer = SocialTrendAnalyzer(db)
+    return count
 
-    # Get social media posts from database
-    print("Fetching social media data...")
-    conn = db.create_connection()
 
-    posts_query = "SELECT * FROM social_posts"
-    posts_df = pd.read_sql_query(posts_query, conn)
-    conn.close()
+def score_social_trends(analyzer, total_posts):
+    """Score trends from the stored post terms and build the trend report."""
+    trend_scores = analyzer.analyze_stored_posts()
+    report = analyzer.generate_trend_report(trend_scores=trend_scores, total_posts=total_posts)
 
-    print(f"Found {len(posts_df)} posts in database.")
+    return trend_scores, report
 
-    if len(posts_df) == 0:
-        print("No posts found. Please run the scrapers first.")
-        return
 
-    # Convert to format expected by analyzer
-    posts_data = posts_df.to_dict('records')
+def save_trend_scores(db, trend_scores, platform='instagram'):
+    """Save today's trend scores to trend_history and return the saved rows."""
+    today = datetime.now().strftime('%Y-%m-%d')
+    trend_rows = pd.DataFrame(
+        [(trend, score, platform, today) for trend, score in trend_scores.items()],
+        columns=['trend_name', 'score', 'platform', 'date_recorded']
+    )
 
-    # Analyze trends
-    print("\nAnalyzing social media trends...")
-    trend_scores = analyzer.analyze_social_posts(posts_data)
+    conn = db.create_connection()
+    cursor = conn.cursor()
+
+    # Re-running on the same day replaces the earlier score instead of failing on the unique key.
+    # An upsert rather than INSERT OR REPLACE, whose implicit deletes would skip the table_stats triggers
+    insert_sql = """
+    INSERT INTO trend_history (trend_name, score, platform, date_recorded)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(trend_name, platform, date_recorded) DO UPDATE SET score = excluded.score
+    """
+    cursor.executemany(insert_sql, trend_rows.itertuples(index=False, name=None))
+
+    conn.commit()
+    conn.close()
 
+    return trend_rows
+
+
+def print_trend_report(trend_scores, report):
+    """Print the top trends and the categorized trend report."""
     # Print top trends
     print("\nTop Fashion Trends:")
     print("-" * 30)
     for trend, score in sorted(trend_scores.items(), key=lambda x: x[1], reverse=True)[:10]:
         print(f"{trend}: {score:.2f}")
 
-    # Generate trend report
-    report = analyzer.generate_trend_report(posts_data)
-
     print("\nTrend Report:")
     print("-" * 30)
     print(f"Date: {report['date']}")
@@ -68,58 +80,60 @@ def analyze_social_trends():
             for trend, score in trends[:3]:  # Show top 3 per category
                 print(f"  {trend}: {score:.2f}")
 
-    # Save trend data to database
-    print("\nSaving trend data to database...")
-    conn = db.create_connection()
-    cursor = conn.cursor()
 
-    today = datetime.now().strftime('%Y-%m-%d')
+def analyze_social_trends(renderer=None):
+    """Run trend analysis on the collected social media data.
 
-    for trend, score in trend_scores.items():
-        insert_sql = """
-        INSERT INTO trend_history (trend_name, score, platform, date_recorded)
-        VALUES (?, ?, ?, ?)
-        """
-        cursor.execute(insert_sql, (trend, score, 'instagram', today))
+    Returns as soon as the trend scores are saved; charts keep rendering in the
+    background on the returned ChartRenderer.
+    """
+    # Initialize database manager
+    db = DatabaseManager()
 
-    conn.commit()
-    conn.close()
+    # Create analyzer
+    analyzer = SocialTrendAnalyzer(db)
 
-    # Create visualizations
-    print("\nCreating visualizations...")
-    create_trend_visualizations(trend_scores, report)
+    # Get social media posts from database
+    print("Fetching social media data...")
+    total_posts = count_social_posts(db)
 
-    print("\nAnalysis complete!")
+    print(f"Found {total_posts} posts in database.")
+
+    if total_posts == 0:
+        print("No posts found. Please run the scrapers first.")
+        return
 
+    # Analyze trends
+    print("\nAnalyzing social media trends...")
+    trend_scores, report = score_social_trends(analyzer, total_posts)
+    print_trend_report(trend_scores, report)
 
-def create_trend_visualizations(trend_scores, report):
-    """Create visualizations for trend analysis."""
-    # Create directory for visualizations
-    viz_dir = os.path.join(project_root, 'data', 'visualizations')
-    os.makedirs(viz_dir, exist_ok=True)
+    # Save trend data to database
+    print("\nSaving trend data to database...")
+    save_trend_scores(db, trend_scores)
 
-    # 1. Bar chart of top trends
-    plt.figure(figsize=(12, 8))
-    trends = sorted(trend_scores.items(), key=lambda x: x[1], reverse=True)[:10]
+    # Queue visualizations; they render off the critical path
+    print("\nCreating visualizations...")
+    if renderer is None:
+        renderer = ChartRenderer(os.path.join(project_root, 'data', 'visualizations'))
+    create_trend_visualizations(trend_scores, report, renderer=renderer)
+
+    print("\nAnalysis complete!")
+    return renderer
 
-    x = [t[0] for t in trends]
-    y = [t[1] for t in trends]
 
-    bars = plt.bar(x, y, color=sns.color_palette("viridis", len(trends)))
-    plt.xticks(rotation=45, ha='right')
-    plt.title('Top Fashion Trends by Score', fontsize=16)
-    plt.xlabel('Trend', fontsize=14)
-    plt.ylabel('Score', fontsize=14)
-    plt.tight_layout()
+def create_trend_visualizations(trend_scores, report, renderer=None):
+    """Queue visualizations for trend analysis and return the image paths.
 
-    # Add value labels
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width() / 2., height + 0.1,
-                 f'{height:.2f}', ha='center', va='bottom', fontsize=10)
+    Charts are rendered by a background ChartRenderer. Without a renderer, a
+    temporary one is created and this call waits for rendering to finish.
+    """
+    owns_renderer = renderer is None
+    if owns_renderer:
+        renderer = ChartRenderer(os.path.join(project_root, 'data', 'visualizations'))
 
-    plt.savefig(os.path.join(viz_dir, 'top_trends.png'))
-    plt.close()
+    # 1. Bar chart of top trends
+    paths = [renderer.submit('top_trends', 'top_trends.png', dict(trend_scores))]
 
     # 2. Pie chart of trend categories
     category_scores = {}
@@ -128,21 +142,20 @@ def create_trend_visualizations(trend_scores, report):
             category_scores[category] = sum([score for _, score in trends])
 
     if category_scores:
-        plt.figure(figsize=(10, 8))
-        plt.pie(
-            category_scores.values(),
-            labels=category_scores.keys(),
-            autopct='%1.1f%%',
-            colors=sns.color_palette("viridis", len(category_scores))
-        )
-        plt.title('Fashion Trends by Category', fontsize=16)
-        plt.axis('equal')
-        plt.tight_layout()
-        plt.savefig(os.path.join(viz_dir, 'trend_categories.png'))
-        plt.close()
-
-    print(f"Visualizations saved to {viz_dir}")
+        paths.append(renderer.submit('trend_categories', 'trend_categories.png', category_scores))
+
+    if owns_renderer:
+        renderer.close()
+        print(f"Visualizations saved to {renderer.output_dir}")
+    else:
+        print(f"Queued {len(paths)} visualizations for {renderer.output_dir}")
+
+    return paths
 
 
 if __name__ == "__main__":
-    analyze_social_trends()
\ No newline at end of file
+    renderer = analyze_social_trends()
+    if renderer:
+        manifest = renderer.wait()
+        print(f"Rendered {len(manifest['images'])} charts, manifest at {manifest['manifest_path']}")
+        renderer.close()
\ No newline at end of file
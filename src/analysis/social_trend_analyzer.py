@@ -8,6 +8,8 @@ from collections import Counter
 import re
 from textblob import TextBlob
 
+from src.database.term_store import CAPTION_KEYWORDS
+
 
 class SocialTrendAnalyzer:
     def __init__(self, db_manager):
@@ -16,16 +18,18 @@ class SocialTrendAnalyzer:
             '#streetwear', '#OOTD', '#fashiontrends',
             '#vintage', '#y2k', '#grwm', '#fashiontiktok'
         ]
-        self.fashion_keywords = [
-            'baggy', 'oversized', 'vintage', 'y2k', 'cargo',
-            'platform', 'chunky', 'streetwear', 'aesthetic'
-        ]
+        # Also extracted from captions into post_terms at ingest
+        self.fashion_keywords = list(CAPTION_KEYWORDS)
 
     def analyze_social_posts(self, posts_data):
         """Analyze social media posts for fashion trends."""
         trend_scores = Counter()
 
         for post in posts_data:
+            # Near-duplicate reposts only count once, through the original post
+            if pd.notna(post.get('duplicate_of')):
+                continue
+
             # Extract hashtags
             hashtags = re.findall(r'#\w+', post['caption'])
 
@@ -47,6 +51,30 @@ class SocialTrendAnalyzer:
 
         return trend_scores
 
+    def analyze_stored_posts(self):
+        """Score the trends of every stored post from the terms extracted at ingest.
+
+        The same weighting as analyze_social_posts, aggregated in one GROUP BY
+        over post_terms, so no caption is parsed here. Terms are the lowercase
+        ones TermStore stores, each counted once per post. Near-duplicate
+        reposts and posts without followers (e.g. Reddit) are left out.
+        """
+        placeholders = ', '.join('?' * len(self.fashion_keywords))
+        scores = self.db_manager.read_frame(f"""
+        SELECT t.term,
+               SUM((sp.likes + sp.comments) * 1.0 / sp.followers
+                   * CASE WHEN pt.term_type = 'hashtag' THEN 10 ELSE 5 END) AS score
+        FROM post_terms pt
+        JOIN terms t ON t.term_id = pt.term_id
+        JOIN social_posts sp ON sp.post_id = pt.post_id
+        WHERE sp.duplicate_of IS NULL AND sp.followers > 0
+          AND (pt.term_type = 'hashtag' OR (pt.term_type = 'keyword' AND t.term IN ({placeholders})))
+        GROUP BY t.term
+        ORDER BY t.term
+        """, [keyword.lower() for keyword in self.fashion_keywords])
+
+        return Counter(dict(zip(scores['term'], scores['score'].astype(float))))
+
     def detect_emerging_trends(self, historical_data, current_data):
         """Detect which trends are emerging vs. declining."""
         emerging = {}
@@ -88,9 +116,15 @@ class SocialTrendAnalyzer:
 
         return average_sentiment
 
-    def generate_trend_report(self, social_data):
-        """Generate comprehensive trend report."""
-        trend_scores = self.analyze_social_posts(social_data)
+    def generate_trend_report(self, social_data=None, trend_scores=None, total_posts=None):
+        """Generate comprehensive trend report.
+
+        Scores `social_data` (post dicts), or reports on `trend_scores` already
+        computed from `total_posts` posts (e.g. by analyze_stored_posts).
+        """
+        if trend_scores is None:
+            trend_scores = self.analyze_social_posts(social_data)
+            total_posts = len(social_data)
 
         # Get top trends
         top_trends = sorted(trend_scores.items(), key=lambda x: x[1], reverse=True)[:20]
@@ -101,7 +135,7 @@ class SocialTrendAnalyzer:
         report = {
             'date': datetime.now().strftime('%Y-%m-%d'),
             'top_trends': top_trends,
-            'total_posts_analyzed': len(social_data),
+            'total_posts_analyzed': total_posts,
             'categories': self.categorize_trends(top_trends)
         }
 
@@ -126,45 +160,26 @@ class SocialTrendAnalyzer:
         return categorized
 
 
-# Create database schema for social data
-def create_social_schema():
-    """Create schema for social media data."""
-    schema = """
-    CREATE TABLE IF NOT EXISTS social_posts (
-        post_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        platform TEXT NOT NULL,  -- instagram, tiktok, etc.
-        post_url TEXT,
-        username TEXT,
-        followers INTEGER,
-        caption TEXT,
-        likes INTEGER,
-        comments INTEGER,
-        shares INTEGER,
-        created_at TIMESTAMP,
-        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    );
-
-    CREATE TABLE IF NOT EXISTS trend_history (
-        trend_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        trend_name TEXT NOT NULL,
-        score FLOAT,
-        platform TEXT,
-        date_recorded DATE,
-        UNIQUE(trend_name, platform, date_recorded)
-    );
-
-    CREATE TABLE IF NOT EXISTS influencer_mentions (
-        mention_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        influencer_name TEXT,
-        follower_count INTEGER,
-        brand_mentioned TEXT,
-        product_mentioned TEXT,
-        sentiment_score FLOAT,
-        engagement_rate FLOAT,
-        date_posted DATE
-    );
+def ensure_post_url_index(cursor):
+    """Remove duplicate social posts by URL (keeping the first) and add a unique index on post_url.
+
+    Migration 004 does this once per database; bulk loads that drop the index rebuild it here.
     """
-    return schema
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_social_posts_url'")
+    if cursor.fetchone():
+        return 0
+
+    cursor.execute("""
+    DELETE FROM social_posts
+    WHERE post_url IS NOT NULL
+      AND post_id NOT IN (SELECT MIN(post_id) FROM social_posts WHERE post_url IS NOT NULL GROUP BY post_url)
+    """)
+    removed = cursor.rowcount
+    if removed:
+        print(f"Removed {removed} duplicate social posts")
+
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_social_posts_url ON social_posts(post_url)")
+    return removed
 
 
 # Add this at the bottom of social_trend_analyzer.py
@@ -172,25 +187,9 @@ def create_social_schema():
 if __name__ == "__main__":
     from src.database.database_setup import DatabaseManager
 
-    # Initialize database
+    # Initialize database (applies any pending schema migrations)
     db = DatabaseManager()
 
-    # Create social media schema
-    schema_sql = create_social_schema()
-
-    # Apply schema to database
-    try:
-        conn = db.create_connection()
-        cursor = conn.cursor()
-        cursor.executescript(schema_sql)
-        conn.commit()
-        print("Social media schema created successfully")
-    except Exception as e:
-        print(f"Error creating schema: {e}")
-    finally:
-        if conn:
-            conn.close()
-
     # Create analyzer instance
     analyzer = SocialTrendAnalyzer(db)
 
@@ -1,20 +1,28 @@
-import pandas as pd
 import numpy as np
-from sqlalchemy import create_engine, text
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
 import os
+import sys
 from textblob import TextBlob
 
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.database.database_setup import DatabaseManager
+from src.visualization.chart_renderer import (
+    ChartRenderer, category_distribution_figure, price_range_by_category_figure
+)
+
 
 class FashionTrendAnalyzer:
-    def __init__(self, db_path='data/fashion_trends.db'):
+    def __init__(self, db_path='data/fashion_trends.db', db_manager=None):
         # Get the absolute path to the database
         project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        self.db_path = os.path.join(project_root, db_path)
         self.project_root = project_root
-        self.engine = create_engine(f'sqlite:///{self.db_path}')
+        # Queries go through DatabaseManager.read_frame, so the manager picks the backend (SQLite or DuckDB)
+        if db_manager is None:
+            db_manager = DatabaseManager(os.path.join(project_root, db_path), migrate=False)
+        self.db_manager = db_manager
+        self.db_path = db_manager.db_path
 
         # Create directories for saving plots if they don't exist
         self.ensure_directories_exist()
@@ -36,7 +44,7 @@ class FashionTrendAnalyzer:
         LEFT JOIN brands b ON p.brand_id = b.brand_id
         LEFT JOIN categories c ON p.category_id = c.category_id
         """
-        return pd.read_sql_query(query, self.engine)
+        return self.db_manager.read_frame(query)
 
     def get_price_history_df(self):
         """Get all price history data with product information."""
@@ -47,118 +55,98 @@ class FashionTrendAnalyzer:
         LEFT JOIN brands b ON p.brand_id = b.brand_id
         LEFT JOIN categories c ON p.category_id = c.category_id
         """
-        return pd.read_sql_query(query, self.engine)
+        return self.db_manager.read_frame(query)
+
+    def price_summary(self, group_column, label):
+        """Average, min and max price and number of prices per brand or category, computed by the database."""
+        query = f"""
+        SELECT {group_column} AS "{label}", AVG(ph.price) AS "Average Price",
+               MIN(ph.price) AS "Min Price", MAX(ph.price) AS "Max Price", COUNT(ph.price) AS "Count"
+        FROM price_history ph
+        LEFT JOIN products p ON ph.product_id = p.product_id
+        LEFT JOIN brands b ON p.brand_id = b.brand_id
+        LEFT JOIN categories c ON p.category_id = c.category_id
+        WHERE {group_column} IS NOT NULL
+        GROUP BY {group_column}
+        ORDER BY "Average Price" DESC, "{label}"
+        """
+        return self.db_manager.read_frame(query)
 
     def analyze_category_pricing(self):
         """Analyze average prices by category."""
-        df = self.get_price_history_df()
-
-        # Calculate average price by category
-        category_pricing = df.groupby('category_name')['price'].agg(['mean', 'min', 'max', 'count']).reset_index()
-        category_pricing.columns = ['Category', 'Average Price', 'Min Price', 'Max Price', 'Count']
-
-        # Sort by average price
-        category_pricing = category_pricing.sort_values('Average Price', ascending=False)
-
-        return category_pricing
+        return self.price_summary('c.category_name', 'Category')
 
     def analyze_brand_pricing(self):
         """Analyze average prices by brand."""
-        df = self.get_price_history_df()
-
-        # Calculate average price by brand
-        brand_pricing = df.groupby('brand_name')['price'].agg(['mean', 'min', 'max', 'count']).reset_index()
-        brand_pricing.columns = ['Brand', 'Average Price', 'Min Price', 'Max Price', 'Count']
-
-        # Sort by average price
-        brand_pricing = brand_pricing.sort_values('Average Price', ascending=False)
-
-        return brand_pricing
+        return self.price_summary('b.brand_name', 'Brand')
 
     def analyze_discount_patterns(self):
         """Analyze products with discounts."""
-        df = self.get_price_history_df()
-
-        # Filter products with sale prices
-        discounted = df[df['sale_price'].notna()].copy()
-
-        if len(discounted) > 0:
-            # Calculate discount percentage
-            discounted['discount_percentage'] = ((discounted['price'] - discounted['sale_price']) / discounted[
-                'price']) * 100
-
-            # Group by category and calculate average discount
-            category_discounts = discounted.groupby('category_name')['discount_percentage'].mean().reset_index()
-            category_discounts.columns = ['Category', 'Average Discount %']
-            category_discounts = category_discounts.sort_values('Average Discount %', ascending=False)
-
-            return category_discounts
-        else:
-            return pd.DataFrame(columns=['Category', 'Average Discount %'])
+        # Average discount percentage of the prices with a sale price, by category
+        query = """
+        SELECT c.category_name AS "Category",
+               AVG((ph.price - ph.sale_price) * 100.0 / NULLIF(ph.price, 0)) AS "Average Discount %"
+        FROM price_history ph
+        LEFT JOIN products p ON ph.product_id = p.product_id
+        LEFT JOIN categories c ON p.category_id = c.category_id
+        WHERE ph.sale_price IS NOT NULL AND c.category_name IS NOT NULL
+        GROUP BY c.category_name
+        ORDER BY "Average Discount %" DESC, "Category"
+        """
+        return self.db_manager.read_frame(query)
 
     def get_trending_items(self, days=7):
         """Identify trending items based on recent additions."""
-        query = f"""
+        query = """
         SELECT p.product_name, b.brand_name, c.category_name, ph.price
         FROM products p
         LEFT JOIN brands b ON p.brand_id = b.brand_id
         LEFT JOIN categories c ON p.category_id = c.category_id
         LEFT JOIN price_history ph ON p.product_id = ph.product_id
-        WHERE p.created_at >= datetime('now', '-{days} days')
+        WHERE p.created_at >= ?
         """
-        return pd.read_sql_query(query, self.engine)
+        # created_at is stored as UTC 'YYYY-MM-DD HH:MM:SS' text, so the cutoff is compared in the same format
+        cutoff = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+        return self.db_manager.read_frame(query, [cutoff])
 
     def generate_brand_performance_report(self):
         """Generate a comprehensive brand performance report."""
-        df = self.get_price_history_df()
-
-        # Count products per brand
-        brand_products = df.groupby('brand_name')['product_id'].nunique().reset_index()
-        brand_products.columns = ['Brand', 'Product Count']
-
-        # Average price per brand
-        brand_avg_price = df.groupby('brand_name')['price'].mean().reset_index()
-        brand_avg_price.columns = ['Brand', 'Average Price']
-
-        # Discount percentage per brand
-        discounted = df[df['sale_price'].notna()].copy()
-        if len(discounted) > 0:
-            discounted['discount_percentage'] = ((discounted['price'] - discounted['sale_price']) / discounted[
-                'price']) * 100
-            brand_discounts = discounted.groupby('brand_name')['discount_percentage'].mean().reset_index()
-            brand_discounts.columns = ['Brand', 'Average Discount %']
-        else:
-            brand_discounts = pd.DataFrame(columns=['Brand', 'Average Discount %'])
-
-        # Merge all data
-        report = brand_products.merge(brand_avg_price, on='Brand', how='left')
-        report = report.merge(brand_discounts, on='Brand', how='left')
-
-        return report.sort_values('Product Count', ascending=False)
+        query = """
+        SELECT b.brand_name AS "Brand",
+               COUNT(DISTINCT ph.product_id) AS "Product Count",
+               AVG(ph.price) AS "Average Price",
+               AVG(CASE WHEN ph.sale_price IS NOT NULL
+                        THEN (ph.price - ph.sale_price) * 100.0 / NULLIF(ph.price, 0) END) AS "Average Discount %"
+        FROM price_history ph
+        LEFT JOIN products p ON ph.product_id = p.product_id
+        LEFT JOIN brands b ON p.brand_id = b.brand_id
+        WHERE b.brand_name IS NOT NULL
+        GROUP BY b.brand_name
+        ORDER BY "Product Count" DESC, "Brand"
+        """
+        return self.db_manager.read_frame(query)
 
     def plot_category_distribution(self):
         """Create a pie chart of category distribution."""
         df = self.get_products_df()
-        category_counts = df['category_name'].value_counts()
-
-        plt.figure(figsize=(10, 8))
-        plt.pie(category_counts.values, labels=category_counts.index, autopct='%1.1f%%')
-        plt.title('Distribution of Products by Category')
-        plt.axis('equal')
-        return plt
+        return category_distribution_figure(df['category_name'].value_counts())
 
     def plot_price_range_by_category(self):
         """Create a box plot showing price ranges by category."""
         df = self.get_price_history_df()
-
-        plt.figure(figsize=(12, 8))
-        sns.boxplot(data=df, x='category_name', y='price')
-        plt.xticks(rotation=45)
-        plt.title('Price Range by Category')
-        plt.xlabel('Category')
-        plt.ylabel('Price ($)')
-        plt.tight_layout()
-        return plt
+        return price_range_by_category_figure(df[['category_name', 'price']])
+
+    def render_plots(self, renderer):
+        """Queue the category and price plots on a ChartRenderer and return their paths."""
+        products_df = self.get_products_df()
+        prices_df = self.get_price_history_df()
+
+        return [
+            renderer.submit('category_distribution', 'category_distribution.png',
+                            products_df['category_name'].value_counts()),
+            renderer.submit('price_range_by_category', 'price_range_by_category.png',
+                            prices_df[['category_name', 'price']])
+        ]
 
 
 # For testing
@@ -181,11 +169,10 @@ if __name__ == "__main__":
     print("\nBrand Performance Report:")
     print(analyzer.generate_brand_performance_report())
 
-    # Create and save plots
+    # Render and save plots in the background
     plots_dir = os.path.join(analyzer.project_root, 'data', 'plots')
 
-    analyzer.plot_category_distribution().savefig(os.path.join(plots_dir, 'category_distribution.png'))
-    analyzer.plot_price_range_by_category().savefig(os.path.join(plots_dir, 'price_range_by_category.png'))
-
-    plt.close('all')
+    renderer = ChartRenderer(plots_dir)
+    analyzer.render_plots(renderer)
+    renderer.close()
     print(f"\nAnalysis complete! Plots saved to {plots_dir}")
\ No newline at end of file
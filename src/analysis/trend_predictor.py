@@ -7,7 +7,6 @@ import os
 import sys
 from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor
-import matplotlib.pyplot as plt
 import joblib
 
 # Add project root to path
@@ -15,6 +14,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.append(project_root)
 
 from src.database.database_setup import DatabaseManager
+from src.visualization.chart_renderer import ChartRenderer
 
 
 class FashionTrendPredictor:
@@ -27,13 +27,17 @@ class FashionTrendPredictor:
         self.models_dir = os.path.join(project_root, 'models')
         os.makedirs(self.models_dir, exist_ok=True)
 
-    def prepare_data(self, min_days=7, prediction_days=7):
-        """Prepare trend data for modeling."""
-        conn = self.db_manager.create_connection()
+    def load_trend_history(self):
+        """Load the full trend history from the database."""
+        return self.db_manager.read_frame("SELECT * FROM trend_history")
 
-        # Get trend history
-        trend_df = pd.read_sql_query("SELECT * FROM trend_history", conn)
-        conn.close()
+    def prepare_data(self, min_days=7, prediction_days=7, trend_df=None):
+        """Prepare trend data for modeling."""
+        # Get trend history, unless the caller already has it in memory
+        if trend_df is None:
+            trend_df = self.load_trend_history()
+        else:
+            trend_df = trend_df.copy()
 
         if trend_df.empty:
             print("No trend data available for modeling.")
@@ -63,11 +67,13 @@ class FashionTrendPredictor:
             trend_data['month'] = trend_data['date_recorded'].dt.month
 
             # Create lag features
+            lag_cols = []
             for lag in range(1, min(5, len(trend_data))):
                 trend_data[f'score_lag_{lag}'] = trend_data['score'].shift(lag)
+                lag_cols.append(f'score_lag_{lag}')
 
-            # Drop rows with NaN from lag features
-            trend_data = trend_data.dropna()
+            # Drop rows with NaN from lag features (other columns such as category may be empty)
+            trend_data = trend_data.dropna(subset=lag_cols)
 
             # Skip if not enough data after creating features
             if len(trend_data) < 5:
@@ -85,10 +91,10 @@ class FashionTrendPredictor:
 
         return X_train_dict, y_train_dict
 
-    def train_models(self):
+    def train_models(self, trend_df=None):
         """Train prediction models for each trend."""
         # Prepare data
-        train_data = self.prepare_data()
+        train_data = self.prepare_data(trend_df=trend_df)
 
         if not train_data:
             print("Insufficient data for training models.")
@@ -111,13 +117,13 @@ class FashionTrendPredictor:
 
         return True
 
-    def predict_future_trends(self, days=7):
+    def predict_future_trends(self, days=7, trend_df=None):
         """Predict trend scores for the next few days."""
-        conn = self.db_manager.create_connection()
-
-        # Get latest trend data
-        trend_df = pd.read_sql_query("SELECT * FROM trend_history", conn)
-        conn.close()
+        # Get latest trend data, unless the caller already has it in memory
+        if trend_df is None:
+            trend_df = self.load_trend_history()
+        else:
+            trend_df = trend_df.copy()
 
         if trend_df.empty:
             print("No trend data available for prediction.")
@@ -179,8 +185,13 @@ class FashionTrendPredictor:
 
         return pd.DataFrame(predictions)
 
-    def visualize_predictions(self, predictions_df):
-        """Visualize trend predictions."""
+    def visualize_predictions(self, predictions_df, renderer=None):
+        """Save predictions and queue the prediction chart for rendering.
+
+        The CSV is written immediately; the chart is rendered by a background
+        ChartRenderer. Without a renderer, a temporary one is created and this
+        call waits for rendering to finish.
+        """
         if predictions_df is None or predictions_df.empty:
             print("No predictions to visualize.")
             return
@@ -189,36 +200,24 @@ class FashionTrendPredictor:
         viz_dir = os.path.join(project_root, 'data', 'predictions')
         os.makedirs(viz_dir, exist_ok=True)
 
-        # Get top predicted trends
-        top_trends = (
-            predictions_df[predictions_df['days_ahead'] == predictions_df['days_ahead'].max()]
-            .sort_values('predicted_score', ascending=False)
-            .head(10)['trend_name'].unique()
-        )
-
-        # Plot predictions for top trends
-        plt.figure(figsize=(14, 10))
-
-        for trend in top_trends:
-            trend_data = predictions_df[predictions_df['trend_name'] == trend]
-            plt.plot(trend_data['days_ahead'], trend_data['predicted_score'], marker='o', linewidth=2, label=trend)
-
-        plt.title('Fashion Trend Prediction', fontsize=16)
-        plt.xlabel('Days in Future', fontsize=14)
-        plt.ylabel('Predicted Score', fontsize=14)
-        plt.legend(loc='best')
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-
-        plt.savefig(os.path.join(viz_dir, 'trend_predictions.png'))
-        plt.close()
-
         # Save predictions to CSV
         predictions_df.to_csv(os.path.join(viz_dir, 'fashion_trend_predictions.csv'), index=False)
 
-        print(f"Visualizations and predictions saved to {viz_dir}")
+        owns_renderer = renderer is None
+        if owns_renderer:
+            renderer = ChartRenderer(viz_dir)
+
+        chart_path = renderer.submit(
+            'trend_predictions', os.path.join(viz_dir, 'trend_predictions.png'), predictions_df
+        )
+
+        if owns_renderer:
+            renderer.close()
+            print(f"Visualizations and predictions saved to {viz_dir}")
+        else:
+            print(f"Predictions saved to {viz_dir}, chart queued for rendering")
 
-        return os.path.join(viz_dir, 'trend_predictions.png')
+        return chart_path
 
 
 if __name__ == "__main__":
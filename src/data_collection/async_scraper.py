@@ -0,0 +1,249 @@
+# src/data_collection/async_scraper.py
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import aiohttp
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from src.database.database_setup import DatabaseManager
+from src.data_collection.web_scraper import FashionScraper
+
+
+class TokenBucket:
+    """Per-host politeness limit: `rate` requests per second, with bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request to this host is allowed."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    async def ready(self):
+        """Wait until a token is available, without taking it."""
+        now = time.monotonic()
+        tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        if tokens < 1:
+            await asyncio.sleep((1 - tokens) / self.rate)
+
+
+class AsyncProductScraper:
+    """Fetch many product pages concurrently across hosts.
+
+    Politeness is enforced per host with a TokenBucket instead of global sleeps,
+    and at most `max_in_flight` requests are open at once. URLs are scheduled
+    per host: each host's URLs are fed in order by their own task, which only
+    claims a request slot once the host has a token, so a host that is being
+    throttled never holds slots other hosts could use. Parsing reuses
+    FashionScraper.parse_product_page, and parsed products stream to a writer
+    task that saves them in batches while fetching continues.
+    """
+
+    def __init__(self, scraper, max_in_flight=50, per_host_rate=1.0, per_host_burst=2, timeout=30,
+                 write_batch_size=100):
+        self.scraper = scraper
+        self.max_in_flight = max_in_flight
+        self.per_host_rate = per_host_rate
+        self.per_host_burst = per_host_burst
+        self.timeout = timeout
+        self.write_batch_size = write_batch_size
+        self.buckets = {}
+
+    def bucket_for(self, url):
+        """Token bucket for the URL's host, created on first use."""
+        host = urlparse(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.per_host_rate, self.per_host_burst)
+        return self.buckets[host]
+
+    async def fetch_product(self, session, url):
+        """Fetch and parse one product page. Returns the product dict or None.
+
+        The caller is responsible for the host's rate limit (see _feed_host).
+        """
+        async with session.get(url) as response:
+            if response.status != 200:
+                print(f"Failed to retrieve {url}. Status code: {response.status}")
+                return None
+            content = await response.read()
+
+        # Parsing is CPU work; keep it off the event loop so other fetches keep moving
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.parse, content, url)
+
+    def parse(self, content, url):
+        return self.scraper.parse_product_content(content, url)
+
+    def write_batch(self, products):
+        """Save a batch of parsed products. Runs in a worker thread."""
+        return self.scraper.save_products(products)
+
+    async def _fetch(self, session, url, results, stats, slots):
+        try:
+            product = await self.fetch_product(session, url)
+            if product is not None:
+                await results.put(product)
+                stats['fetched'] += 1
+            else:
+                stats['failed'] += 1
+        except Exception as e:
+            print(f"Error scraping {url}: {e}")
+            stats['failed'] += 1
+        finally:
+            slots.release()
+
+    async def _feed_host(self, session, urls, results, stats, slots):
+        """Start fetches for one host's URLs, in order, as its rate limit and free slots allow."""
+        bucket = self.bucket_for(urls[0])
+        fetches = []
+        try:
+            for url in urls:
+                # Wait for the host's token before claiming a slot, and only take the token once the
+                # slot is ours: this task is the host's only consumer, so the token is still there
+                await bucket.ready()
+                await slots.acquire()
+                await bucket.acquire()
+                fetches.append(asyncio.create_task(self._fetch(session, url, results, stats, slots)))
+            await asyncio.gather(*fetches)
+        except asyncio.CancelledError:
+            # Cancelled because the writer failed; stop the fetches already started too
+            for fetch in fetches:
+                fetch.cancel()
+            raise
+
+    async def _writer(self, results, stats):
+        loop = asyncio.get_running_loop()
+        batch = []
+        while True:
+            product = await results.get()
+            if product is not None:
+                batch.append(product)
+
+            # Flush on a full batch, on shutdown (None), or when the queue momentarily drains
+            if batch and (product is None or len(batch) >= self.write_batch_size or results.empty()):
+                stats['saved'] += await loop.run_in_executor(None, self.write_batch, batch)
+                batch = []
+
+            if product is None:
+                return
+
+    async def scrape(self, urls):
+        """Scrape all URLs and return counts of fetched, failed and saved products.
+
+        If a batch fails to save, fetching stops and the error is raised.
+        """
+        stats = {'fetched': 0, 'failed': 0, 'saved': 0}
+        urls_by_host = {}
+        for url in urls:
+            urls_by_host.setdefault(urlparse(url).netloc, []).append(url)
+
+        # Bounded so fetching can't run arbitrarily far ahead of the database
+        results = asyncio.Queue(maxsize=self.write_batch_size * 10)
+
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        started = time.perf_counter()
+
+        async with aiohttp.ClientSession(headers=self.scraper.headers, connector=connector,
+                                         timeout=timeout) as session:
+            writer = asyncio.create_task(self._writer(results, stats))
+            slots = asyncio.Semaphore(self.max_in_flight)
+            feeding = asyncio.gather(*[
+                self._feed_host(session, host_urls, results, stats, slots)
+                for host_urls in urls_by_host.values()
+            ])
+
+            # The writer only finishes before feeding does if a batch failed to save. Fetchers
+            # would then block on the full queue, so stop them and raise the writer's error.
+            await asyncio.wait([feeding, writer], return_when=asyncio.FIRST_COMPLETED)
+            if writer.done():
+                feeding.cancel()
+                await asyncio.gather(feeding, return_exceptions=True)
+                writer.result()
+
+            await feeding
+            await results.put(None)
+            await writer
+
+        stats['seconds'] = time.perf_counter() - started
+        return stats
+
+    def run(self, urls):
+        """Blocking entry point around scrape()."""
+        return asyncio.run(self.scrape(urls))
+
+
+class StubProductHandler(BaseHTTPRequestHandler):
+    """Serves a minimal product page for any path, for local testing."""
+
+    def do_GET(self):
+        body = (f"<html><head><title>Product {self.path}</title></head>"
+                f"<body><h1 class='product-name'>Product {self.path}</h1>"
+                f"<span class='product-price'>$49.99</span></body></html>").encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port=0):
+    """Start a local stub product server in a background thread. Returns (server, base_url)."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubProductHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrently scrape product pages.")
+    parser.add_argument('urls_file', nargs='?', help="file with one product URL per line")
+    parser.add_argument('--stub', type=int, default=0, help="scrape N pages from a local stub server instead")
+    parser.add_argument('--max-in-flight', type=int, default=50, help="maximum concurrent requests")
+    parser.add_argument('--per-host-rate', type=float, default=1.0, help="requests per second per host")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    scraper = FashionScraper(db)
+
+    if args.stub:
+        server, base_url = start_stub_server()
+        urls = [f"{base_url}/products/{i}" for i in range(args.stub)]
+    elif args.urls_file:
+        with open(args.urls_file) as f:
+            urls = [line.strip() for line in f if line.strip()]
+    else:
+        parser.error("provide a URLs file or --stub N")
+
+    async_scraper = AsyncProductScraper(scraper, max_in_flight=args.max_in_flight,
+                                        per_host_rate=args.per_host_rate)
+    stats = async_scraper.run(urls)
+
+    print(f"Fetched {stats['fetched']} pages ({stats['failed']} failed), saved {stats['saved']} products "
+          f"in {stats['seconds']:.1f}s")
@@ -0,0 +1,218 @@
+# src/data_collection/bulk_loader.py
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from src.database.database_setup import DatabaseManager
+from src.analysis.social_trend_analyzer import ensure_post_url_index
+from src.database.caption_search import CaptionSearch
+from src.database.near_duplicates import DuplicateDetector
+from src.database.table_stats import TableStats
+from src.database.term_store import TermStore
+from src.data_collection.enhanced_data_generator import (
+    EnhancedFashionDataGenerator, TREND_HISTORY_COLUMNS, SOCIAL_POST_COLUMNS, frame_rows, insert_sql
+)
+
+# Durability is relaxed for the duration of a load: a crash mid-load means regenerating the data
+BULK_LOAD_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-262144"  # 256 MB
+]
+
+
+# Tables a synthetic load writes to; their table_stats rows are recounted afterwards
+LOADED_TABLES = ['trend_history', 'social_posts', 'terms', 'post_terms', 'caption_signatures', 'minhash_bands']
+
+
+class BulkLoader:
+    """Stream chunks of rows into SQLite with executemany inside large transactions."""
+
+    def __init__(self, db_path, rows_per_transaction=500000):
+        self.db_path = db_path
+        self.rows_per_transaction = rows_per_transaction
+        self.conn = None
+
+    def open(self):
+        """Open the load connection and apply the bulk-load PRAGMAs."""
+        # Autocommit mode, transactions are managed explicitly in load()
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+        for pragma in BULK_LOAD_PRAGMAS:
+            self.conn.execute(pragma)
+        return self.conn
+
+    def load(self, table, columns, chunks, or_ignore=False):
+        """Insert every chunk (a DataFrame with `columns`) into `table`.
+
+        Returns (rows inserted, seconds elapsed) and prints the load rate.
+        """
+        sql = insert_sql(table, columns, or_ignore=or_ignore)
+        cursor = self.conn.cursor()
+
+        rows = 0
+        rows_in_transaction = 0
+        started = time.perf_counter()
+
+        cursor.execute("BEGIN")
+        try:
+            for chunk in chunks:
+                cursor.executemany(sql, frame_rows(chunk, columns))
+                rows += len(chunk)
+                rows_in_transaction += len(chunk)
+
+                if rows_in_transaction >= self.rows_per_transaction:
+                    cursor.execute("COMMIT")
+                    cursor.execute("BEGIN")
+                    rows_in_transaction = 0
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed > 0 else 0
+        print(f"Loaded {rows:,} rows into {table} in {elapsed:.1f}s ({rate:,.0f} rows/sec)")
+
+        return rows, elapsed
+
+    def close(self):
+        """Fold the WAL back into the database file and close the connection."""
+        if self.conn:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.close()
+            self.conn = None
+
+
+def load_synthetic_dataset(db_manager, num_posts, days=60, seed=None, end_date=None, chunk_size=100000,
+                           rows_per_transaction=500000, generator=None, scraped_at=None):
+    """Generate and stream a synthetic dataset into the database without holding it in memory.
+
+    A preconfigured generator can be passed instead of a seed. If `scraped_at`
+    is given it is stored on every post instead of the current time.
+    Near-duplicate posts are flagged in one pass after the load.
+
+    Returns a dict with the number of trend rows and posts loaded, the load
+    rates and the number of posts flagged as near-duplicates.
+    """
+    if generator is None:
+        generator = EnhancedFashionDataGenerator(db_manager, seed=seed)
+
+    # Post IDs are assigned here so each chunk's terms can be linked without reading the posts back
+    post_columns = ['post_id'] + list(SOCIAL_POST_COLUMNS)
+    post_chunks = generator.iter_social_posts(num_posts=num_posts, end_date=end_date, chunk_size=chunk_size)
+    if scraped_at is not None:
+        post_columns.append('scraped_at')
+        post_chunks = (chunk.assign(scraped_at=scraped_at) for chunk in post_chunks)
+
+    loader = BulkLoader(db_manager.db_path, rows_per_transaction=rows_per_transaction)
+    term_store = TermStore()
+    caption_search = CaptionSearch()
+    duplicate_detector = DuplicateDetector()
+    table_stats = TableStats()
+
+    def with_post_terms(chunks, cursor, first_post_id):
+        # Runs inside the loader's transactions, so posts and their terms commit together
+        for chunk in chunks:
+            chunk = chunk.assign(post_id=np.arange(first_post_id, first_post_id + len(chunk)))
+            first_post_id += len(chunk)
+            term_store.write_post_terms(cursor, chunk)
+            yield chunk
+
+    conn = loader.open()
+    caption_triggers = []
+    rebuilt_indexes = []
+    indexes_dropped = False
+
+    def restore_indexes():
+        # Migration 004 only adds the unique post_url index once, so it must never be left dropped
+        duplicates = ensure_post_url_index(conn.cursor())
+        if duplicates:
+            term_store.remove_orphans(conn.cursor())
+        for name, sql in rebuilt_indexes:
+            if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone():
+                conn.execute(sql)
+        return duplicates
+
+    # Row counts are taken once after the load rather than bumped by a trigger per row
+    stats_triggers = table_stats.suspend_triggers(conn)
+    try:
+        first_post_id = conn.execute("SELECT COALESCE(MAX(post_id), 0) + 1 FROM social_posts").fetchone()[0]
+
+        trend_rows, trend_seconds = loader.load(
+            'trend_history', TREND_HISTORY_COLUMNS,
+            generator.iter_trend_history(days=days, end_date=end_date, chunk_size=chunk_size),
+            or_ignore=True
+        )
+
+        # Loading into an unindexed table and indexing once afterwards is much faster than
+        # maintaining the indexes row by row; any duplicate URLs are dropped when the post_url one is rebuilt
+        rebuilt_indexes = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND name IN (?, ?)",
+            ('idx_post_terms_term', 'idx_social_posts_created')
+        ).fetchall()
+        indexes_dropped = True
+        conn.execute("DROP INDEX IF EXISTS idx_social_posts_url")
+        for name, _ in rebuilt_indexes:
+            conn.execute(f"DROP INDEX {name}")
+        # The new captions are full-text indexed in one pass once the duplicates are gone
+        caption_triggers = caption_search.suspend_triggers(conn)
+        post_rows, post_seconds = loader.load(
+            'social_posts', post_columns, with_post_terms(post_chunks, conn.cursor(), first_post_id)
+        )
+
+        post_rows -= restore_indexes()
+        indexes_dropped = False
+        caption_search.resume_triggers(conn, caption_triggers, first_post_id=first_post_id)
+        caption_triggers = []
+
+        # Checked in bulk rather than per chunk: the new posts plus any others not checked yet, oldest
+        # first, in implicit transactions that backfill commits per chunk
+        conn.isolation_level = ''
+        duplicate_posts = duplicate_detector.backfill(conn)
+        conn.isolation_level = None
+    finally:
+        # An interrupted load (e.g. Ctrl-C) can stop inside a transaction; what it held is discarded
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        if indexes_dropped:
+            restore_indexes()
+        if caption_triggers:
+            # A failed load may have left some captions unindexed
+            caption_search.resume_triggers(conn, caption_triggers)
+            caption_search.rebuild(conn)
+        table_stats.resume_triggers(conn, stats_triggers, tables=LOADED_TABLES, written_at=scraped_at)
+        loader.close()
+
+    return {
+        'trend_rows': trend_rows,
+        'post_rows': post_rows,
+        'trend_rows_per_sec': trend_rows / trend_seconds if trend_seconds > 0 else 0,
+        'post_rows_per_sec': post_rows / post_seconds if post_seconds > 0 else 0,
+        'duplicate_posts': duplicate_posts
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream a production-scale synthetic dataset into SQLite.")
+    parser.add_argument('--posts', type=int, default=1000000, help="number of social posts to generate")
+    parser.add_argument('--days', type=int, default=365, help="days of trend history to generate")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for reproducible data")
+    parser.add_argument('--chunk-size', type=int, default=100000, help="rows generated per chunk")
+    parser.add_argument('--db-path', default=None, help="target database (defaults to the project database)")
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db_path)
+    stats = load_synthetic_dataset(db, args.posts, days=args.days, seed=args.seed, chunk_size=args.chunk_size)
+
+    print(f"\nLoaded {stats['trend_rows']:,} trend records ({stats['trend_rows_per_sec']:,.0f} rows/sec) "
+          f"and {stats['post_rows']:,} social posts ({stats['post_rows_per_sec']:,.0f} rows/sec), "
+          f"{stats['duplicate_posts']:,} flagged as near-duplicates")
@@ -0,0 +1,446 @@
+# src/data_collection/crawl_frontier.py
+
+import argparse
+import os
+import queue
+import socket
+import sqlite3
+import sys
+import threading
+import time
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from src.database.database_setup import DatabaseManager
+from src.database.migrations import ensure_migrated
+
+JOB_STATES = ['pending', 'leased', 'done', 'failed']
+
+
+class CrawlFrontier:
+    """SQLite-backed queue of crawl jobs that survives crashes.
+
+    Jobs are leased to a worker for `lease_seconds`, and the worker renews
+    the lease while the job runs; a lease that expires (because its worker
+    died) makes the job available again. Only the lease owner can complete
+    or fail a job. Failed jobs are retried until they reach their max_attempts.
+    """
+
+    def __init__(self, db_path, lease_seconds=300):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.local = threading.local()
+
+        # crawl_jobs comes from migration 009; a standalone frontier file gets the full schema too
+        ensure_migrated(db_path)
+        self.connection().execute("PRAGMA journal_mode=WAL")
+
+    def connection(self):
+        """This thread's connection to the frontier database."""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; claims take an explicit write lock with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self.local.conn = conn
+        return conn
+
+    def enqueue(self, source, targets, priority=0, max_attempts=3, requeue=False):
+        """Add jobs for `targets`. Known jobs are left alone unless `requeue` resets them to pending.
+
+        Returns the number of jobs added or reset.
+        """
+        conn = self.connection()
+        rows = [(source, target, priority, max_attempts) for target in targets]
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            added = self.insert_jobs(conn, rows, requeue)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return added
+
+    def insert_jobs(self, conn, rows, requeue):
+        # rowcount counts the rows these statements wrote, leaving out the table_stats trigger's writes
+        if requeue:
+            return conn.executemany("""
+            INSERT INTO crawl_jobs (source, target, priority, max_attempts) VALUES (?, ?, ?, ?)
+            ON CONFLICT(source, target) DO UPDATE SET
+                state = 'pending', priority = excluded.priority, max_attempts = excluded.max_attempts,
+                attempts = 0, lease_owner = NULL, lease_expires = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE crawl_jobs.state != 'leased'
+            """, rows).rowcount
+        return conn.executemany("""
+        INSERT OR IGNORE INTO crawl_jobs (source, target, priority, max_attempts) VALUES (?, ?, ?, ?)
+        """, rows).rowcount
+
+    def lease(self, owner, limit=1, sources=None):
+        """Claim up to `limit` runnable jobs for `owner`, highest priority first.
+
+        Runnable means pending, or leased with an expired lease. Returns a list
+        of (job_id, source, target).
+        """
+        conn = self.connection()
+        now = time.time()
+
+        query = """
+        SELECT job_id, source, target FROM crawl_jobs
+        WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?))
+        """
+        params = [now]
+        if sources:
+            query += f" AND source IN ({', '.join('?' * len(sources))})"
+            params.extend(sources)
+        query += " ORDER BY priority DESC, job_id LIMIT ?"
+        params.append(limit)
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            jobs = conn.execute(query, params).fetchall()
+            conn.executemany("""
+            UPDATE crawl_jobs
+            SET state = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE job_id = ?
+            """, [(owner, now + self.lease_seconds, job_id) for job_id, _, _ in jobs])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return jobs
+
+    def renew(self, leases):
+        """Extend the leases of running jobs, given as (job_id, owner) pairs.
+
+        Returns the job IDs whose lease is no longer held by that owner.
+        """
+        if not leases:
+            return []
+        conn = self.connection()
+        expires = time.time() + self.lease_seconds
+        lost = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for job_id, owner in leases:
+                conn.execute("""
+                UPDATE crawl_jobs SET lease_expires = ?
+                WHERE job_id = ? AND state = 'leased' AND lease_owner = ?
+                """, (expires, job_id, owner))
+                if conn.execute("SELECT changes()").fetchone()[0] == 0:
+                    lost.append(job_id)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return lost
+
+    def complete(self, leases):
+        """Mark jobs done, given as (job_id, owner) pairs.
+
+        A job whose lease has passed to another owner is left alone. Returns
+        the number of jobs marked done.
+        """
+        if not leases:
+            return 0
+        conn = self.connection()
+        done = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for job_id, owner in leases:
+                conn.execute("""
+                UPDATE crawl_jobs
+                SET state = 'done', lease_owner = NULL, lease_expires = NULL, last_error = NULL,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE job_id = ? AND state = 'leased' AND lease_owner = ?
+                """, (job_id, owner))
+                done += conn.execute("SELECT changes()").fetchone()[0]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return done
+
+    def fail(self, job_id, owner, error):
+        """Record a failed attempt: back to pending for a retry, or failed once out of attempts.
+
+        Ignored if `owner` no longer holds the job's lease. Returns True if recorded.
+        """
+        conn = self.connection()
+        conn.execute("""
+        UPDATE crawl_jobs
+        SET state = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,
+            lease_owner = NULL, lease_expires = NULL, last_error = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE job_id = ? AND state = 'leased' AND lease_owner = ?
+        """, (str(error)[:500], job_id, owner))
+        return conn.execute("SELECT changes()").fetchone()[0] > 0
+
+    def release_dead_leases(self):
+        """Return jobs leased by crashed processes on this host to pending.
+
+        Leases from other hosts are left to expire on their own.
+        """
+        host = socket.gethostname()
+        conn = self.connection()
+        rows = conn.execute("SELECT job_id, lease_owner FROM crawl_jobs WHERE state = 'leased'").fetchall()
+
+        dead = []
+        for job_id, owner in rows:
+            owner_host, _, pid = (owner or '').rpartition(':')[0].rpartition(':')
+            if owner_host != host or not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            try:
+                os.kill(int(pid), 0)
+            except ProcessLookupError:
+                dead.append((job_id,))
+            except PermissionError:
+                pass
+
+        conn.executemany("""
+        UPDATE crawl_jobs
+        SET state = 'pending', lease_owner = NULL, lease_expires = NULL, updated_at = CURRENT_TIMESTAMP
+        WHERE job_id = ? AND state = 'leased'
+        """, dead)
+        return len(dead)
+
+    def stats(self):
+        """Number of jobs in each state."""
+        counts = dict(self.connection().execute("SELECT state, COUNT(*) FROM crawl_jobs GROUP BY state").fetchall())
+        return {state: counts.get(state, 0) for state in JOB_STATES}
+
+    def close(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+
+
+class CrawlScheduler:
+    """Drain a CrawlFrontier with N worker threads.
+
+    `handlers` maps a job source to a function that fetches one target and
+    returns a list of results; `sinks` maps the source to a function that
+    saves a list of results. Workers hand their results to a single writer
+    that saves them in batches (every `batch_size` results or
+    `flush_seconds`) and only then marks the jobs done, so a crash loses at
+    most one unsaved batch, which is leased again once its leases expire.
+    """
+
+    def __init__(self, frontier, handlers, sinks, workers=4, batch_size=200, flush_seconds=5.0,
+                 idle_seconds=1.0):
+        self.frontier = frontier
+        self.handlers = handlers
+        self.sinks = sinks
+        self.workers = workers
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.idle_seconds = idle_seconds
+
+        self.results = queue.Queue(maxsize=batch_size * 4)
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.counts = {'jobs_done': 0, 'jobs_failed': 0, 'results_saved': 0, 'batches': 0}
+        # Leases this scheduler holds, {job_id: owner}, renewed until the job is completed or failed
+        self.held = {}
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counts[name] += amount
+
+    def release(self, job_ids):
+        with self.lock:
+            for job_id in job_ids:
+                self.held.pop(job_id, None)
+
+    def renew_leases(self, stopped):
+        """Renew held leases until `stopped` is set. Runs in its own thread."""
+        interval = self.frontier.lease_seconds / 3
+        while not stopped.wait(interval):
+            with self.lock:
+                leases = list(self.held.items())
+            try:
+                lost = self.frontier.renew(leases)
+            except Exception as e:
+                print(f"Error renewing leases: {e}")
+                continue
+            if lost:
+                print(f"Lost the lease on {len(lost)} jobs; they may run again elsewhere")
+                self.release(lost)
+
+    def worker(self, index, until_empty, active):
+        owner = f"{socket.gethostname()}:{os.getpid()}:{index}"
+        sources = list(self.handlers)
+
+        while not self.stop_event.is_set():
+            jobs = self.frontier.lease(owner, limit=1, sources=sources)
+            if not jobs:
+                with self.lock:
+                    active[index] = False
+                    if until_empty and not any(active):
+                        # Nothing left to lease and no other worker can produce more jobs
+                        return
+                time.sleep(self.idle_seconds)
+                continue
+
+            job_id, source, target = jobs[0]
+            with self.lock:
+                active[index] = True
+                self.held[job_id] = owner
+
+            try:
+                items = self.handlers[source](target) or []
+                self.results.put((job_id, owner, source, items))
+            except Exception as e:
+                print(f"Error crawling {source} {target}: {e}")
+                self.release([job_id])
+                if self.frontier.fail(job_id, owner, e):
+                    self.count('jobs_failed')
+
+    def flush(self, pending):
+        """Save buffered results per source, then mark their jobs done."""
+        for source, entries in pending.items():
+            if not entries:
+                continue
+            items = [item for _, _, batch in entries for item in batch]
+            leases = [(job_id, owner) for job_id, owner, _ in entries]
+            try:
+                if items:
+                    self.sinks[source](items)
+                self.release([job_id for job_id, _ in leases])
+                self.count('jobs_done', self.frontier.complete(leases))
+                self.count('results_saved', len(items))
+            except Exception as e:
+                print(f"Error saving {len(items)} {source} results: {e}")
+                self.release([job_id for job_id, _ in leases])
+                failed = sum(self.frontier.fail(job_id, owner, e) for job_id, owner in leases)
+                self.count('jobs_failed', failed)
+        self.count('batches')
+
+    def run(self, until_empty=True):
+        """Run the workers and the batching writer. Blocks until the frontier is drained
+        (or until stop() when until_empty is False) and returns the run's counts."""
+        released = self.frontier.release_dead_leases()
+        if released:
+            print(f"Resuming {released} jobs left leased by a crashed run")
+
+        active = [True] * self.workers
+        threads = [
+            threading.Thread(target=self.worker, args=(index, until_empty, active), daemon=True)
+            for index in range(self.workers)
+        ]
+        stopped = threading.Event()
+        renewer = threading.Thread(target=self.renew_leases, args=(stopped,), daemon=True)
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        renewer.start()
+
+        pending = {source: [] for source in self.handlers}
+        buffered = 0
+        last_flush = time.monotonic()
+
+        while True:
+            workers_alive = any(thread.is_alive() for thread in threads)
+            try:
+                job_id, owner, source, items = self.results.get(timeout=0.2)
+                pending[source].append((job_id, owner, items))
+                buffered += max(len(items), 1)
+            except queue.Empty:
+                if not workers_alive and self.results.empty():
+                    break
+
+            if buffered >= self.batch_size or (buffered and time.monotonic() - last_flush >= self.flush_seconds):
+                self.flush(pending)
+                pending = {source: [] for source in self.handlers}
+                buffered = 0
+                last_flush = time.monotonic()
+
+        if buffered:
+            self.flush(pending)
+        stopped.set()
+        renewer.join()
+
+        seconds = time.perf_counter() - started
+        with self.lock:
+            counts = dict(self.counts)
+        return dict(counts, seconds=seconds, jobs_per_sec=counts['jobs_done'] / seconds if seconds > 0 else 0)
+
+    def stop(self):
+        self.stop_event.set()
+
+
+def scraper_handlers(fashion_scraper=None, instagram_scraper=None, reddit_scraper=None):
+    """Job handlers and result sinks for the project's scrapers, keyed by job source."""
+    handlers, sinks = {}, {}
+
+    if fashion_scraper is not None:
+        def scrape_product(url):
+            product = fashion_scraper.scrape_product_details(url)
+            if product is None:
+                raise RuntimeError(f"no product data from {url}")
+            return [product]
+        handlers['product'] = scrape_product
+        # Sinks must raise on failure so the jobs are retried; the writer rolls back and re-raises
+        sinks['product'] = fashion_scraper.writer.write
+
+    # Handlers must raise on fetch errors too, or a failed fetch would count as a finished job
+    if instagram_scraper is not None:
+        handlers['hashtag'] = instagram_scraper.fetch_hashtag
+        sinks['hashtag'] = instagram_scraper.write_posts
+
+    if reddit_scraper is not None:
+        handlers['subreddit'] = reddit_scraper.fetch_subreddit
+        sinks['subreddit'] = reddit_scraper.save_to_database
+
+    return handlers, sinks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Queue crawl jobs and drain them with concurrent workers.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help="add jobs to the frontier")
+    enqueue_parser.add_argument('source', choices=['product', 'hashtag'], help="kind of job")
+    enqueue_parser.add_argument('targets_file', help="file with one URL or hashtag per line")
+    enqueue_parser.add_argument('--priority', type=int, default=0, help="higher runs first")
+    enqueue_parser.add_argument('--requeue', action='store_true', help="reset jobs that already ran")
+
+    run_parser = subparsers.add_parser('run', help="drain the frontier")
+    run_parser.add_argument('--workers', type=int, default=4, help="concurrent workers")
+    run_parser.add_argument('--batch-size', type=int, default=200, help="results saved per batch")
+    run_parser.add_argument('--forever', action='store_true', help="keep polling for new jobs")
+
+    subparsers.add_parser('status', help="show job counts by state")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    frontier = CrawlFrontier(db.db_path)
+
+    if args.command == 'enqueue':
+        with open(args.targets_file) as f:
+            targets = [line.strip() for line in f if line.strip()]
+        added = frontier.enqueue(args.source, targets, priority=args.priority, requeue=args.requeue)
+        print(f"Queued {added} of {len(targets)} {args.source} jobs")
+
+    elif args.command == 'run':
+        from src.data_collection.web_scraper import FashionScraper
+        from src.data_collection.instagram_scraper import InstagramHashtagScraper
+
+        handlers, sinks = scraper_handlers(
+            fashion_scraper=FashionScraper(db), instagram_scraper=InstagramHashtagScraper(db)
+        )
+        scheduler = CrawlScheduler(frontier, handlers, sinks, workers=args.workers, batch_size=args.batch_size)
+        try:
+            counts = scheduler.run(until_empty=not args.forever)
+            print(f"Finished {counts['jobs_done']} jobs ({counts['jobs_failed']} failed attempts), "
+                  f"saved {counts['results_saved']} results in {counts['batches']} batches "
+                  f"({counts['jobs_per_sec']:.1f} jobs/sec)")
+        except KeyboardInterrupt:
+            scheduler.stop()
+            print("Stopped; unfinished jobs resume on the next run")
+
+    print(f"Frontier: {frontier.stats()}")
@@ -6,13 +6,14 @@ import numpy as np
 from datetime import datetime, timedelta
 import os
 import sys
-import sqlite3
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(project_root)
 
 from src.database.database_setup import DatabaseManager
+from src.database.near_duplicates import DuplicateDetector
+from src.database.term_store import TermStore
 
 
 class FashionTrendDataGenerator:
@@ -181,34 +182,24 @@ class FashionTrendDataGenerator:
         conn = self.db_manager.create_connection()
         cursor = conn.cursor()
 
-        # Save trend data
-        for _, row in trend_df.iterrows():
-            try:
-                cursor.execute("""
-                INSERT INTO trend_history (trend_name, score, platform, date_recorded)
-                VALUES (?, ?, ?, ?)
-                """, (row['trend_name'], row['score'], row['platform'], row['date_recorded']))
-            except sqlite3.IntegrityError:
-                # Skip if record already exists with same trend and date
-                pass
-
-        # Save social posts
-        for _, row in posts_df.iterrows():
-            cursor.execute("""
-            INSERT INTO social_posts 
-            (platform, post_url, username, followers, caption, likes, comments, shares, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                row['platform'],
-                row['post_url'],
-                row['username'],
-                row['followers'],
-                row['caption'],
-                row['likes'],
-                row['comments'],
-                row['shares'],
-                row['created_at']
-            ))
+        term_store = TermStore()
+
+        # Save trend data, skipping records that already exist with same trend and date
+        cursor.executemany("""
+        INSERT OR IGNORE INTO trend_history (trend_name, score, platform, date_recorded)
+        VALUES (?, ?, ?, ?)
+        """, trend_df[['trend_name', 'score', 'platform', 'date_recorded']].itertuples(index=False, name=None))
+
+        # Save social posts, skipping URLs that are already stored
+        post_columns = ['platform', 'post_url', 'username', 'followers', 'caption', 'likes', 'comments', 'shares',
+                        'created_at']
+        cursor.executemany("""
+        INSERT OR IGNORE INTO social_posts 
+        (platform, post_url, username, followers, caption, likes, comments, shares, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, posts_df[post_columns].itertuples(index=False, name=None))
+        term_store.write_for_urls(cursor, posts_df)
+        DuplicateDetector().mark_for_urls(cursor, posts_df)
 
         conn.commit()
         conn.close()
@@ -0,0 +1,139 @@
+# src/data_collection/dataset_profiles.py
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from src.database.database_setup import DatabaseManager
+from src.data_collection.enhanced_data_generator import (
+    EnhancedFashionDataGenerator, GENERATOR_VERSION, SAMPLE_TREND_DATA
+)
+from src.data_collection.bulk_loader import load_synthetic_dataset
+from src.database.migrations import latest_version
+
+# Named benchmark datasets. Each one is fully determined by its parameters:
+# the seed, a fixed end date and the built-in trend data (never the editable JSON file).
+#   num_posts        rows in social_posts
+#   days             days of trend_history per trend
+#   vocabulary_size  number of hashtag trends (padded with synthetic ones)
+#   trend_skew       Zipf exponent for how often trends appear in posts (0 = uniform)
+DATASET_PROFILES = {
+    'tiny': {
+        'num_posts': 1000, 'days': 30, 'vocabulary_size': 20, 'trend_skew': 0.0,
+        'seed': 1, 'end_date': '2025-01-01'
+    },
+    'small': {
+        'num_posts': 50000, 'days': 90, 'vocabulary_size': 200, 'trend_skew': 1.0,
+        'seed': 2, 'end_date': '2025-01-01'
+    },
+    'prod': {
+        'num_posts': 2000000, 'days': 365, 'vocabulary_size': 2000, 'trend_skew': 1.1,
+        'seed': 3, 'end_date': '2025-01-01'
+    },
+    'stress': {
+        'num_posts': 10000000, 'days': 730, 'vocabulary_size': 20000, 'trend_skew': 1.2,
+        'seed': 4, 'end_date': '2025-01-01'
+    }
+}
+
+
+def default_cache_dir():
+    """Directory where generated benchmark databases are cached."""
+    return os.path.join(project_root, 'data', 'benchmarks')
+
+
+def profile_cache_key(name):
+    """Cache key for a profile: its parameters, the generator and schema versions and the SQLite version."""
+    payload = json.dumps({
+        'profile': DATASET_PROFILES[name],
+        'generator_version': GENERATOR_VERSION,
+        'schema_version': latest_version(),
+        # The on-disk format is only byte-identical for the same SQLite library
+        'sqlite_version': sqlite3.sqlite_version
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def profile_database_path(name, cache_dir=None):
+    """Path of the cached database for a profile."""
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    return os.path.join(cache_dir, f"{name}-g{GENERATOR_VERSION}-{profile_cache_key(name)}.db")
+
+
+def build_profile_database(name, db_path):
+    """Generate a profile's dataset into a new database file at db_path."""
+    if name not in DATASET_PROFILES:
+        raise ValueError(f"Unknown dataset profile '{name}'. Choose from: {', '.join(DATASET_PROFILES)}")
+
+    profile = DATASET_PROFILES[name]
+    end_date = datetime.strptime(profile['end_date'], '%Y-%m-%d')
+
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    # Migrations are recorded with the profile's end date, keeping the file byte-identical between runs
+    db = DatabaseManager(db_path, migrate=False)
+    db.setup_database(applied_at=end_date.strftime('%Y-%m-%d %H:%M:%S'))
+
+    generator = EnhancedFashionDataGenerator(
+        db, seed=profile['seed'], trend_data=SAMPLE_TREND_DATA,
+        vocabulary_size=profile['vocabulary_size'], trend_skew=profile['trend_skew']
+    )
+    stats = load_synthetic_dataset(
+        db, profile['num_posts'], days=profile['days'], end_date=end_date, generator=generator,
+        scraped_at=end_date.strftime('%Y-%m-%d %H:%M:%S')
+    )
+
+    # Leave a single self-contained file behind
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.close()
+
+    return stats
+
+
+def get_profile_database(name, cache_dir=None, rebuild=False):
+    """Return the path to a profile's database, generating it only if it isn't cached yet."""
+    db_path = profile_database_path(name, cache_dir)
+    if os.path.exists(db_path) and not rebuild:
+        return db_path
+
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    print(f"Building '{name}' dataset at {db_path}...")
+
+    # Build next to the final path and move it into place, so a failed build is never cached
+    tmp_path = db_path + '.tmp'
+    build_profile_database(name, tmp_path)
+    os.replace(tmp_path, db_path)
+
+    return db_path
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or locate a cached benchmark dataset.")
+    parser.add_argument('profile', choices=sorted(DATASET_PROFILES), help="dataset profile to build")
+    parser.add_argument('--rebuild', action='store_true', help="regenerate even if a cached copy exists")
+    parser.add_argument('--cache-dir', default=None, help="where cached databases are stored")
+    args = parser.parse_args()
+
+    path = get_profile_database(args.profile, cache_dir=args.cache_dir, rebuild=args.rebuild)
+    print(f"{args.profile}: {path}")
+    print(f"sha256: {file_digest(path)}")
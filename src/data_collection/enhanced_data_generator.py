@@ -1,27 +1,170 @@
 # src/data_collection/enhanced_data_generator.py
 
-import random
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import os
 import sys
-import sqlite3
 import json
+import copy
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(project_root)
 
 from src.database.database_setup import DatabaseManager
+from src.database.near_duplicates import DuplicateDetector
+from src.database.term_store import TermStore
+
+
+# Bump whenever the generated data changes for the same seed and parameters,
+# so cached benchmark databases are rebuilt
+GENERATOR_VERSION = 4
+
+# Trend groups in the trend data: (key, score field, daily growth by growth level,
+# fluctuation amplitude, trend name format)
+TREND_GROUPS = [
+    ("current_trends", "score", {"high": 0.04, "medium": 0.02, "low": 0.01}, 0.5, lambda name: name),
+    ("styles", "popularity", {"high": 0.03, "medium": 0.015, "low": 0.005}, 0.4,
+     lambda name: name.lower()),  # No hashtag for style names
+    ("brands", "popularity", {"high": 0.025, "medium": 0.01, "low": 0.005}, 0.3,
+     lambda name: "brand:" + name),  # "brand:" prefix distinguishes brands
+]
+
+
+# Real fashion trend data as of 2023-2024
+SAMPLE_TREND_DATA = {
+    "current_trends": [
+        {"name": "#baggyfit", "score": 9.2, "growth": "high", "category": "streetwear"},
+        {"name": "#y2kfashion", "score": 8.9, "growth": "high", "category": "vintage"},
+        {"name": "#oversizedeverything", "score": 8.5, "growth": "medium", "category": "streetwear"},
+        {"name": "#cargopants", "score": 8.3, "growth": "high", "category": "streetwear"},
+        {"name": "#darkacademia", "score": 7.9, "growth": "medium", "category": "aesthetic"},
+        {"name": "#platformboots", "score": 7.8, "growth": "medium", "category": "footwear"},
+        {"name": "#cottagecore", "score": 7.6, "growth": "medium", "category": "aesthetic"},
+        {"name": "#genderlessfashion", "score": 7.5, "growth": "high", "category": "concept"},
+        {"name": "#vintagedenim", "score": 7.4, "growth": "medium", "category": "vintage"},
+        {"name": "#sustainablestyle", "score": 7.2, "growth": "high", "category": "concept"},
+        {"name": "#denimonstyle", "score": 7.0, "growth": "medium", "category": "fabric"},
+        {"name": "#gorpcore", "score": 6.9, "growth": "high", "category": "outdoor"},
+        {"name": "#croptop", "score": 6.8, "growth": "medium", "category": "tops"},
+        {"name": "#cubanlink", "score": 6.7, "growth": "medium", "category": "accessories"},
+        {"name": "#minimalstyle", "score": 6.6, "growth": "medium", "category": "aesthetic"},
+        {"name": "#cleanaesthetic", "score": 6.5, "growth": "medium", "category": "aesthetic"},
+        {"name": "#thriftfinds", "score": 6.4, "growth": "high", "category": "shopping"},
+        {"name": "#cowboyboots", "score": 6.3, "growth": "medium", "category": "footwear"},
+        {"name": "#balletcore", "score": 6.2, "growth": "medium", "category": "aesthetic"},
+        {"name": "#leatherjacket", "score": 6.0, "growth": "medium", "category": "outerwear"}
+    ],
+    "brands": [
+        {"name": "Zara", "popularity": 8.7, "growth": "medium", "category": "fast-fashion"},
+        {"name": "H&M", "popularity": 8.5, "growth": "medium", "category": "fast-fashion"},
+        {"name": "Nike", "popularity": 9.1, "growth": "medium", "category": "sportswear"},
+        {"name": "Adidas", "popularity": 8.9, "growth": "medium", "category": "sportswear"},
+        {"name": "Shein", "popularity": 8.8, "growth": "high", "category": "fast-fashion"},
+        {"name": "Urban Outfitters", "popularity": 7.9, "growth": "medium", "category": "retail"},
+        {"name": "Levi's", "popularity": 8.3, "growth": "medium", "category": "denim"},
+        {"name": "Uniqlo", "popularity": 8.4, "growth": "high", "category": "basics"},
+        {"name": "New Balance", "popularity": 8.6, "growth": "high", "category": "footwear"},
+        {"name": "Carhartt", "popularity": 8.2, "growth": "high", "category": "workwear"},
+        {"name": "The North Face", "popularity": 8.0, "growth": "medium", "category": "outdoor"},
+        {"name": "Patagonia", "popularity": 7.8, "growth": "medium", "category": "outdoor"},
+        {"name": "Dickies", "popularity": 7.6, "growth": "medium", "category": "workwear"},
+        {"name": "Vans", "popularity": 7.9, "growth": "medium", "category": "footwear"},
+        {"name": "Converse", "popularity": 7.8, "growth": "medium", "category": "footwear"}
+    ],
+    "styles": [
+        {"name": "Baggy", "popularity": 9.3, "growth": "high", "category": "fit"},
+        {"name": "Y2K", "popularity": 9.0, "growth": "high", "category": "retro"},
+        {"name": "Vintage", "popularity": 8.8, "growth": "medium", "category": "retro"},
+        {"name": "Minimalist", "popularity": 8.5, "growth": "medium", "category": "aesthetic"},
+        {"name": "Streetwear", "popularity": 8.7, "growth": "medium", "category": "urban"},
+        {"name": "Athleisure", "popularity": 8.6, "growth": "medium", "category": "sportswear"},
+        {"name": "Sustainable", "popularity": 8.4, "growth": "high", "category": "concept"},
+        {"name": "Gender-neutral", "popularity": 8.3, "growth": "high", "category": "concept"},
+        {"name": "Workwear", "popularity": 8.1, "growth": "high", "category": "functional"},
+        {"name": "Gorpcore", "popularity": 7.9, "growth": "high", "category": "outdoor"},
+        {"name": "Coastal Grandmother", "popularity": 7.7, "growth": "medium", "category": "aesthetic"},
+        {"name": "Dopamine Dressing", "popularity": 7.6, "growth": "medium", "category": "concept"},
+        {"name": "Retro Revival", "popularity": 7.5, "growth": "medium", "category": "retro"},
+        {"name": "Upcycled", "popularity": 7.4, "growth": "high", "category": "sustainable"}
+    ],
+    "colors": [
+        {"name": "Neutrals", "popularity": 8.9, "growth": "medium", "category": "earthy"},
+        {"name": "Earth Tones", "popularity": 8.7, "growth": "medium", "category": "earthy"},
+        {"name": "Pastels", "popularity": 8.5, "growth": "medium", "category": "soft"},
+        {"name": "Bold Brights", "popularity": 8.3, "growth": "medium", "category": "vibrant"},
+        {"name": "Monochrome", "popularity": 8.2, "growth": "medium", "category": "minimal"}
+    ],
+    "fabrics": [
+        {"name": "Denim", "popularity": 9.0, "growth": "medium", "category": "classic"},
+        {"name": "Cotton", "popularity": 8.8, "growth": "medium", "category": "natural"},
+        {"name": "Leather", "popularity": 8.6, "growth": "medium", "category": "luxury"},
+        {"name": "Linen", "popularity": 8.5, "growth": "high", "category": "natural"},
+        {"name": "Recycled", "popularity": 8.3, "growth": "high", "category": "sustainable"}
+    ]
+}
+
+TREND_HISTORY_COLUMNS = ['trend_name', 'score', 'platform', 'date_recorded', 'category']
+
+SOCIAL_POST_COLUMNS = [
+    'platform', 'post_url', 'username', 'followers', 'caption', 'likes', 'comments', 'shares',
+    'created_at', 'hashtags', 'keywords', 'brands'
+]
+
+# Caption templates, applied to whole arrays of (style, color, brand, fabric, trends)
+CAPTION_TEMPLATES = [
+    lambda style, color, brand, fabric, trends: "Loving this " + style + " " + color + " look! " + trends,
+    lambda style, color, brand, fabric, trends: (
+        "Today's " + style + " outfit featuring " + brand + ". What do you think? " + trends),
+    lambda style, color, brand, fabric, trends: "New " + fabric + " find - " + style + " vibes! " + trends,
+    lambda style, color, brand, fabric, trends: (
+        brand + " never disappoints! Perfect for " + style + " style. " + trends),
+    lambda style, color, brand, fabric, trends: (
+        "My go-to " + style + " look made with " + fabric + " in " + color + ". " + trends)
+]
+
+
+def join_nonempty(columns, separator):
+    """Element-wise join of string arrays, skipping empty entries."""
+    result = np.asarray(columns[0], dtype=object)
+    for column in columns[1:]:
+        column = np.asarray(column, dtype=object)
+        joined = result + separator + column
+        result = np.where(column == '', result, np.where(result == '', column, joined))
+    return result
+
+
+def frame_rows(df, columns):
+    """Rows of the given DataFrame columns as plain Python tuples, ready for executemany."""
+    return zip(*(df[column].tolist() for column in columns))
+
+
+def insert_sql(table, columns, or_ignore=False):
+    """INSERT statement with one placeholder per column."""
+    verb = "INSERT OR IGNORE" if or_ignore else "INSERT"
+    placeholders = ', '.join('?' for _ in columns)
+    return f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
 
 
 class EnhancedFashionDataGenerator:
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, seed=None, trend_data=None, vocabulary_size=None, trend_skew=0.0):
         self.db_manager = db_manager
 
-        # Load real fashion trend data from JSON
-        self.trend_data = self.load_real_trend_data()
+        # Seedable generator for the vectorized data generation
+        self.rng = np.random.default_rng(seed)
+
+        # Load real fashion trend data from JSON, unless the caller pins it
+        if trend_data is None:
+            self.trend_data = self.load_real_trend_data()
+        else:
+            self.trend_data = copy.deepcopy(trend_data)
+
+        if vocabulary_size is not None:
+            self.expand_trend_vocabulary(vocabulary_size)
+
+        # Zipf exponent for how often each trend is used in posts (0 means uniform)
+        self.trend_skew = trend_skew
 
         # Define social media platforms
         self.platforms = ['Instagram', 'TikTok', 'Pinterest']
@@ -51,77 +194,7 @@ class EnhancedFashionDataGenerator:
                 print("Creating sample fashion trend data...")
 
                 # Real fashion trend data as of 2023-2024
-                real_trends = {
-                    "current_trends": [
-                        {"name": "#baggyfit", "score": 9.2, "growth": "high", "category": "streetwear"},
-                        {"name": "#y2kfashion", "score": 8.9, "growth": "high", "category": "vintage"},
-                        {"name": "#oversizedeverything", "score": 8.5, "growth": "medium", "category": "streetwear"},
-                        {"name": "#cargopants", "score": 8.3, "growth": "high", "category": "streetwear"},
-                        {"name": "#darkacademia", "score": 7.9, "growth": "medium", "category": "aesthetic"},
-                        {"name": "#platformboots", "score": 7.8, "growth": "medium", "category": "footwear"},
-                        {"name": "#cottagecore", "score": 7.6, "growth": "medium", "category": "aesthetic"},
-                        {"name": "#genderlessfashion", "score": 7.5, "growth": "high", "category": "concept"},
-                        {"name": "#vintagedenim", "score": 7.4, "growth": "medium", "category": "vintage"},
-                        {"name": "#sustainablestyle", "score": 7.2, "growth": "high", "category": "concept"},
-                        {"name": "#denimonstyle", "score": 7.0, "growth": "medium", "category": "fabric"},
-                        {"name": "#gorpcore", "score": 6.9, "growth": "high", "category": "outdoor"},
-                        {"name": "#croptop", "score": 6.8, "growth": "medium", "category": "tops"},
-                        {"name": "#cubanlink", "score": 6.7, "growth": "medium", "category": "accessories"},
-                        {"name": "#minimalstyle", "score": 6.6, "growth": "medium", "category": "aesthetic"},
-                        {"name": "#cleanaesthetic", "score": 6.5, "growth": "medium", "category": "aesthetic"},
-                        {"name": "#thriftfinds", "score": 6.4, "growth": "high", "category": "shopping"},
-                        {"name": "#cowboyboots", "score": 6.3, "growth": "medium", "category": "footwear"},
-                        {"name": "#balletcore", "score": 6.2, "growth": "medium", "category": "aesthetic"},
-                        {"name": "#leatherjacket", "score": 6.0, "growth": "medium", "category": "outerwear"}
-                    ],
-                    "brands": [
-                        {"name": "Zara", "popularity": 8.7, "growth": "medium", "category": "fast-fashion"},
-                        {"name": "H&M", "popularity": 8.5, "growth": "medium", "category": "fast-fashion"},
-                        {"name": "Nike", "popularity": 9.1, "growth": "medium", "category": "sportswear"},
-                        {"name": "Adidas", "popularity": 8.9, "growth": "medium", "category": "sportswear"},
-                        {"name": "Shein", "popularity": 8.8, "growth": "high", "category": "fast-fashion"},
-                        {"name": "Urban Outfitters", "popularity": 7.9, "growth": "medium", "category": "retail"},
-                        {"name": "Levi's", "popularity": 8.3, "growth": "medium", "category": "denim"},
-                        {"name": "Uniqlo", "popularity": 8.4, "growth": "high", "category": "basics"},
-                        {"name": "New Balance", "popularity": 8.6, "growth": "high", "category": "footwear"},
-                        {"name": "Carhartt", "popularity": 8.2, "growth": "high", "category": "workwear"},
-                        {"name": "The North Face", "popularity": 8.0, "growth": "medium", "category": "outdoor"},
-                        {"name": "Patagonia", "popularity": 7.8, "growth": "medium", "category": "outdoor"},
-                        {"name": "Dickies", "popularity": 7.6, "growth": "medium", "category": "workwear"},
-                        {"name": "Vans", "popularity": 7.9, "growth": "medium", "category": "footwear"},
-                        {"name": "Converse", "popularity": 7.8, "growth": "medium", "category": "footwear"}
-                    ],
-                    "styles": [
-                        {"name": "Baggy", "popularity": 9.3, "growth": "high", "category": "fit"},
-                        {"name": "Y2K", "popularity": 9.0, "growth": "high", "category": "retro"},
-                        {"name": "Vintage", "popularity": 8.8, "growth": "medium", "category": "retro"},
-                        {"name": "Minimalist", "popularity": 8.5, "growth": "medium", "category": "aesthetic"},
-                        {"name": "Streetwear", "popularity": 8.7, "growth": "medium", "category": "urban"},
-                        {"name": "Athleisure", "popularity": 8.6, "growth": "medium", "category": "sportswear"},
-                        {"name": "Sustainable", "popularity": 8.4, "growth": "high", "category": "concept"},
-                        {"name": "Gender-neutral", "popularity": 8.3, "growth": "high", "category": "concept"},
-                        {"name": "Workwear", "popularity": 8.1, "growth": "high", "category": "functional"},
-                        {"name": "Gorpcore", "popularity": 7.9, "growth": "high", "category": "outdoor"},
-                        {"name": "Coastal Grandmother", "popularity": 7.7, "growth": "medium", "category": "aesthetic"},
-                        {"name": "Dopamine Dressing", "popularity": 7.6, "growth": "medium", "category": "concept"},
-                        {"name": "Retro Revival", "popularity": 7.5, "growth": "medium", "category": "retro"},
-                        {"name": "Upcycled", "popularity": 7.4, "growth": "high", "category": "sustainable"}
-                    ],
-                    "colors": [
-                        {"name": "Neutrals", "popularity": 8.9, "growth": "medium", "category": "earthy"},
-                        {"name": "Earth Tones", "popularity": 8.7, "growth": "medium", "category": "earthy"},
-                        {"name": "Pastels", "popularity": 8.5, "growth": "medium", "category": "soft"},
-                        {"name": "Bold Brights", "popularity": 8.3, "growth": "medium", "category": "vibrant"},
-                        {"name": "Monochrome", "popularity": 8.2, "growth": "medium", "category": "minimal"}
-                    ],
-                    "fabrics": [
-                        {"name": "Denim", "popularity": 9.0, "growth": "medium", "category": "classic"},
-                        {"name": "Cotton", "popularity": 8.8, "growth": "medium", "category": "natural"},
-                        {"name": "Leather", "popularity": 8.6, "growth": "medium", "category": "luxury"},
-                        {"name": "Linen", "popularity": 8.5, "growth": "high", "category": "natural"},
-                        {"name": "Recycled", "popularity": 8.3, "growth": "high", "category": "sustainable"}
-                    ]
-                }
+                real_trends = copy.deepcopy(SAMPLE_TREND_DATA)
 
                 # Save to file
                 os.makedirs(os.path.dirname(data_file), exist_ok=True)
@@ -145,254 +218,270 @@ class EnhancedFashionDataGenerator:
                 "fabrics": []
             }
 
-    def generate_trend_history(self, days=60):
-        """Generate trend history data based on real trends."""
-        # Start date
-        start_date = datetime.now() - timedelta(days=days)
-
-        # Generate trend data
-        trend_data = []
-
-        # Process hashtag trends
-        for trend in self.trend_data["current_trends"]:
-            # Initial score based on trend popularity
-            base_score = trend["score"]
-
-            # Growth pattern based on trend growth rate
-            if trend["growth"] == "high":
-                growth_factor = 0.04  # 4% daily growth
-            elif trend["growth"] == "medium":
-                growth_factor = 0.02  # 2% daily growth
-            else:
-                growth_factor = 0.01  # 1% daily growth
-
-            for day in range(days):
-                date = start_date + timedelta(days=day)
-
-                # Calculate score with growth and random fluctuation
-                growth = base_score * (1 + growth_factor) ** day
-                fluctuation = random.uniform(-0.5, 0.5)
-                score = growth + fluctuation
-
-                # Ensure score stays within reasonable range
-                score = max(1.0, min(10.0, score))
-
-                # Add to trend data
-                trend_data.append({
-                    'trend_name': trend["name"],
-                    'score': round(score, 2),
-                    'platform': random.choice(self.platforms),
-                    'date_recorded': date.strftime('%Y-%m-%d'),
-                    'category': trend["category"]
-                })
-
-        # Process style trends
-        for style in self.trend_data["styles"]:
-            # Initial score based on style popularity
-            base_score = style["popularity"]
-
-            # Growth pattern based on style growth rate
-            if style["growth"] == "high":
-                growth_factor = 0.03  # 3% daily growth
-            elif style["growth"] == "medium":
-                growth_factor = 0.015  # 1.5% daily growth
-            else:
-                growth_factor = 0.005  # 0.5% daily growth
-
-            for day in range(days):
-                date = start_date + timedelta(days=day)
-
-                # Calculate score with growth and random fluctuation
-                growth = base_score * (1 + growth_factor) ** day
-                fluctuation = random.uniform(-0.4, 0.4)
-                score = growth + fluctuation
-
-                # Ensure score stays within reasonable range
-                score = max(1.0, min(10.0, score))
-
-                # Add to trend data
-                trend_data.append({
-                    'trend_name': style["name"].lower(),  # No hashtag for style names
-                    'score': round(score, 2),
-                    'platform': random.choice(self.platforms),
-                    'date_recorded': date.strftime('%Y-%m-%d'),
-                    'category': style["category"]
-                })
-
-        # Process brand trends
-        for brand in self.trend_data["brands"]:
-            # Initial score based on brand popularity
-            base_score = brand["popularity"]
-
-            # Growth pattern based on brand growth rate
-            if brand["growth"] == "high":
-                growth_factor = 0.025  # 2.5% daily growth
-            elif brand["growth"] == "medium":
-                growth_factor = 0.01  # 1% daily growth
-            else:
-                growth_factor = 0.005  # 0.5% daily growth
-
-            for day in range(days):
-                date = start_date + timedelta(days=day)
-
-                # Calculate score with growth and random fluctuation
-                growth = base_score * (1 + growth_factor) ** day
-                fluctuation = random.uniform(-0.3, 0.3)
-                score = growth + fluctuation
-
-                # Ensure score stays within reasonable range
-                score = max(1.0, min(10.0, score))
-
-                # Add to trend data (adding "brand:" prefix to distinguish brands)
-                trend_data.append({
-                    'trend_name': "brand:" + brand["name"],
-                    'score': round(score, 2),
-                    'platform': random.choice(self.platforms),
-                    'date_recorded': date.strftime('%Y-%m-%d'),
-                    'category': brand["category"]
-                })
-
-        return pd.DataFrame(trend_data)
-
-    def generate_social_posts(self, num_posts=100):
-        """Generate realistic social media posts based on current trends."""
-        posts = []
-
-        # Combine all fashion elements
-        trends = [t["name"] for t in self.trend_data["current_trends"]]
-        styles = [s["name"].lower() for s in self.trend_data["styles"]]
-        brands = [b["name"] for b in self.trend_data["brands"]]
-        colors = [c["name"].lower() for c in self.trend_data["colors"]]
-        fabrics = [f["name"].lower() for f in self.trend_data["fabrics"]]
-
-        for _ in range(num_posts):
-            # Select a random influencer
-            username, followers = random.choice(self.influencers)
-
-            # Random number of likes, comments and shares
-            engagement_rate = random.uniform(0.01, 0.1)  # 1% to 10% engagement
-            likes = int(followers * engagement_rate * random.uniform(0.5, 1.5))
-            comments = int(likes * random.uniform(0.05, 0.2))
-            shares = int(likes * random.uniform(0.01, 0.1))
-
-            # Pick random fashion elements
-            used_trends = random.sample(trends, random.randint(1, 3))
-            used_style = random.choice(styles)
-
-            # Maybe include a brand (70% chance)
-            if random.random() < 0.7:
-                used_brand = random.choice(brands)
-            else:
-                used_brand = ""
-
-            used_color = random.choice(colors)
-            used_fabric = random.choice(fabrics)
-
-            # Build caption with templates for more variety
-            caption_templates = [
-                f"Loving this {used_style} {used_color} look! {' '.join(used_trends)}",
-                f"Today's {used_style} outfit featuring {used_brand}. What do you think? {' '.join(used_trends)}",
-                f"New {used_fabric} find - {used_style} vibes! {' '.join(used_trends)}",
-                f"{used_brand} never disappoints! Perfect for {used_style} style. {' '.join(used_trends)}",
-                f"My go-to {used_style} look made with {used_fabric} in {used_color}. {' '.join(used_trends)}"
-            ]
-
-            caption = random.choice(caption_templates)
-
-            # Random date within last 30 days
-            days_ago = random.randint(0, 30)
-            post_date = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d %H:%M:%S')
-
-            posts.append({
-                'platform': random.choice(self.platforms),
-                'post_url': f"https://{random.choice(self.platforms).lower()}.com/p/{username}_{random.randint(10000, 99999)}",
-                'username': username,
-                'followers': followers,
-                'caption': caption,
-                'likes': likes,
-                'comments': comments,
-                'shares': shares,
-                'created_at': post_date,
-                'hashtags': ', '.join([t for t in used_trends if t.startswith('#')]),
-                'keywords': ', '.join(
-                    [t for t in used_trends if not t.startswith('#')] + [used_style, used_color, used_fabric]),
-                'brands': used_brand
+    def expand_trend_vocabulary(self, size):
+        """Pad current_trends with synthetic hashtags until there are `size` of them."""
+        trends = self.trend_data["current_trends"]
+        missing = size - len(trends)
+        if missing <= 0:
+            return
+
+        categories = sorted({trend["category"] for trend in trends}) or ["general"]
+        scores = np.round(self.rng.uniform(3.0, 9.0, size=missing), 1)
+        growth = self.rng.choice(["high", "medium", "low"], size=missing)
+        category = self.rng.integers(0, len(categories), size=missing)
+
+        first = len(trends)
+        for i in range(missing):
+            trends.append({
+                "name": f"#trend{first + i:05d}",
+                "score": float(scores[i]),
+                "growth": str(growth[i]),
+                "category": categories[category[i]]
             })
 
-        return pd.DataFrame(posts)
-
-    def save_to_database(self):
+    def trend_catalog(self):
+        """Per-trend generation parameters as parallel arrays.
+
+        Returns a dict with trend names, base scores, daily growth factors,
+        fluctuation amplitudes and categories, one entry per tracked trend.
+        """
+        names, base_scores, growth_factors, fluctuations, categories = [], [], [], [], []
+        for group, score_key, growth_rates, fluctuation, name_format in TREND_GROUPS:
+            for trend in self.trend_data[group]:
+                names.append(name_format(trend["name"]))
+                base_scores.append(trend[score_key])
+                growth_factors.append(growth_rates.get(trend["growth"], growth_rates['low']))
+                fluctuations.append(fluctuation)
+                categories.append(trend["category"])
+
+        return {
+            'names': np.asarray(names, dtype=object),
+            'base_scores': np.asarray(base_scores, dtype=float),
+            'growth_factors': np.asarray(growth_factors, dtype=float),
+            'fluctuations': np.asarray(fluctuations, dtype=float),
+            'categories': np.asarray(categories, dtype=object)
+        }
+
+    def generate_trend_history(self, days=60, end_date=None):
+        """Generate trend history data based on real trends.
+
+        All series are generated at once as (trends x days) NumPy arrays from
+        self.rng, so the cost is dominated by array math rather than per-row
+        Python work. Rows are ordered trend by trend, day by day.
+        """
+        # Start date
+        if end_date is None:
+            end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+
+        return self._trend_history_frame(self.trend_catalog(), days, start_date)
+
+    def iter_trend_history(self, days=60, end_date=None, chunk_size=100000):
+        """Yield trend history in DataFrames of roughly chunk_size rows, a block of trends at a time."""
+        if end_date is None:
+            end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+
+        catalog = self.trend_catalog()
+        trends_per_chunk = max(1, chunk_size // max(days, 1))
+        for start in range(0, len(catalog['names']), trends_per_chunk):
+            chunk = {key: values[start:start + trends_per_chunk] for key, values in catalog.items()}
+            yield self._trend_history_frame(chunk, days, start_date)
+
+    def _trend_history_frame(self, catalog, days, start_date):
+        num_trends = len(catalog['names'])
+        if num_trends == 0 or days <= 0:
+            return pd.DataFrame(columns=TREND_HISTORY_COLUMNS)
+
+        base_scores = catalog['base_scores'][:, None]
+        growth_factors = catalog['growth_factors'][:, None]
+        fluctuations = catalog['fluctuations'][:, None]
+        day_index = np.arange(days)[None, :]
+
+        # Calculate score with growth and random fluctuation
+        growth = base_scores * (1 + growth_factors) ** day_index
+        fluctuation = self.rng.uniform(-1.0, 1.0, size=(num_trends, days)) * fluctuations
+        scores = growth + fluctuation
+
+        # Ensure score stays within reasonable range
+        scores = np.round(np.clip(scores, 1.0, 10.0), 2)
+
+        # Assemble column-wise; repeated strings are stored as categoricals
+        trend_codes, trend_names = pd.factorize(pd.Index(catalog['names']))
+        category_codes, category_names = pd.factorize(pd.Index(catalog['categories']))
+        dates = pd.date_range(start_date.date(), periods=days, freq='D').strftime('%Y-%m-%d')
+        platform_codes = self.rng.integers(0, len(self.platforms), size=num_trends * days)
+
+        return pd.DataFrame({
+            'trend_name': pd.Categorical.from_codes(np.repeat(trend_codes, days), trend_names),
+            'score': scores.ravel(),
+            'platform': pd.Categorical.from_codes(platform_codes, self.platforms),
+            'date_recorded': pd.Categorical.from_codes(np.tile(np.arange(days), num_trends), dates),
+            'category': pd.Categorical.from_codes(np.repeat(category_codes, days), category_names)
+        })
+
+    def post_elements(self):
+        """Fashion vocabulary and influencers used to compose posts, as NumPy arrays."""
+        return {
+            'trends': np.asarray([t["name"] for t in self.trend_data["current_trends"]], dtype=object),
+            'styles': np.asarray([s["name"].lower() for s in self.trend_data["styles"]], dtype=object),
+            'brands': np.asarray([b["name"] for b in self.trend_data["brands"]], dtype=object),
+            'colors': np.asarray([c["name"].lower() for c in self.trend_data["colors"]], dtype=object),
+            'fabrics': np.asarray([f["name"].lower() for f in self.trend_data["fabrics"]], dtype=object),
+            'usernames': np.asarray([username for username, _ in self.influencers], dtype=object),
+            'followers': np.asarray([followers for _, followers in self.influencers], dtype=np.int64)
+        }
+
+    def generate_social_posts(self, num_posts=100, end_date=None):
+        """Generate realistic social media posts based on current trends."""
+        if end_date is None:
+            end_date = datetime.now()
+        return self._social_posts_frame(num_posts, end_date, self.post_elements())
+
+    def iter_social_posts(self, num_posts=100, end_date=None, chunk_size=100000):
+        """Yield generated social posts in DataFrames of at most chunk_size rows."""
+        if end_date is None:
+            end_date = datetime.now()
+
+        elements = self.post_elements()
+        for start in range(0, num_posts, chunk_size):
+            yield self._social_posts_frame(min(chunk_size, num_posts - start), end_date, elements)
+
+    def _sample_trends(self, num_posts, num_trends):
+        """Pick 1-3 distinct trend indices per post; unused slots are -1."""
+        rng = self.rng
+        max_trends = min(3, num_trends)
+
+        slots = np.full((num_posts, 3), -1, dtype=np.int64)
+        if max_trends == 0:
+            return slots
+
+        if self.trend_skew:
+            # Zipf-like popularity: the trend at rank r is picked in proportion to 1 / r^skew
+            weights = 1.0 / np.arange(1, num_trends + 1) ** self.trend_skew
+            slots[:, :max_trends] = rng.choice(num_trends, size=(num_posts, max_trends), p=weights / weights.sum())
+
+            # Repeated picks within a post are dropped
+            for slot in range(1, max_trends):
+                repeated = (slots[:, :slot] == slots[:, slot:slot + 1]).any(axis=1)
+                slots[repeated, slot] = -1
+        else:
+            # Draw without replacement by skipping over indices already taken
+            for slot in range(max_trends):
+                picks = rng.integers(0, num_trends - slot, size=num_posts)
+                for taken in np.sort(slots[:, :slot], axis=1).T:
+                    picks += picks >= taken
+                slots[:, slot] = picks
+
+        used = rng.integers(1, max_trends + 1, size=num_posts)
+        slots[np.arange(3)[None, :] >= used[:, None]] = -1
+        return slots
+
+    def _social_posts_frame(self, num_posts, end_date, elements):
+        if num_posts <= 0:
+            return pd.DataFrame(columns=SOCIAL_POST_COLUMNS)
+
+        rng = self.rng
+
+        # Select a random influencer
+        influencer = rng.integers(0, len(elements['usernames']), size=num_posts)
+        usernames = elements['usernames'][influencer]
+        followers = elements['followers'][influencer]
+
+        # Random number of likes, comments and shares
+        engagement_rate = rng.uniform(0.01, 0.1, size=num_posts)  # 1% to 10% engagement
+        likes = (followers * engagement_rate * rng.uniform(0.5, 1.5, size=num_posts)).astype(np.int64)
+        comments = (likes * rng.uniform(0.05, 0.2, size=num_posts)).astype(np.int64)
+        shares = (likes * rng.uniform(0.01, 0.1, size=num_posts)).astype(np.int64)
+
+        # Pick random fashion elements
+        trends = elements['trends']
+        slots = self._sample_trends(num_posts, len(trends))
+        trend_names = np.append(trends, '')[slots]  # -1 maps to the empty name
+        is_hashtag = np.char.startswith(trend_names.astype(str), '#')
+
+        style = elements['styles'][rng.integers(0, len(elements['styles']), size=num_posts)]
+
+        # Maybe include a brand (70% chance)
+        brand = np.where(
+            rng.random(num_posts) < 0.7,
+            elements['brands'][rng.integers(0, len(elements['brands']), size=num_posts)],
+            ''
+        ).astype(object)
+
+        color = elements['colors'][rng.integers(0, len(elements['colors']), size=num_posts)]
+        fabric = elements['fabrics'][rng.integers(0, len(elements['fabrics']), size=num_posts)]
+
+        used_trends = join_nonempty([trend_names[:, slot] for slot in range(3)], ' ')
+        hashtags = join_nonempty(
+            [np.where(is_hashtag[:, slot], trend_names[:, slot], '') for slot in range(3)], ', ')
+        keywords = join_nonempty(
+            [np.where(is_hashtag[:, slot], '', trend_names[:, slot]) for slot in range(3)]
+            + [style, color, fabric], ', ')
+
+        # Build caption with templates for more variety
+        template = rng.integers(0, len(CAPTION_TEMPLATES), size=num_posts)
+        captions = np.empty(num_posts, dtype=object)
+        for index, build_caption in enumerate(CAPTION_TEMPLATES):
+            mask = template == index
+            captions[mask] = build_caption(
+                style[mask], color[mask], brand[mask], fabric[mask], used_trends[mask]
+            )
+
+        # Random date within last 30 days
+        post_dates = np.asarray(
+            [(end_date - timedelta(days=days_ago)).strftime('%Y-%m-%d %H:%M:%S') for days_ago in range(31)],
+            dtype=object
+        )
+        created_at = post_dates[rng.integers(0, 31, size=num_posts)]
+
+        platforms = np.asarray(self.platforms, dtype=object)
+        url_platforms = np.asarray([p.lower() for p in self.platforms], dtype=object)
+        # Wide enough that URLs stay unique (post_url is a unique key) even across millions of posts
+        post_ids = rng.integers(0, 2 ** 62, size=num_posts).astype(str).astype(object)
+
+        return pd.DataFrame({
+            'platform': platforms[rng.integers(0, len(platforms), size=num_posts)],
+            'post_url': ("https://" + url_platforms[rng.integers(0, len(url_platforms), size=num_posts)]
+                         + ".com/p/" + usernames + "_" + post_ids),
+            'username': usernames,
+            'followers': followers,
+            'caption': captions,
+            'likes': likes,
+            'comments': comments,
+            'shares': shares,
+            'created_at': created_at,
+            'hashtags': hashtags,
+            'keywords': keywords,
+            'brands': brand
+        })
+
+    def save_to_database(self, days=60, num_posts=100):
         """Generate and save realistic fashion data to the database."""
         # Generate trend history
-        trend_df = self.generate_trend_history(days=60)
+        trend_df = self.generate_trend_history(days=days)
 
         # Generate social posts
-        posts_df = self.generate_social_posts(num_posts=100)
+        posts_df = self.generate_social_posts(num_posts=num_posts)
+
+        return self.write_to_database(trend_df, posts_df)
 
-        # Save to database
+    def write_to_database(self, trend_df, posts_df):
+        """Save generated trend history and social posts to the database."""
         conn = self.db_manager.create_connection()
         cursor = conn.cursor()
 
-        # Add columns to tables if needed
-        try:
-            cursor.execute("SELECT category FROM trend_history LIMIT 1")
-        except:
-            try:
-                cursor.execute("ALTER TABLE trend_history ADD COLUMN category TEXT")
-                print("Added category column to trend_history table")
-            except Exception as e:
-                print(f"Error adding category column: {e}")
-
-        # Save trend data
-        for _, row in trend_df.iterrows():
-            try:
-                cursor.execute("""
-                INSERT INTO trend_history (trend_name, score, platform, date_recorded, category)
-                VALUES (?, ?, ?, ?, ?)
-                """, (
-                    row['trend_name'],
-                    row['score'],
-                    row['platform'],
-                    row['date_recorded'],
-                    row.get('category', '')
-                ))
-            except sqlite3.IntegrityError:
-                # Skip if record already exists with same trend and date
-                pass
-
-        # Check if social_posts table has the required columns
-        try:
-            cursor.execute("SELECT hashtags FROM social_posts LIMIT 1")
-        except:
-            try:
-                cursor.execute("ALTER TABLE social_posts ADD COLUMN hashtags TEXT")
-                cursor.execute("ALTER TABLE social_posts ADD COLUMN keywords TEXT")
-                cursor.execute("ALTER TABLE social_posts ADD COLUMN brands TEXT")
-                print("Added hashtags, keywords, and brands columns to social_posts table")
-            except Exception as e:
-                print(f"Error adding columns: {e}")
-
-        # Save social posts
-        for _, row in posts_df.iterrows():
-            cursor.execute("""
-            INSERT INTO social_posts 
-            (platform, post_url, username, followers, caption, likes, comments, shares, created_at,
-            hashtags, keywords, brands)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                row['platform'],
-                row['post_url'],
-                row['username'],
-                row['followers'],
-                row['caption'],
-                row['likes'],
-                row['comments'],
-                row['shares'],
-                row['created_at'],
-                row.get('hashtags', ''),
-                row.get('keywords', ''),
-                row.get('brands', '')
-            ))
+        # Save trend data, skipping records that already exist with same trend and date
+        cursor.executemany(insert_sql('trend_history', TREND_HISTORY_COLUMNS, or_ignore=True),
+                           frame_rows(trend_df, TREND_HISTORY_COLUMNS))
+
+        # Save social posts, skipping URLs that are already stored
+        cursor.executemany(insert_sql('social_posts', SOCIAL_POST_COLUMNS, or_ignore=True),
+                           frame_rows(posts_df, SOCIAL_POST_COLUMNS))
+
+        # Hashtags, keywords and brands are normalized into post_terms once, here, and reposts are flagged
+        TermStore().write_for_urls(cursor, posts_df)
+        DuplicateDetector().mark_for_urls(cursor, posts_df)
 
         conn.commit()
         conn.close()
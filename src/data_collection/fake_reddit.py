@@ -0,0 +1,198 @@
+# src/data_collection/fake_reddit.py
+
+import json
+import random
+import threading
+import time
+
+
+class FakeAuth:
+    """Tracks a rate-limit budget the way PRAW exposes it in `reddit.auth.limits`."""
+
+    def __init__(self, budget, window):
+        self.budget = budget
+        self.window = window
+        self.lock = threading.Lock()
+        self.window_start = time.time()
+        self.used = 0
+        self.limits = {'remaining': None, 'reset_timestamp': None, 'used': None}
+
+    def record_request(self):
+        with self.lock:
+            now = time.time()
+            if now - self.window_start >= self.window:
+                self.window_start = now
+                self.used = 0
+            self.used += 1
+            self.limits = {
+                'remaining': float(max(self.budget - self.used, 0)),
+                'reset_timestamp': self.window_start + self.window,
+                'used': self.used
+            }
+
+
+class FakeRedditor:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeComment:
+    def __init__(self, data):
+        self.id = data['id']
+        self.body = data['body']
+        self.score = data['score']
+        self.created_utc = data['created_utc']
+        self.author = FakeRedditor(data['author']) if data.get('author') else None
+
+
+class FakeCommentForest:
+    """Comment tree that costs one API call to expand, like PRAW's lazy CommentForest."""
+
+    def __init__(self, reddit, comments):
+        self.reddit = reddit
+        self.comments = comments
+        self.loaded = False
+
+    def replace_more(self, limit=32):
+        if not self.loaded:
+            self.reddit.request()
+            self.loaded = True
+        return []
+
+    def list(self):
+        if not self.loaded:
+            self.replace_more()
+        return [FakeComment(comment) for comment in self.comments]
+
+
+class FakeSubmission:
+    def __init__(self, reddit, data):
+        self.id = data['id']
+        self.title = data['title']
+        self.selftext = data['selftext']
+        self.permalink = data['permalink']
+        self.score = data['score']
+        self.num_comments = len(data['comments'])
+        self.created_utc = data['created_utc']
+        self.author = FakeRedditor(data['author']) if data.get('author') else None
+        self.comments = FakeCommentForest(reddit, data['comments'])
+
+
+class FakeSubreddit:
+    def __init__(self, reddit, name):
+        self.reddit = reddit
+        self.display_name = name
+
+    def top(self, time_filter='all', limit=100):
+        posts = sorted(self.reddit.listings.get(self.display_name, []), key=lambda data: -data['score'])
+        return self.paginate(posts[:limit])
+
+    def new(self, limit=100):
+        posts = sorted(self.reddit.listings.get(self.display_name, []), key=lambda data: -data['created_utc'])
+        return self.paginate(posts[:limit])
+
+    def paginate(self, posts):
+        # Listings come back in pages of 100, one API call each, fetched only as iteration reaches them
+        for start in range(0, len(posts), 100):
+            self.reddit.request()
+            for data in posts[start:start + 100]:
+                yield FakeSubmission(self.reddit, data)
+
+
+class FakeReddit:
+    """PRAW-compatible stand-in for RedditFashionScraper, backed by recorded or synthetic listings.
+
+    `listings` maps subreddit names to lists of post dicts (see record_listings).
+    Every API call sleeps for `latency` seconds and is counted against a
+    `budget`-per-`window` rate limit reported through `auth.limits`.
+    """
+
+    def __init__(self, listings, latency=0.05, budget=600, window=600):
+        self.listings = listings
+        self.latency = latency
+        self.auth = FakeAuth(budget, window)
+        self.read_only = True
+        self.request_count = 0
+        self.lock = threading.Lock()
+
+    def request(self):
+        time.sleep(self.latency)
+        with self.lock:
+            self.request_count += 1
+        self.auth.record_request()
+
+    def subreddit(self, name):
+        return FakeSubreddit(self, name)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """FakeReddit serving listings recorded to a JSON file."""
+        with open(path) as f:
+            return cls(json.load(f), **kwargs)
+
+    @classmethod
+    def synthetic(cls, subreddits, posts_per_subreddit=25, comments_per_post=10, seed=0, **kwargs):
+        """FakeReddit serving seeded synthetic fashion posts."""
+        rng = random.Random(seed)
+        phrases = ['baggy jeans', 'vintage nike', 'y2k fit', 'oversized hoodie', 'carhartt workwear',
+                   'new balance 550', 'gorpcore jacket', 'minimalist wardrobe', 'thrift haul', 'uniqlo basics']
+        base_time = 1735689600  # 2025-01-01
+
+        listings = {}
+        for subreddit in subreddits:
+            posts = []
+            for i in range(posts_per_subreddit):
+                post_id = f"{subreddit[:3]}{i:04d}"
+                comments = [{
+                    'id': f"c{post_id}{j:03d}",
+                    'body': f"Love the {rng.choice(phrases)} here",
+                    'score': rng.randint(0, 500),
+                    'created_utc': base_time - rng.randint(0, 30 * 86400),
+                    'author': f"user{rng.randint(1, 5000)}"
+                } for j in range(comments_per_post)]
+                posts.append({
+                    'id': post_id,
+                    'title': f"WDYWT: {rng.choice(phrases)}",
+                    'selftext': f"Paired it with {rng.choice(phrases)}",
+                    'permalink': f"/r/{subreddit}/comments/{post_id}/",
+                    'score': rng.randint(0, 5000),
+                    'created_utc': base_time - rng.randint(0, 30 * 86400),
+                    'author': f"user{rng.randint(1, 5000)}",
+                    'comments': comments
+                })
+            listings[subreddit] = posts
+
+        return cls(listings, **kwargs)
+
+
+def record_listings(reddit, subreddits, path, time_filter='month', limit=100, comment_limit=20):
+    """Record real top listings and comments from a PRAW client to a JSON file for FakeReddit.load."""
+    listings = {}
+    for subreddit in subreddits:
+        posts = []
+        for post in reddit.subreddit(subreddit).top(time_filter=time_filter, limit=limit):
+            post.comments.replace_more(limit=0)
+            comments = [{
+                'id': comment.id,
+                'body': comment.body,
+                'score': comment.score,
+                'created_utc': comment.created_utc,
+                'author': comment.author.name if comment.author else None
+            } for comment in post.comments.list()[:comment_limit] if hasattr(comment, 'body')]
+
+            posts.append({
+                'id': post.id,
+                'title': post.title,
+                'selftext': post.selftext,
+                'permalink': post.permalink,
+                'score': post.score,
+                'created_utc': post.created_utc,
+                'author': post.author.name if post.author else None,
+                'comments': comments
+            })
+        listings[subreddit] = posts
+
+    with open(path, 'w') as f:
+        json.dump(listings, f)
+
+    return listings
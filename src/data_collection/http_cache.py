@@ -0,0 +1,186 @@
+# src/data_collection/http_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL,
+    body BLOB NOT NULL,
+    parsed TEXT,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_http_cache_last_access ON http_cache(last_access);
+
+-- Running total of body sizes, kept by triggers so eviction doesn't sum the table on every store.
+-- Entries must be written with an upsert, not INSERT OR REPLACE, whose deletes skip the triggers.
+CREATE TABLE IF NOT EXISTS http_cache_size (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO http_cache_size (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM http_cache;
+
+CREATE TRIGGER IF NOT EXISTS http_cache_size_insert AFTER INSERT ON http_cache
+BEGIN UPDATE http_cache_size SET bytes = bytes + NEW.size WHERE id = 0; END;
+
+CREATE TRIGGER IF NOT EXISTS http_cache_size_delete AFTER DELETE ON http_cache
+BEGIN UPDATE http_cache_size SET bytes = bytes - OLD.size WHERE id = 0; END;
+
+CREATE TRIGGER IF NOT EXISTS http_cache_size_update AFTER UPDATE OF size ON http_cache
+BEGIN UPDATE http_cache_size SET bytes = bytes - OLD.size + NEW.size WHERE id = 0; END;
+"""
+
+
+def content_hash(body):
+    """SHA-256 of a response body."""
+    return hashlib.sha256(body).hexdigest()
+
+
+class HttpCache:
+    """On-disk cache of product page responses, keyed by URL.
+
+    Each entry keeps the response's ETag/Last-Modified validators, the
+    zlib-compressed body, its content hash and the parsed product. The cache
+    is bounded by `max_bytes` of compressed bodies; the least recently used
+    entries are evicted first.
+    """
+
+    def __init__(self, cache_path=None, max_bytes=256 * 1024 * 1024):
+        if cache_path is None:
+            cache_path = os.path.join(project_root, 'data', 'http_cache.db')
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self.cache_path = cache_path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.counts = {'not_modified': 0, 'unchanged': 0, 'changed': 0, 'new': 0, 'evicted': 0}
+
+        self.conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(CACHE_SCHEMA)
+        self.conn.commit()
+
+    def lookup(self, url):
+        """The cached entry for a URL as a dict, or None."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, content_hash, parsed FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            'etag': row[0],
+            'last_modified': row[1],
+            'content_hash': row[2],
+            'parsed': json.loads(row[3]) if row[3] is not None else None
+        }
+
+    def body(self, url):
+        """The decompressed cached body for a URL, or None."""
+        with self.lock:
+            row = self.conn.execute("SELECT body FROM http_cache WHERE url = ?", (url,)).fetchone()
+        return zlib.decompress(row[0]) if row else None
+
+    def conditional_headers(self, entry):
+        """If-None-Match / If-Modified-Since headers for revalidating a cached entry."""
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, url, response=None, unchanged=False):
+        """Mark a cached entry as still current after a 304 or an identical body.
+
+        Validators sent with a 200 response replace the stored ones.
+        """
+        now = time.time()
+        with self.lock:
+            if response is not None and response.status_code == 200:
+                self.conn.execute(
+                    "UPDATE http_cache SET etag = ?, last_modified = ?, fetched_at = ?, last_access = ? "
+                    "WHERE url = ?",
+                    (response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now, url)
+                )
+            else:
+                self.conn.execute(
+                    "UPDATE http_cache SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, url)
+                )
+            self.conn.commit()
+            self.counts['unchanged' if unchanged else 'not_modified'] += 1
+
+    def store(self, url, response, body, parsed, existed=False):
+        """Cache a fresh response and its parsed product, then evict down to max_bytes."""
+        compressed = zlib.compress(body, 6)
+        now = time.time()
+
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO http_cache "
+                "(url, etag, last_modified, content_hash, body, parsed, size, fetched_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET etag = excluded.etag, last_modified = excluded.last_modified, "
+                "content_hash = excluded.content_hash, body = excluded.body, parsed = excluded.parsed, "
+                "size = excluded.size, fetched_at = excluded.fetched_at, last_access = excluded.last_access",
+                (url, response.headers.get('ETag'), response.headers.get('Last-Modified'), content_hash(body),
+                 compressed, json.dumps(parsed) if parsed is not None else None, len(compressed), now, now)
+            )
+            self._evict()
+            self.conn.commit()
+            self.counts['changed' if existed else 'new'] += 1
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        total = self.conn.execute("SELECT bytes FROM http_cache_size").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        evicted = []
+        for url, size in self.conn.execute("SELECT url, size FROM http_cache ORDER BY last_access"):
+            evicted.append((url,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        self.conn.executemany("DELETE FROM http_cache WHERE url = ?", evicted)
+        self.counts['evicted'] += len(evicted)
+
+    def stats(self):
+        """Entry count, stored bytes and hit/miss counts since the cache was opened."""
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()[0]
+            size = self.conn.execute("SELECT bytes FROM http_cache_size").fetchone()[0]
+            return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes, **self.counts}
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self.lock:
+            self.conn.execute("DELETE FROM http_cache")
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            if self.conn:
+                self.conn.close()
+                self.conn = None
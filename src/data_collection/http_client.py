@@ -0,0 +1,174 @@
+# src/data_collection/http_client.py
+
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+try:
+    import brotli  # noqa: F401 - urllib3 decodes "br" responses when it is installed
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive'
+}
+
+
+class ConnectionStats:
+    """Thread-safe per-host counters of requests sent and TCP/TLS connections opened."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.connections = {}
+
+    def record_request(self, host):
+        with self.lock:
+            self.requests[host] = self.requests.get(host, 0) + 1
+
+    def record_connection(self, host):
+        with self.lock:
+            self.connections[host] = self.connections.get(host, 0) + 1
+
+    def snapshot(self):
+        """Totals and per-host counts; reused = requests that didn't need a new connection."""
+        with self.lock:
+            per_host = {}
+            for host in set(self.requests) | set(self.connections):
+                requests_sent = self.requests.get(host, 0)
+                opened = self.connections.get(host, 0)
+                per_host[host] = {
+                    'requests': requests_sent,
+                    'connections_opened': opened,
+                    'connections_reused': max(requests_sent - opened, 0)
+                }
+
+        return {
+            'requests': sum(h['requests'] for h in per_host.values()),
+            'connections_opened': sum(h['connections_opened'] for h in per_host.values()),
+            'connections_reused': sum(h['connections_reused'] for h in per_host.values()),
+            'per_host': per_host
+        }
+
+
+def counting_pool_classes(stats):
+    """urllib3 connection pool classes that report every TCP/TLS connect to `stats`.
+
+    Counted in the connection's connect(), not the pool's _new_conn(): a pooled
+    connection object whose socket the server closed reconnects in place.
+    """
+
+    class CountingHTTPConnection(HTTPConnection):
+        def connect(self):
+            stats.record_connection(self.host)
+            return super().connect()
+
+    class CountingHTTPSConnection(HTTPSConnection):
+        def connect(self):
+            stats.record_connection(self.host)
+            return super().connect()
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CountingHTTPConnection
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CountingHTTPSConnection
+
+    return {'http': CountingHTTPConnectionPool, 'https': CountingHTTPSConnectionPool}
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools count the connections they open."""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = counting_pool_classes(self.stats)
+
+
+class HttpClient:
+    """Shared HTTP client with one pooled keep-alive Session per host.
+
+    Connections to a host are reused across requests (and across scrapers that
+    share the client), responses are negotiated as gzip/brotli, and every
+    request gets a timeout. `stats()` reports connections opened versus reused.
+    """
+
+    def __init__(self, headers=None, pool_maxsize=10, timeout=(5, 30), max_retries=2):
+        self.headers = dict(DEFAULT_HEADERS)
+        if headers:
+            self.headers.update(headers)
+
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+        self.connection_stats = ConnectionStats()
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def session_for(self, url):
+        """The pooled Session for the URL's host, created on first use."""
+        parsed = urlparse(url)
+        host_key = f"{parsed.scheme}://{parsed.netloc}"
+
+        with self.lock:
+            session = self.sessions.get(host_key)
+            if session is None:
+                session = self._create_session(parsed.hostname)
+                self.sessions[host_key] = session
+            return session
+
+    def _create_session(self, host):
+        session = requests.Session()
+        session.headers.update(self.headers)
+
+        retry = Retry(total=self.max_retries, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['GET', 'HEAD'])
+        adapter = CountingHTTPAdapter(self.connection_stats, pool_connections=1,
+                                      pool_maxsize=self.pool_maxsize, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        session.hooks['response'].append(lambda response, *args, **kwargs: self.connection_stats.record_request(host))
+        return session
+
+    def get(self, url, **kwargs):
+        """GET through the host's pooled session, with the client's default timeout."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session_for(url).get(url, **kwargs)
+
+    def stats(self):
+        """Requests sent and connections opened/reused, in total and per host."""
+        return self.connection_stats.snapshot()
+
+    def close(self):
+        """Close every pooled session."""
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = {}
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """Process-wide HttpClient shared by the scrapers."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
@@ -1,6 +1,5 @@
 # src/data_collection/instagram_scraper.py
 
-import requests
 from bs4 import BeautifulSoup
 import json
 import time
@@ -8,42 +7,50 @@ import random
 from datetime import datetime
 import os
 import sys
-import sqlite3
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(project_root)
 
 from src.database.database_setup import DatabaseManager
+from src.data_collection.http_client import get_default_client
+from src.database.term_store import TermStore
+from src.database.near_duplicates import DuplicateDetector
 
 
 class InstagramHashtagScraper:
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, http_client=None):
         self.db_manager = db_manager
+
+        # Pooled keep-alive sessions, shared with the other scrapers by default
+        self.http = http_client or get_default_client()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.base_url = 'https://www.instagram.com/explore/tags/{}/'
+        self.term_store = TermStore()
+        self.duplicate_detector = DuplicateDetector()
 
     def scrape_hashtag(self, hashtag):
         """Scrape posts from a specific hashtag."""
         try:
-            # This is a simplified example - real Instagram scraping requires more complex handling
-            url = self.base_url.format(hashtag.strip('#'))
-            response = requests.get(url, headers=self.headers)
-
-            if response.status_code == 200:
-                # Parse the page for post data
-                posts = self.extract_posts(response.text)
-                return posts
-            else:
-                print(f"Failed to scrape {hashtag}: Status {response.status_code}")
-                return []
-
+            return self.fetch_hashtag(hashtag)
         except Exception as e:
             print(f"Error scraping {hashtag}: {e}")
             return []
 
+    def fetch_hashtag(self, hashtag):
+        """Scrape posts from a specific hashtag, raising if the page can't be fetched."""
+        # This is a simplified example - real Instagram scraping requires more complex handling
+        url = self.base_url.format(hashtag.strip('#'))
+        response = self.http.get(url, headers=self.headers)
+
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to scrape {hashtag}: Status {response.status_code}")
+
+        # Parse the page for post data
+        return self.extract_posts(response.text)
+
     def extract_posts(self, html_content):
         """Extract post data from HTML - simplified example."""
         # This is a placeholder - real Instagram scraping is more complex
@@ -77,26 +84,42 @@ class InstagramHashtagScraper:
     def save_posts(self, posts):
         """Save posts to the database."""
         try:
-            # Use the correct database path from DatabaseManager
-            engine = self.db_manager.create_sqlalchemy_engine()
+            self.write_posts(posts)
+            print(f"Successfully saved {len(posts)} posts")
+        except Exception as e:
+            print(f"Error saving posts: {e}")
 
-            with engine.connect() as conn:
-                from sqlalchemy import text
+    def write_posts(self, posts):
+        """Save posts to the database, raising if that fails. Returns the number of posts."""
+        # Use the correct database path from DatabaseManager
+        engine = self.db_manager.create_sqlalchemy_engine()
 
-                sql_insert = text("""
-                INSERT INTO social_posts 
-                (platform, post_url, username, followers, caption, likes, comments, shares, created_at)
-                VALUES (:platform, :post_url, :username, :followers, :caption, :likes, :comments, :shares, :created_at)
-                """)
+        with engine.connect() as conn:
+            from sqlalchemy import text
 
-                for post in posts:
-                    conn.execute(sql_insert, post)
+            # Posts already stored under the same URL are skipped rather than duplicated
+            sql_insert = text("""
+            INSERT OR IGNORE INTO social_posts 
+            (platform, post_url, username, followers, caption, likes, comments, shares, created_at)
+            VALUES (:platform, :post_url, :username, :followers, :caption, :likes, :comments, :shares, :created_at)
+            """)
 
-                conn.commit()
-                print(f"Successfully saved {len(posts)} posts")
+            for post in posts:
+                conn.execute(sql_insert, post)
 
-        except Exception as e:
-            print(f"Error saving posts: {e}")
+            conn.commit()
+
+        # Caption hashtags and keywords go into post_terms once, at ingest, and reposts are flagged
+        try:
+            with self.db_manager.connection() as conn:
+                self.term_store.write_for_urls(conn.cursor(), posts)
+                self.duplicate_detector.mark_for_urls(conn.cursor(), posts)
+        except Exception:
+            # Rolled back, so term IDs cached during it may be reused for other terms
+            self.term_store.clear_cache()
+            raise
+
+        return len(posts)
 
 if __name__ == "__main__":
     db = DatabaseManager()
@@ -111,4 +134,8 @@ if __name__ == "__main__":
         scraper.save_posts(posts)
         time.sleep(random.uniform(2, 5))  # Be nice to the server
 
-    print("Scraping complete!")
\ No newline at end of file
+    print("Scraping complete!")
+
+    stats = scraper.http.stats()
+    print(f"HTTP connections: {stats['connections_opened']} opened, {stats['connections_reused']} reused "
+          f"for {stats['requests']} requests")
\ No newline at end of file
@@ -0,0 +1,212 @@
+# src/data_collection/product_parser.py
+
+import json
+import re
+from datetime import datetime
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+PRODUCT_FIELDS = ['name', 'price', 'sale_price', 'description', 'category', 'brand', 'material', 'gender']
+
+# Open Graph / product meta properties, checked when a field isn't found by selector or JSON-LD
+META_PROPERTIES = {
+    'name': ['og:title'],
+    'description': ['og:description', 'description'],
+    'price': ['product:price:amount', 'og:price:amount'],
+    'sale_price': ['product:sale_price:amount'],
+    'brand': ['product:brand', 'og:brand'],
+    'category': ['product:category'],
+    'material': ['product:material'],
+    'gender': ['product:gender']
+}
+
+
+def clean_price(price_text):
+    """Extract numerical price from price text."""
+    if price_text is None:
+        return None
+    if isinstance(price_text, (int, float)):
+        return float(price_text)
+
+    # Remove currency symbols and extract numbers
+    price_match = re.search(r'(\d+(?:\.\d{2})?)', str(price_text).replace(',', ''))
+    if price_match:
+        return float(price_match.group(1))
+    return None
+
+
+class ExtractionSpec:
+    """How to pull product fields out of one site's pages.
+
+    `selectors` maps product fields to CSS selectors; append `@attr` to read an
+    attribute instead of the element text (e.g. 'meta[itemprop=price]@content').
+    JSON-LD Product data and og:/product: meta tags fill any field the selectors
+    miss. Only the tags the spec needs are built into the tree; set `tags`
+    explicitly when a selector has a compound that doesn't start with a tag
+    name, or uses a sibling combinator (otherwise the whole page is parsed).
+    """
+
+    def __init__(self, selectors=None, json_ld=True, meta=True, tags=None):
+        self.selectors = selectors or {}
+        self.json_ld = json_ld
+        self.meta = meta
+        self.tags = tags if tags is not None else self._selector_tags()
+
+    def _selector_tags(self):
+        tags = set()
+        for selector in self.selectors.values():
+            css = selector.split('@', 1)[0]
+            # Sibling combinators need elements the strainer can't keep alongside the match
+            if '+' in css or '~' in css:
+                return None
+            # A kept tag keeps its whole subtree, so keeping every compound's tag keeps the
+            # ancestors that descendant and child selectors walk through
+            for compound in re.split(r'\s*>\s*|\s+', css.strip()):
+                match = re.match(r'^([a-zA-Z][\w-]*)', compound)
+                if not match:
+                    return None
+                tags.add(match.group(1).lower())
+        return tags
+
+    def strainer(self):
+        """SoupStrainer keeping only the tags this spec reads, or None to parse everything."""
+        if self.tags is None:
+            return None
+
+        tags = set(self.tags)
+        if self.json_ld:
+            tags.add('script')
+        if self.meta:
+            tags.add('meta')
+        return SoupStrainer(sorted(tags))
+
+
+# Generic spec for sites without their own entry
+DEFAULT_SPEC = ExtractionSpec({
+    'name': 'h1',
+    'price': 'span.product-price',
+    'sale_price': 'span.sale-price'
+})
+
+# Per-site specs keyed by host (without "www.")
+SITE_SPECS = {}
+
+
+def register_site_spec(host, spec):
+    """Use `spec` for pages from `host`."""
+    SITE_SPECS[host.lower().removeprefix('www.')] = spec
+
+
+class ProductParser:
+    """Extract product fields from HTML with a per-site ExtractionSpec.
+
+    Pages are parsed with lxml (falling back to html.parser) and, where the
+    spec allows, a SoupStrainer so only the relevant tags are built.
+    """
+
+    def __init__(self, specs=None, default_spec=None, parser=DEFAULT_PARSER):
+        self.specs = specs if specs is not None else SITE_SPECS
+        self.default_spec = default_spec or DEFAULT_SPEC
+        self.parser = parser
+
+    def spec_for(self, url):
+        host = (urlparse(url).hostname or '').lower().removeprefix('www.')
+        return self.specs.get(host, self.default_spec)
+
+    def parse(self, content, url):
+        """Parse raw page content into a product dict."""
+        spec = self.spec_for(url)
+        soup = BeautifulSoup(content, self.parser, parse_only=spec.strainer())
+        return self.extract(soup, url, spec)
+
+    def extract(self, soup, url, spec=None):
+        """Extract a product dict from an already-built soup."""
+        if spec is None:
+            spec = self.spec_for(url)
+
+        product_data = {'url': url}
+        product_data.update({field: None for field in PRODUCT_FIELDS})
+        product_data['scrape_date'] = datetime.now().strftime('%Y-%m-%d')
+
+        for field, selector in spec.selectors.items():
+            product_data[field] = self.select_value(soup, selector)
+
+        if spec.json_ld:
+            self.fill_missing(product_data, self.json_ld_fields(soup))
+        if spec.meta:
+            self.fill_missing(product_data, self.meta_fields(soup))
+
+        product_data['price'] = clean_price(product_data['price'])
+        product_data['sale_price'] = clean_price(product_data['sale_price'])
+        return product_data
+
+    @staticmethod
+    def fill_missing(product_data, values):
+        for field, value in values.items():
+            if product_data.get(field) is None and value is not None:
+                product_data[field] = value
+
+    @staticmethod
+    def select_value(soup, selector):
+        css, _, attr = selector.partition('@')
+        element = soup.select_one(css)
+        if element is None:
+            return None
+        value = element.get(attr) if attr else element.get_text(' ', strip=True)
+        return value or None
+
+    @staticmethod
+    def meta_fields(soup):
+        content = {}
+        for tag in soup.find_all('meta'):
+            key = tag.get('property') or tag.get('name')
+            if key and tag.get('content'):
+                content.setdefault(key.lower(), tag['content'])
+
+        values = {}
+        for field, properties in META_PROPERTIES.items():
+            for prop in properties:
+                if prop in content:
+                    values[field] = content[prop]
+                    break
+        return values
+
+    @staticmethod
+    def json_ld_fields(soup):
+        """Fields from the first schema.org Product in the page's JSON-LD blocks."""
+        for script in soup.find_all('script', type='application/ld+json'):
+            try:
+                data = json.loads(script.string or '')
+            except ValueError:
+                continue
+
+            candidates = data if isinstance(data, list) else data.get('@graph', [data])
+            for item in candidates:
+                if not isinstance(item, dict) or item.get('@type') not in ('Product', ['Product']):
+                    continue
+
+                offers = item.get('offers') or {}
+                if isinstance(offers, list):
+                    offers = offers[0] if offers else {}
+                brand = item.get('brand')
+                if isinstance(brand, dict):
+                    brand = brand.get('name')
+
+                return {
+                    'name': item.get('name'),
+                    'description': item.get('description'),
+                    'price': offers.get('price'),
+                    'brand': brand,
+                    'category': item.get('category'),
+                    'material': item.get('material'),
+                    'gender': item.get('audience', {}).get('suggestedGender')
+                    if isinstance(item.get('audience'), dict) else None
+                }
+        return {}
@@ -0,0 +1,137 @@
+# src/data_collection/product_writer.py
+
+import threading
+from datetime import datetime
+
+PRODUCT_COLUMNS = ['category_id', 'description', 'material', 'gender']
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+def chunked(items, size=LOOKUP_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class ProductWriter:
+    """Write scraped products in batches.
+
+    Brand, category and product IDs are resolved from in-memory caches that
+    are warmed as batches are written; only unseen names hit the database.
+    Each batch is written with executemany in a single transaction on a
+    connection from the DatabaseManager's pool, relying on the natural-key
+    unique indexes from migration 005.
+    """
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        # Batches may be written from executor threads; the lock serializes them
+        self.lock = threading.Lock()
+
+        self.brand_ids = {}
+        self.category_ids = {}
+        self.product_ids = {}
+
+    def resolve_names(self, cursor, table, name_column, id_column, names, cache):
+        """Map names to IDs, inserting only the ones not seen before."""
+        missing = sorted({name for name in names if name is not None and name not in cache})
+        if missing:
+            cursor.executemany(
+                f"INSERT OR IGNORE INTO {table} ({name_column}) VALUES (?)", [(name,) for name in missing]
+            )
+            for chunk in chunked(missing):
+                placeholders = ', '.join('?' * len(chunk))
+                cursor.execute(
+                    f"SELECT {name_column}, {id_column} FROM {table} WHERE {name_column} IN ({placeholders})",
+                    chunk
+                )
+                cache.update(cursor.fetchall())
+
+        return {name: cache.get(name) for name in names}
+
+    def lookup_products(self, cursor, keys):
+        """Fill the product cache for (brand_id, product_name) keys already in the database."""
+        missing = [key for key in keys if key not in self.product_ids]
+        names = sorted({name for _, name in missing})
+        for chunk in chunked(names):
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(
+                f"SELECT brand_id, product_name, product_id FROM products WHERE product_name IN ({placeholders})",
+                chunk
+            )
+            for brand_id, name, product_id in cursor.fetchall():
+                # Rows that predate the unique index may repeat a key; keep the oldest
+                self.product_ids.setdefault((brand_id, name), product_id)
+
+    def write(self, products):
+        """Upsert a batch of scraped product dicts and record their prices.
+
+        Products without a name are skipped. Returns the number of products written.
+        """
+        products = [product for product in products if product.get('name')]
+        if not products:
+            return 0
+
+        with self.lock:
+            conn = self.db_manager.create_connection()
+            cursor = conn.cursor()
+            try:
+                brand_ids = self.resolve_names(cursor, 'brands', 'brand_name', 'brand_id',
+                                               [product.get('brand') for product in products], self.brand_ids)
+                category_ids = self.resolve_names(cursor, 'categories', 'category_name', 'category_id',
+                                                  [product.get('category') for product in products],
+                                                  self.category_ids)
+
+                # The last occurrence of a product within the batch wins
+                rows = {}
+                for product in products:
+                    key = (brand_ids[product.get('brand')], product['name'])
+                    rows[key] = (
+                        category_ids[product.get('category')], product.get('description'),
+                        product.get('material'), product.get('gender')
+                    )
+
+                self.lookup_products(cursor, list(rows))
+                updates = [values + key[::-1] for key, values in rows.items() if key in self.product_ids]
+                inserts = [key[::-1] + values for key, values in rows.items() if key not in self.product_ids]
+
+                cursor.executemany(f"""
+                UPDATE products
+                SET {', '.join(f'{column} = COALESCE(?, {column})' for column in PRODUCT_COLUMNS)}
+                WHERE product_name = ? AND brand_id IS ?
+                """, updates)
+
+                if inserts:
+                    cursor.executemany(f"""
+                    INSERT INTO products (product_name, brand_id, {', '.join(PRODUCT_COLUMNS)})
+                    VALUES (?, ?, {', '.join('?' * len(PRODUCT_COLUMNS))})
+                    """, inserts)
+                    self.lookup_products(cursor, [(brand_id, name) for name, brand_id, *_ in inserts])
+
+                today = datetime.now().strftime('%Y-%m-%d')
+                price_rows = [
+                    (self.product_ids[(brand_ids[product.get('brand')], product['name'])],
+                     product['price'], product.get('sale_price'), product.get('scrape_date') or today)
+                    for product in products if product.get('price') is not None
+                ]
+                cursor.executemany("""
+                INSERT INTO price_history (product_id, price, sale_price, date_recorded)
+                VALUES (?, ?, ?, ?)
+                """, price_rows)
+
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                # IDs cached during a rolled-back batch may not exist
+                self.clear_caches()
+                raise
+            finally:
+                conn.close()
+
+        return len(products)
+
+    def clear_caches(self):
+        self.brand_ids = {}
+        self.category_ids = {}
+        self.product_ids = {}
@@ -1,9 +1,13 @@
 # src/data_collection/reddit_scraper.py
 
 import praw
+import numpy as np
 import pandas as pd
+import json
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import os
 import sys
@@ -13,13 +17,84 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.append(project_root)
 
 from src.database.database_setup import DatabaseManager
+from src.database.term_store import TermStore
+from src.database.near_duplicates import DuplicateDetector
+from src.data_collection.crawl_frontier import CrawlFrontier, CrawlScheduler, scraper_handlers
+
+# Newest post ids remembered per subreddit checkpoint, to catch posts sharing a timestamp
+CHECKPOINT_IDS = 100
+
+# Relative weight of a mention by term type when scoring trends
+TERM_TYPE_WEIGHTS = {'hashtag': 1.5, 'keyword': 1.2, 'brand': 1.0}
+
+
+class AdaptiveRateLimiter:
+    """Spread API calls evenly over what's left of the current rate-limit window.
+
+    Reads the budget PRAW parses from Reddit's X-Ratelimit headers
+    (`reddit.auth.limits`). While more than `burst_fraction` of the window's
+    budget is left, calls go out as fast as the workers issue them (at most
+    one per `min_interval`); below that, the `remaining` requests are spaced
+    evenly until `reset_timestamp`. Shared by all worker threads; `client` is
+    called to get the calling thread's PRAW client, whose limits are read.
+    """
+
+    def __init__(self, client, min_interval=0.0, reserve=5, burst_fraction=0.5):
+        self.client = client
+        self.min_interval = min_interval
+        self.reserve = reserve  # requests held back for retries and other clients
+        self.burst_fraction = burst_fraction
+        self.next_allowed = 0.0
+        self.lock = threading.Lock()
+        self.waited = 0.0
+
+    def limits(self):
+        try:
+            return self.client().auth.limits or {}
+        except Exception:
+            return {}
+
+    def interval(self):
+        """Seconds to leave between calls given the current budget."""
+        limits = self.limits()
+        remaining = limits.get('remaining')
+        reset_timestamp = limits.get('reset_timestamp')
+        if remaining is None or reset_timestamp is None:
+            return self.min_interval
+
+        window = max(reset_timestamp - time.time(), 0)
+        usable = remaining - self.reserve
+        if usable <= 0:
+            # Budget exhausted: hold everything until the window resets
+            return window
+
+        budget = remaining + (limits.get('used') or 0)
+        if remaining > budget * self.burst_fraction:
+            return self.min_interval
+        return max(window / usable, self.min_interval)
+
+    def wait(self):
+        """Block until the next API call is allowed."""
+        with self.lock:
+            now = time.monotonic()
+            scheduled = max(now, self.next_allowed)
+            self.next_allowed = scheduled + self.interval()
+
+        delay = scheduled - now
+        if delay > 0:
+            self.waited += delay
+            time.sleep(delay)
 
 
 class RedditFashionScraper:
-    def __init__(self, client_id, client_secret, user_agent, db_manager, username=None, password=None):
+    def __init__(self, client_id, client_secret, user_agent, db_manager, username=None, password=None,
+                 reddit=None):
+        # A PRAW-compatible backend can be passed in directly (e.g. FakeReddit for testing).
+        # It is shared by all worker threads, so it must be thread-safe.
+        self.shared_reddit = reddit
         # If username and password are provided, use password flow
         if username and password:
-            self.reddit = praw.Reddit(
+            self.reddit_options = dict(
                 client_id=client_id,
                 client_secret=client_secret,
                 user_agent=user_agent,
@@ -28,7 +103,7 @@ class RedditFashionScraper:
             )
         # Otherwise use read-only mode
         else:
-            self.reddit = praw.Reddit(
+            self.reddit_options = dict(
                 client_id=client_id,
                 client_secret=client_secret,
                 user_agent=user_agent,
@@ -36,10 +111,23 @@ class RedditFashionScraper:
                 read_only=True  # Explicitly set read-only mode
             )
 
+        # PRAW clients aren't thread-safe, so each worker thread gets its own (see client())
+        self.local = threading.local()
+        self.reddit = self.client()
+
         print(f"Authenticated: {self.reddit.read_only}")
 
         self.db_manager = db_manager
 
+        # Paces every API call from the rate-limit headers instead of fixed sleeps
+        self.rate_limiter = AdaptiveRateLimiter(self.client)
+
+        # Newest posts seen per subreddit during an incremental scrape, saved as checkpoints
+        self.latest_seen = {}
+
+        self.term_store = TermStore()
+        self.duplicate_detector = DuplicateDetector()
+
         # Fashion-related subreddits
         self.fashion_subreddits = [
             'streetwear',
@@ -72,6 +160,17 @@ class RedditFashionScraper:
             'balenciaga', 'yeezy', 'asos', 'shein', 'urban outfitters'
         ]
 
+    def client(self):
+        """The calling thread's Reddit client, created on first use."""
+        if self.shared_reddit is not None:
+            return self.shared_reddit
+
+        reddit = getattr(self.local, 'reddit', None)
+        if reddit is None:
+            reddit = praw.Reddit(**self.reddit_options)
+            self.local.reddit = reddit
+        return reddit
+
     def extract_fashion_terms(self, text):
         """Extract fashion-related terms from text."""
         text = text.lower()
@@ -93,90 +192,178 @@ class RedditFashionScraper:
 
         return hashtags, keywords, brands
 
-    def scrape_subreddit(self, subreddit_name, time_filter='month', limit=100):
-        """Scrape posts from a subreddit."""
-        try:
-            print(f"Scraping r/{subreddit_name}...")
-            subreddit = self.reddit.subreddit(subreddit_name)
-
-            posts_data = []
-
-            # Get top posts
-            for post in subreddit.top(time_filter=time_filter, limit=limit):
-                # Skip posts with no text
-                if not post.selftext and not post.title:
-                    continue
-
-                # Combine title and selftext for analysis
-                full_text = f"{post.title} {post.selftext}"
-
-                # Extract fashion terms
-                hashtags, keywords, brands = self.extract_fashion_terms(full_text)
-
-                # Skip posts with no fashion terms
-                if not hashtags and not keywords and not brands:
+    def post_record(self, post, subreddit_name):
+        """Social post row for a submission, or None if it mentions no fashion terms."""
+        # Skip posts with no text
+        if not post.selftext and not post.title:
+            return None
+
+        # Combine title and selftext for analysis
+        full_text = f"{post.title} {post.selftext}"
+
+        # Extract fashion terms
+        hashtags, keywords, brands = self.extract_fashion_terms(full_text)
+
+        # Skip posts with no fashion terms
+        if not hashtags and not keywords and not brands:
+            return None
+
+        return {
+            'platform': 'Reddit',
+            'post_url': f"https://www.reddit.com{post.permalink}",
+            'username': post.author.name if post.author else '[deleted]',
+            'followers': 0,  # Reddit doesn't have follower counts for regular users
+            'caption': full_text[:500],  # Limit to 500 chars
+            'likes': post.score,
+            'comments': post.num_comments,
+            'shares': 0,  # Reddit doesn't track shares
+            'created_at': datetime.fromtimestamp(post.created_utc).strftime('%Y-%m-%d %H:%M:%S'),
+            'subreddit': subreddit_name,
+            'hashtags': ', '.join(hashtags),
+            'keywords': ', '.join(keywords),
+            'brands': ', '.join(brands)
+        }
+
+    def comment_records(self, post, subreddit_name):
+        """Social post rows for a submission's top comments that mention fashion terms."""
+        self.rate_limiter.wait()
+
+        # The submission came from the thread that fetched the listing; load its comments
+        # through this thread's client (one request, as with the listing's object)
+        if self.shared_reddit is None:
+            post = self.client().submission(id=post.id)
+
+        comments_data = []
+        post.comments.replace_more(limit=0)  # Skip "load more comments" links
+        for comment in post.comments.list()[:20]:  # Get top comments
+            if hasattr(comment, 'body') and comment.body:
+                # Extract fashion terms from comment
+                comment_hashtags, comment_keywords, comment_brands = self.extract_fashion_terms(comment.body)
+
+                # Skip comments with no fashion terms
+                if not comment_hashtags and not comment_keywords and not comment_brands:
                     continue
 
-                # Create post data
-                post_data = {
+                comments_data.append({
                     'platform': 'Reddit',
-                    'post_url': f"https://www.reddit.com{post.permalink}",
-                    'username': post.author.name if post.author else '[deleted]',
-                    'followers': 0,  # Reddit doesn't have follower counts for regular users
-                    'caption': full_text[:500],  # Limit to 500 chars
-                    'likes': post.score,
-                    'comments': post.num_comments,
-                    'shares': 0,  # Reddit doesn't track shares
-                    'created_at': datetime.fromtimestamp(post.created_utc).strftime('%Y-%m-%d %H:%M:%S'),
+                    'post_url': f"https://www.reddit.com{post.permalink}{comment.id}",
+                    'username': comment.author.name if comment.author else '[deleted]',
+                    'followers': 0,
+                    'caption': comment.body[:500],  # Limit to 500 chars
+                    'likes': comment.score,
+                    'comments': 0,  # Comments don't have nested count
+                    'shares': 0,
+                    'created_at': datetime.fromtimestamp(comment.created_utc).strftime('%Y-%m-%d %H:%M:%S'),
                     'subreddit': subreddit_name,
-                    'hashtags': ', '.join(hashtags),
-                    'keywords': ', '.join(keywords),
-                    'brands': ', '.join(brands)
-                }
-
-                posts_data.append(post_data)
-
-                # Get comments for this post
-                post.comments.replace_more(limit=0)  # Skip "load more comments" links
-                for comment in post.comments.list()[:20]:  # Get top comments
-                    if hasattr(comment, 'body') and comment.body:
-                        # Extract fashion terms from comment
-                        comment_hashtags, comment_keywords, comment_brands = self.extract_fashion_terms(comment.body)
-
-                        # Skip comments with no fashion terms
-                        if not comment_hashtags and not comment_keywords and not comment_brands:
-                            continue
-
-                        # Create comment data
-                        comment_data = {
-                            'platform': 'Reddit',
-                            'post_url': f"https://www.reddit.com{post.permalink}{comment.id}",
-                            'username': comment.author.name if comment.author else '[deleted]',
-                            'followers': 0,
-                            'caption': comment.body[:500],  # Limit to 500 chars
-                            'likes': comment.score,
-                            'comments': 0,  # Comments don't have nested count
-                            'shares': 0,
-                            'created_at': datetime.fromtimestamp(comment.created_utc).strftime('%Y-%m-%d %H:%M:%S'),
-                            'subreddit': subreddit_name,
-                            'hashtags': ', '.join(comment_hashtags),
-                            'keywords': ', '.join(comment_keywords),
-                            'brands': ', '.join(comment_brands)
-                        }
-
-                        posts_data.append(comment_data)
-
-                # Sleep to avoid rate limits
-                time.sleep(0.5)
-
-            return posts_data
+                    'hashtags': ', '.join(comment_hashtags),
+                    'keywords': ', '.join(comment_keywords),
+                    'brands': ', '.join(comment_brands)
+                })
+
+        return comments_data
+
+    def list_posts(self, subreddit_name, time_filter='month', limit=100, checkpoint=None):
+        """Fetch a subreddit's listing. Returns (submission, post record) pairs worth keeping.
+
+        Without a checkpoint this is the top listing. With one (a dict as
+        returned by load_checkpoints, possibly empty) it pages through the new
+        listing, however far back that takes, and stops at the first post the
+        checkpoint already covers. An empty checkpoint (a first run) takes the
+        newest `limit` posts.
+        """
+        self.rate_limiter.wait()
+        subreddit = self.client().subreddit(subreddit_name)
+
+        if checkpoint is None:
+            listing = subreddit.top(time_filter=time_filter, limit=limit)
+        else:
+            # Everything since the checkpoint is fetched, or the posts skipped would never be seen
+            listing = subreddit.new(limit=None if checkpoint.get('last_created_utc') else limit)
+            known_ids = set(checkpoint.get('last_post_ids', []))
+            last_created = checkpoint.get('last_created_utc') or 0
+            seen = []
+
+        posts = []
+        for post in listing:
+            if checkpoint is not None:
+                if post.id in known_ids or post.created_utc < last_created:
+                    break
+                seen.append((post.created_utc, post.id))
+
+            record = self.post_record(post, subreddit_name)
+            if record is not None:
+                posts.append((post, record))
+
+        if checkpoint is not None and seen:
+            self.latest_seen[subreddit_name] = seen
+        return posts
 
+    def scrape_subreddit(self, subreddit_name, time_filter='month', limit=100):
+        """Scrape posts from a subreddit."""
+        try:
+            return self.fetch_subreddit(subreddit_name, time_filter, limit)
         except Exception as e:
             print(f"Error scraping r/{subreddit_name}: {e}")
             return []
 
+    def fetch_subreddit(self, subreddit_name, time_filter='month', limit=100):
+        """Scrape posts from a subreddit, raising if the listing or a comment tree can't be fetched."""
+        print(f"Scraping r/{subreddit_name}...")
+
+        posts_data = []
+        for post, record in self.list_posts(subreddit_name, time_filter, limit):
+            posts_data.append(record)
+            posts_data.extend(self.comment_records(post, subreddit_name))
+
+        return posts_data
+
+    def scrape_subreddits(self, subreddit_names, time_filter='month', limit=100, max_workers=8,
+                          checkpoints=None):
+        """Scrape several subreddits with listings and comment trees fetched in a bounded thread pool.
+
+        Comment fetches for a subreddit start as soon as its listing arrives. Each
+        worker thread uses its own Reddit client, and all calls share the
+        adaptive rate limiter. Pass `checkpoints` (from
+        load_checkpoints) to only fetch posts newer than the last scrape.
+        Returns {subreddit: rows}, each post followed by its comments as in
+        scrape_subreddit.
+        """
+        results = {name: [] for name in subreddit_names}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            listing_futures = {
+                executor.submit(self.list_posts, name, time_filter, limit,
+                                None if checkpoints is None else checkpoints.get(name, {})): name
+                for name in subreddit_names
+            }
+
+            comment_futures = {}
+            for future in as_completed(listing_futures):
+                name = listing_futures[future]
+                try:
+                    posts = future.result()
+                except Exception as e:
+                    print(f"Error scraping r/{name}: {e}")
+                    continue
+
+                for index, (post, record) in enumerate(posts):
+                    results[name].append([record])
+                    comment_futures[executor.submit(self.comment_records, post, name)] = (name, index)
+
+            for future in as_completed(comment_futures):
+                name, index = comment_futures[future]
+                try:
+                    results[name][index].extend(future.result())
+                except Exception as e:
+                    print(f"Error fetching comments in r/{name}: {e}")
+
+        return {name: [row for rows in post_rows for row in rows] for name, post_rows in results.items()}
+
     def save_to_database(self, posts_data):
-        """Save the scraped data to the database."""
+        """Save the scraped data to the database, skipping posts whose URL is already stored.
+
+        Nothing is kept if the save fails; the error is raised after it is reported.
+        """
         if not posts_data:
             print("No data to save.")
             return 0
@@ -184,139 +371,204 @@ class RedditFashionScraper:
         conn = self.db_manager.create_connection()
         cursor = conn.cursor()
 
-        # Add fashion keywords and brands columns if they don't exist
+        # Save posts
         try:
-            cursor.execute("SELECT hashtags FROM social_posts LIMIT 1")
-        except:
-            # Add new columns if they don't exist
-            try:
-                cursor.execute("ALTER TABLE social_posts ADD COLUMN subreddit TEXT")
-                cursor.execute("ALTER TABLE social_posts ADD COLUMN hashtags TEXT")
-                cursor.execute("ALTER TABLE social_posts ADD COLUMN keywords TEXT")
-                cursor.execute("ALTER TABLE social_posts ADD COLUMN brands TEXT")
-                print("Added new columns to social_posts table")
-            except Exception as e:
-                print(f"Error adding columns: {e}")
+            cursor.executemany("""
+            INSERT OR IGNORE INTO social_posts 
+            (platform, post_url, username, followers, caption, likes, comments, shares, created_at, 
+            subreddit, hashtags, keywords, brands)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(
+                post['platform'],
+                post['post_url'],
+                post['username'],
+                post['followers'],
+                post['caption'],
+                post['likes'],
+                post['comments'],
+                post['shares'],
+                post['created_at'],
+                post.get('subreddit', ''),
+                post.get('hashtags', ''),
+                post.get('keywords', ''),
+                post.get('brands', '')
+            ) for post in posts_data])
+            # rowcount sums sqlite3_changes() over the rows, which leaves out writes made by triggers
+            # (caption index, table_stats) and posts ignored as already stored
+            count = cursor.rowcount
+
+            self.term_store.write_for_urls(cursor, posts_data)
+            self.duplicate_detector.mark_for_urls(cursor, posts_data)
+            conn.commit()
+        except Exception as e:
+            print(f"Error saving posts: {e}")
+            conn.rollback()
+            # Term IDs cached during the rolled-back save may be reused for other terms
+            self.term_store.clear_cache()
+            raise
+        finally:
+            conn.close()
 
-        # Save posts
-        count = 0
-        for post in posts_data:
-            try:
-                cursor.execute("""
-                INSERT INTO social_posts 
-                (platform, post_url, username, followers, caption, likes, comments, shares, created_at, 
-                subreddit, hashtags, keywords, brands)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    post['platform'],
-                    post['post_url'],
-                    post['username'],
-                    post['followers'],
-                    post['caption'],
-                    post['likes'],
-                    post['comments'],
-                    post['shares'],
-                    post['created_at'],
-                    post.get('subreddit', ''),
-                    post.get('hashtags', ''),
-                    post.get('keywords', ''),
-                    post.get('brands', '')
-                ))
-                count += 1
-            except Exception as e:
-                print(f"Error saving post: {e}")
+        return count
 
-        conn.commit()
-        conn.close()
+    def load_checkpoints(self):
+        """Per-subreddit checkpoints from earlier incremental scrapes: {subreddit: {...}}."""
+        conn = self.db_manager.create_connection()
+        cursor = conn.cursor()
 
-        return count
+        cursor.execute("""
+        SELECT source, last_created_utc, last_post_ids FROM scrape_checkpoints WHERE source LIKE 'reddit:%'
+        """)
+        checkpoints = {
+            source.split(':', 1)[1]: {
+                'last_created_utc': last_created_utc,
+                'last_post_ids': json.loads(last_post_ids) if last_post_ids else []
+            }
+            for source, last_created_utc, last_post_ids in cursor.fetchall()
+        }
+
+        conn.close()
+        return checkpoints
+
+    def save_checkpoints(self, checkpoints):
+        """Advance checkpoints to the newest posts seen in this scrape."""
+        rows = []
+        for subreddit, seen in self.latest_seen.items():
+            previous = checkpoints.get(subreddit, {})
+            newest = sorted(
+                seen + [(previous.get('last_created_utc') or 0, post_id)
+                        for post_id in previous.get('last_post_ids', [])],
+                reverse=True
+            )[:CHECKPOINT_IDS]
+            rows.append((f"reddit:{subreddit}", newest[0][0], json.dumps([post_id for _, post_id in newest])))
+
+        if not rows:
+            return 0
 
-    def analyze_and_save_trends(self):
-        """Analyze the posts to extract trend data and save to database."""
+        with self.db_manager.connection() as conn:
+            conn.executemany("""
+            INSERT INTO scrape_checkpoints (source, last_created_utc, last_post_ids, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(source) DO UPDATE SET last_created_utc = excluded.last_created_utc,
+                last_post_ids = excluded.last_post_ids, updated_at = excluded.updated_at
+            """, rows)
+
+        self.latest_seen = {}
+        return len(rows)
+
+    def analyze_and_save_trends(self, half_life_days=None):
+        """Score Reddit trends per day from post_terms and save them to trend_history.
+
+        Each post contributes 1 + log(1 + likes + comments) to every term it
+        mentions, on the day it was created, scaled by the term type's weight.
+        Near-duplicate reposts are skipped.
+        With `half_life_days`, each day's score is also discounted by its age.
+        Re-running replaces the stored scores for the same trend and day.
+        """
         conn = self.db_manager.create_connection()
 
-        # Get the posts
-        posts_df = pd.read_sql_query("SELECT * FROM social_posts WHERE platform = 'Reddit'", conn)
+        # Posts saved before post_terms existed get their terms extracted once here
+        self.term_store.backfill(conn, platform='Reddit')
 
-        if posts_df.empty:
+        mentions = pd.read_sql_query("""
+        SELECT t.term, t.term_type, DATE(sp.created_at) AS day, sp.likes, sp.comments
+        FROM post_terms pt
+        JOIN terms t ON t.term_id = pt.term_id
+        JOIN social_posts sp ON sp.post_id = pt.post_id
+        WHERE sp.platform = 'Reddit' AND sp.created_at IS NOT NULL AND sp.duplicate_of IS NULL
+        """, conn)
+
+        if mentions.empty:
             print("No Reddit posts found for trend analysis.")
             conn.close()
             return 0
 
-        # Prepare trend data
-        trend_data = []
-        today = datetime.now().strftime('%Y-%m-%d')
-
-        # Process hashtags
-        if 'hashtags' in posts_df.columns and not posts_df['hashtags'].isna().all():
-            all_hashtags = []
-            for hashtags_str in posts_df['hashtags'].dropna():
-                hashtags = [h.strip() for h in hashtags_str.split(',') if h.strip()]
-                all_hashtags.extend(hashtags)
-
-            for hashtag in set(all_hashtags):
-                count = all_hashtags.count(hashtag)
-                score = count * 1.5  # Simple scoring based on occurrence
-                trend_data.append(('hashtag:' + hashtag, score, 'Reddit', today))
-
-        # Process keywords
-        if 'keywords' in posts_df.columns and not posts_df['keywords'].isna().all():
-            all_keywords = []
-            for keywords_str in posts_df['keywords'].dropna():
-                keywords = [k.strip() for k in keywords_str.split(',') if k.strip()]
-                all_keywords.extend(keywords)
-
-            for keyword in set(all_keywords):
-                count = all_keywords.count(keyword)
-                score = count * 1.2  # Simple scoring based on occurrence
-                trend_data.append((keyword, score, 'Reddit', today))
-
-        # Process brands
-        if 'brands' in posts_df.columns and not posts_df['brands'].isna().all():
-            all_brands = []
-            for brands_str in posts_df['brands'].dropna():
-                brands = [b.strip() for b in brands_str.split(',') if b.strip()]
-                all_brands.extend(brands)
-
-            for brand in set(all_brands):
-                count = all_brands.count(brand)
-                score = count * 1.0  # Simple scoring based on occurrence
-                trend_data.append(('brand:' + brand, score, 'Reddit', today))
-
-        # Save trend data
+        engagement = mentions['likes'].fillna(0).clip(lower=0) + mentions['comments'].fillna(0).clip(lower=0)
+        mentions['weight'] = (1 + np.log1p(engagement)) * mentions['term_type'].map(TERM_TYPE_WEIGHTS)
+
+        trends = mentions.groupby(['term', 'term_type', 'day'], as_index=False)['weight'].sum()
+
+        if half_life_days:
+            age_days = (pd.Timestamp(datetime.now().date()) - pd.to_datetime(trends['day'])).dt.days.clip(lower=0)
+            trends['weight'] *= 0.5 ** (age_days / half_life_days)
+
+        # Trend names keep the existing prefixes: hashtag:<tag>, brand:<brand>, plain keywords
+        trends['trend_name'] = np.select(
+            [trends['term_type'] == 'hashtag', trends['term_type'] == 'brand'],
+            ['hashtag:' + trends['term'].str.lstrip('#'), 'brand:' + trends['term']],
+            trends['term']
+        )
+
         cursor = conn.cursor()
-        for trend_name, score, platform, date in trend_data:
-            try:
-                cursor.execute("""
-                INSERT INTO trend_history (trend_name, score, platform, date_recorded)
-                VALUES (?, ?, ?, ?)
-                """, (trend_name, score, platform, date))
-            except Exception as e:
-                print(f"Error saving trend {trend_name}: {e}")
+        cursor.executemany("""
+        INSERT INTO trend_history (trend_name, score, platform, date_recorded)
+        VALUES (?, ?, 'Reddit', ?)
+        ON CONFLICT(trend_name, platform, date_recorded) DO UPDATE SET score = excluded.score
+        """, zip(trends['trend_name'].tolist(), trends['weight'].round(4).tolist(), trends['day'].tolist()))
 
         conn.commit()
         conn.close()
 
-        return len(trend_data)
+        return len(trends)
+
+    def run_full_scrape(self, max_workers=8, incremental=False):
+        """Run the full scraping process for all subreddits.
 
-    def run_full_scrape(self):
-        """Run the full scraping process for all subreddits."""
+        In incremental mode only posts newer than each subreddit's checkpoint
+        are fetched (from the new listing), and checkpoints advance only once
+        the posts are saved, so a failed save is fetched again next run.
+        """
         all_posts = []
 
-        for subreddit in self.fashion_subreddits:
-            posts = self.scrape_subreddit(subreddit)
+        checkpoints = self.load_checkpoints() if incremental else None
+        results = self.scrape_subreddits(self.fashion_subreddits, max_workers=max_workers,
+                                         checkpoints=checkpoints)
+        for subreddit, posts in results.items():
             all_posts.extend(posts)
             print(f"Scraped {len(posts)} posts/comments from r/{subreddit}")
-            time.sleep(2)  # Be nice to Reddit's servers
 
-        total_saved = self.save_to_database(all_posts)
+        try:
+            total_saved = self.save_to_database(all_posts)
+        except Exception:
+            # The checkpoints stay where they were, so the next run fetches these posts again
+            self.latest_seen = {}
+            return 0, 0
         print(f"Saved {total_saved} posts/comments to database")
 
+        if incremental:
+            self.save_checkpoints(checkpoints)
+
         trends_saved = self.analyze_and_save_trends()
         print(f"Extracted and saved {trends_saved} trends")
 
         return total_saved, trends_saved
 
+    def run_frontier_scrape(self, workers=4, batch_size=500):
+        """Scrape all subreddits as jobs on the crawl frontier, saving in batches as they finish.
+
+        A new round of subreddit jobs is queued only once the previous round
+        has drained, so a run that crashed resumes with the subreddits it had
+        not finished.
+        """
+        frontier = CrawlFrontier(self.db_manager.db_path)
+        frontier.release_dead_leases()
+        unfinished = frontier.connection().execute("""
+        SELECT COUNT(*) FROM crawl_jobs WHERE source = 'subreddit' AND state IN ('pending', 'leased')
+        """).fetchone()[0]
+        if not unfinished:
+            frontier.enqueue('subreddit', self.fashion_subreddits, requeue=True)
+
+        handlers, sinks = scraper_handlers(reddit_scraper=self)
+        counts = CrawlScheduler(frontier, handlers, sinks, workers=workers, batch_size=batch_size).run()
+        frontier.close()
+        print(f"Scraped {counts['jobs_done']} subreddits, {counts['results_saved']} posts/comments "
+              f"in {counts['batches']} batches")
+
+        trends_saved = self.analyze_and_save_trends()
+        print(f"Extracted and saved {trends_saved} trends")
+
+        return counts['results_saved'], trends_saved
+
 
 if __name__ == "__main__":
     # Set up your Reddit API credentials
@@ -344,7 +596,7 @@ if __name__ == "__main__":
     # Only proceed if you want to after the test
     proceed = input("Continue with full scrape? (y/n): ")
     if proceed.lower() == 'y':
-        posts_saved, trends_saved = scraper.run_full_scrape()
+        posts_saved, trends_saved = scraper.run_full_scrape(incremental=True)
         print(f"\nComplete! Saved {posts_saved} posts and {trends_saved} trends.")
     else:
         print("Scrape cancelled.")
\ No newline at end of file
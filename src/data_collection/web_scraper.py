@@ -1,21 +1,41 @@
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import random
 import json
 from datetime import datetime
-import re
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from src.data_collection.http_client import get_default_client
+from src.data_collection.http_cache import content_hash
+from src.data_collection.product_parser import ProductParser, clean_price
+from src.data_collection.product_writer import ProductWriter
 
 
 class FashionScraper:
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, http_client=None, http_cache=None, product_parser=None):
         self.db_manager = db_manager
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.base_delay = 3  # Base delay between requests in seconds
 
+        # Pooled keep-alive sessions, shared with the other scrapers by default
+        self.http = http_client or get_default_client()
+
+        # Optional HttpCache; when set, product pages are revalidated instead of re-downloaded
+        self.http_cache = http_cache
+
+        # Per-site extraction specs, run on a stripped-down lxml tree
+        self.product_parser = product_parser or ProductParser()
+
+        # Batched writes with warm brand/category ID caches
+        self.writer = ProductWriter(db_manager) if db_manager is not None else None
+
     def random_delay(self):
         """Add random delay between requests to avoid being blocked."""
         time.sleep(self.base_delay + random.uniform(1, 3))
@@ -24,20 +44,34 @@ class FashionScraper:
         """Extract numerical price from price text."""
         if not price_text:
             return None
-
-        # Remove currency symbols and extract numbers
-        price_match = re.search(r'(\d+(?:\.\d{2})?)', price_text.replace(',', ''))
-        if price_match:
-            return float(price_match.group(1))
-        return None
+        return clean_price(price_text)
 
     def scrape_product_details(self, url):
         """Scrape product details from a given URL."""
+        cached = self.http_cache.lookup(url) if self.http_cache else None
+        headers = dict(self.headers)
+        if cached:
+            headers.update(self.http_cache.conditional_headers(cached))
+
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.http.get(url, headers=headers)
+
+            if response.status_code == 304 and cached:
+                self.http_cache.revalidated(url)
+                return self.cached_product(cached)
+
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                return self.parse_product_page(soup, url)
+                body = response.content
+
+                # Servers without validators still send the same bytes when nothing changed
+                if cached and cached['content_hash'] == content_hash(body):
+                    self.http_cache.revalidated(url, response, unchanged=True)
+                    return self.cached_product(cached)
+
+                product_data = self.parse_product_content(body, url)
+                if self.http_cache:
+                    self.http_cache.store(url, response, body, product_data, existed=cached is not None)
+                return product_data
             else:
                 print(f"Failed to retrieve {url}. Status code: {response.status_code}")
                 return None
@@ -45,95 +79,36 @@ class FashionScraper:
             print(f"Error scraping {url}: {e}")
             return None
 
-    def parse_product_page(self, soup, url):
-        """Parse product information from the page. This should be customized for each website."""
-        # This is a generic parser - you'll need to customize it for specific websites
-        product_data = {
-            'url': url,
-            'name': None,
-            'price': None,
-            'sale_price': None,
-            'description': None,
-            'category': None,
-            'brand': None,
-            'material': None,
-            'gender': None,
-            'scrape_date': datetime.now().strftime('%Y-%m-%d')
-        }
-
-        # Example selectors - these need to be customized for each website
-        # product_data['name'] = soup.select_one('.product-name')
-        # product_data['price'] = soup.select_one('.product-price')
-        # etc.
-
+    def cached_product(self, cached):
+        """The cached parse of an unchanged page, stamped with today's date."""
+        if cached['parsed'] is None:
+            return None
+        product_data = dict(cached['parsed'])
+        product_data['scrape_date'] = datetime.now().strftime('%Y-%m-%d')
         return product_data
 
-    def save_to_database(self, product_data):
-        """Save scraped product data to the database."""
-        try:
-            engine = self.db_manager.create_sqlalchemy_engine()
-
-            with engine.connect() as conn:
-                from sqlalchemy import text
-
-                # First, insert brand if it doesn't exist
-                brand_insert = text("""
-                INSERT OR IGNORE INTO brands (brand_name) VALUES (:brand_name)
-                """)
-                conn.execute(brand_insert, {'brand_name': product_data['brand']})
-
-                # Get brand_id
-                brand_id_query = text("SELECT brand_id FROM brands WHERE brand_name = :brand_name")
-                result = conn.execute(brand_id_query, {'brand_name': product_data['brand']})
-                brand_id = result.fetchone()[0]
-
-                # Similar logic for category
-                category_insert = text("""
-                INSERT OR IGNORE INTO categories (category_name) VALUES (:category_name)
-                """)
-                conn.execute(category_insert, {'category_name': product_data['category']})
-
-                category_id_query = text("SELECT category_id FROM categories WHERE category_name = :category_name")
-                result = conn.execute(category_id_query, {'category_name': product_data['category']})
-                category_id = result.fetchone()[0]
+    def parse_product_content(self, content, url):
+        """Parse raw page content using the site's extraction spec."""
+        return self.product_parser.parse(content, url)
 
-                # Insert product
-                product_insert = text("""
-                INSERT INTO products (product_name, brand_id, category_id, description, material, gender)
-                VALUES (:product_name, :brand_id, :category_id, :description, :material, :gender)
-                """)
-                result = conn.execute(product_insert, {
-                    'product_name': product_data['name'],
-                    'brand_id': brand_id,
-                    'category_id': category_id,
-                    'description': product_data['description'],
-                    'material': product_data['material'],
-                    'gender': product_data['gender']
-                })
-
-                # Get the last inserted product_id
-                product_id_query = text("SELECT last_insert_rowid()")
-                product_id = conn.execute(product_id_query).fetchone()[0]
+    def parse_product_page(self, soup, url):
+        """Parse product information from an already-built soup.
 
-                # Insert price history
-                price_insert = text("""
-                INSERT INTO price_history (product_id, price, sale_price, date_recorded)
-                VALUES (:product_id, :price, :sale_price, :date_recorded)
-                """)
-                conn.execute(price_insert, {
-                    'product_id': product_id,
-                    'price': product_data['price'],
-                    'sale_price': product_data['sale_price'],
-                    'date_recorded': product_data['scrape_date']
-                })
+        Site-specific selectors live in product_parser.SITE_SPECS rather than here.
+        """
+        return self.product_parser.extract(soup, url)
 
-                # Commit the transaction
-                conn.commit()
+    def save_to_database(self, product_data):
+        """Save scraped product data to the database."""
+        return self.save_products([product_data]) > 0
 
-            return True
+    def save_products(self, products):
+        """Save a batch of scraped products in one transaction. Returns the number saved."""
+        try:
+            return self.writer.write(products)
         except Exception as e:
             print(f"Error saving to database: {e}")
-            return False
+            return 0
 
     def scrape_sample_data(self):
         """Create sample data to test the scraper with current fashion trends."""
@@ -229,23 +204,16 @@ class FashionScraper:
             }
         ]
 
-        for product in sample_products:
-            success = self.save_to_database(product)
-            if success:
+        saved = self.save_products(sample_products)
+        if saved:
+            for product in sample_products:
                 print(f"Successfully saved: {product['name']}")
-            else:
-                print(f"Failed to save: {product['name']}")
+        else:
+            print(f"Failed to save {len(sample_products)} sample products")
 
 
 # For testing
 if __name__ == "__main__":
-    import sys
-    import os
-
-    # Add the project root directory to the path
-    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    sys.path.append(project_root)
-
     from src.database.database_setup import DatabaseManager
 
     db = DatabaseManager()
@@ -0,0 +1,207 @@
+# src/database/analytics_backend.py
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+# Tables copied into the DuckDB snapshot; the rest (queues, caches, indexes of captions) stay in SQLite
+ANALYTICS_TABLES = [
+    'brands', 'categories', 'products', 'price_history', 'popularity_metrics',
+    'social_posts', 'trend_history', 'influencer_mentions', 'terms', 'post_terms'
+]
+
+# SQLite declared types by affinity, as DuckDB column types
+DUCKDB_TYPES = [('INT', 'BIGINT'), ('CHAR', 'VARCHAR'), ('CLOB', 'VARCHAR'), ('TEXT', 'VARCHAR'),
+                ('REAL', 'DOUBLE'), ('FLOA', 'DOUBLE'), ('DOUB', 'DOUBLE'), ('DEC', 'DOUBLE'), ('NUM', 'DOUBLE')]
+
+INTEGER_TYPES = {'TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT',
+                 'UTINYINT', 'USMALLINT', 'UINTEGER', 'UBIGINT', 'UHUGEINT'}
+
+SNAPSHOT_CHUNK_SIZE = 200000
+
+# Seconds a changed database may go without its snapshot being rebuilt
+DEFAULT_MAX_STALENESS = 300
+
+
+def duckdb_type(declared_type):
+    """DuckDB type for a SQLite column, following SQLite's type affinity rules (TIMESTAMP/DATE stay text)."""
+    declared_type = (declared_type or '').upper()
+    for fragment, column_type in DUCKDB_TYPES:
+        if fragment in declared_type:
+            return column_type
+    return 'VARCHAR'
+
+
+class SQLiteBackend:
+    """Analytical queries run on the database itself, through the manager's pooled connections."""
+
+    name = 'sqlite'
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    def read_frame(self, query, params=None):
+        conn = self.db_manager.create_connection()
+        try:
+            return pd.read_sql_query(query, conn, params=params)
+        finally:
+            conn.close()
+
+    def close(self):
+        pass
+
+
+class DuckDBBackend:
+    """Analytical queries run by DuckDB on a columnar snapshot of the SQLite database.
+
+    The snapshot (`<db>.duckdb` next to the database) holds copies of
+    ANALYTICS_TABLES. It is rebuilt, streaming each table in chunks, when the
+    SQLite file has changed and the snapshot is older than `max_staleness`
+    seconds (0: always current), or on refresh(). Queries must be written in
+    SQL both engines accept; results come back with the dtypes pandas gives
+    for the same query on SQLite.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, db_path, snapshot_path=None, threads=None, max_staleness=DEFAULT_MAX_STALENESS):
+        if duckdb is None:
+            raise ImportError("The DuckDB backend needs the duckdb package (pip install duckdb)")
+        self.db_path = db_path
+        self.snapshot_path = snapshot_path or os.path.splitext(db_path)[0] + '.duckdb'
+        self.threads = threads
+        self.max_staleness = max_staleness
+        self.conn = None
+        self.fingerprint = None
+        self.checked_at = 0
+        self.lock = threading.Lock()
+        # Held while checking and rebuilding the snapshot, so concurrent readers build it once
+        self.refresh_lock = threading.RLock()
+
+    def source_fingerprint(self):
+        # With WAL, committed changes may only be in the -wal file until a checkpoint
+        parts = []
+        for path in (self.db_path, self.db_path + '-wal'):
+            if os.path.exists(path):
+                stat = os.stat(path)
+                parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+        return '|'.join(parts)
+
+    def snapshot_fingerprint(self):
+        if not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            conn = duckdb.connect(self.snapshot_path, read_only=True)
+            try:
+                return conn.execute("SELECT fingerprint FROM snapshot_info").fetchone()[0]
+            finally:
+                conn.close()
+        except duckdb.Error:
+            return None
+
+    def refresh(self):
+        """Rebuild the snapshot from the SQLite database now. Returns seconds taken."""
+        with self.refresh_lock:
+            return self._rebuild()
+
+    def _rebuild(self):
+        started = time.perf_counter()
+        fingerprint = self.source_fingerprint()
+        # Unique per process and thread, so concurrent builds never write the same file
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        source = sqlite3.connect(self.db_path, timeout=30)
+        target = duckdb.connect(tmp_path)
+        try:
+            existing = {row[0] for row in source.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for table in ANALYTICS_TABLES:
+                if table not in existing:
+                    continue
+                columns = [(name, duckdb_type(declared)) for _, name, declared, _, _, _
+                           in source.execute(f"PRAGMA table_info({table})")]
+                definitions = ', '.join(f'"{name}" {kind}' for name, kind in columns)
+                target.execute(f"CREATE TABLE {table} ({definitions})")
+
+                names = ', '.join(f'"{name}"' for name, _ in columns)
+                casts = ', '.join(f'CAST("{name}" AS {kind})' for name, kind in columns)
+                for chunk in pd.read_sql_query(f"SELECT {names} FROM {table}", source,
+                                               chunksize=SNAPSHOT_CHUNK_SIZE):
+                    target.register('chunk', chunk)
+                    target.execute(f"INSERT INTO {table} SELECT {casts} FROM chunk")
+                    target.unregister('chunk')
+
+            target.execute("CREATE TABLE snapshot_info (fingerprint VARCHAR, created_at TIMESTAMP)")
+            target.execute("INSERT INTO snapshot_info VALUES (?, current_timestamp)", [fingerprint])
+        finally:
+            target.close()
+            source.close()
+
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+            os.replace(tmp_path, self.snapshot_path)
+            self.fingerprint = fingerprint
+        elapsed = time.perf_counter() - started
+        print(f"Built DuckDB snapshot {self.snapshot_path} in {elapsed:.1f}s")
+        return elapsed
+
+    def connection(self):
+        """Read-only DuckDB connection to a snapshot no staler than max_staleness."""
+        if self.conn is None or time.time() - self.checked_at >= self.max_staleness:
+            with self.refresh_lock:
+                # Checked again with the lock held: another reader may have just rebuilt the snapshot
+                if self.fingerprint is None:
+                    self.fingerprint = self.snapshot_fingerprint()
+                if self.fingerprint != self.source_fingerprint():
+                    self._rebuild()
+                self.checked_at = time.time()
+
+        with self.lock:
+            if self.conn is None:
+                self.conn = duckdb.connect(self.snapshot_path, read_only=True)
+                if self.threads:
+                    self.conn.execute(f"SET threads = {int(self.threads)}")
+            # DuckDB connections are not shared between threads; each gets a cursor of its own
+            return self.conn.cursor()
+
+    def read_frame(self, query, params=None):
+        cursor = self.connection()
+        try:
+            result = cursor.execute(query, params or [])
+            types = [str(column[1]) for column in result.description]
+            df = result.df()
+        finally:
+            cursor.close()
+
+        # Match pandas on SQLite: integers are int64, or float64 when there are NULLs
+        for column, column_type in zip(df.columns, types):
+            if column_type in INTEGER_TYPES:
+                df[column] = df[column].astype('float64' if df[column].isna().any() else 'int64')
+        return df
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+def available_backends():
+    """Names of the analytical backends that can be used here."""
+    return ['sqlite'] + (['duckdb'] if duckdb is not None else [])
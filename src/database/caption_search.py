@@ -0,0 +1,199 @@
+# src/database/caption_search.py
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+# Triggers that keep caption_fts in step with social_posts (migration 010)
+CAPTION_TRIGGER_PREFIX = 'social_posts_fts_'
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def match_expression(text, any_word=False):
+    """FTS5 query for plain text: every word must appear (or any of them), in any order.
+
+    Words are quoted, so punctuation and FTS5 operators in user input are
+    matched literally; a trailing * on a word keeps prefix matching
+    ("vint*" finds vintage).
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        for token in WORD_PATTERN.findall(word):
+            terms.append(f'"{token}"')
+        if prefix and terms:
+            terms[-1] += '*'
+    if not terms:
+        raise ValueError(f"No searchable words in {text!r}")
+    return (' OR ' if any_word else ' AND ').join(terms)
+
+
+class CaptionSearch:
+    """Keyword search over post captions using the caption_fts FTS5 index.
+
+    Queries are plain text (see match_expression) unless `raw=True`, in which
+    case the full FTS5 syntax is available ("baggy jeans" phrases, NEAR,
+    NOT). Near-duplicate posts are left out unless asked for.
+    """
+
+    def filters(self, query, start_date=None, end_date=None, platform=None, include_duplicates=False, raw=False):
+        """WHERE clause and parameters shared by the queries below; dates are inclusive 'YYYY-MM-DD'."""
+        conditions = ["caption_fts MATCH ?"]
+        params = [query if raw else match_expression(query)]
+        if start_date is not None:
+            conditions.append("sp.created_at >= ?")
+            params.append(str(start_date))
+        if end_date is not None:
+            # created_at holds full timestamps; compare with the start of the next day
+            conditions.append("sp.created_at < DATE(?, '+1 day')")
+            params.append(str(end_date))
+        if platform is not None:
+            conditions.append("sp.platform = ?")
+            params.append(platform)
+        if not include_duplicates:
+            conditions.append("sp.duplicate_of IS NULL")
+        return " AND ".join(conditions), params
+
+    def search(self, conn, query, start_date=None, end_date=None, platform=None, limit=100,
+               include_duplicates=False, raw=False):
+        """Posts whose caption matches, best matches (BM25) first, as a DataFrame."""
+        where, params = self.filters(query, start_date, end_date, platform, include_duplicates, raw)
+        sql = f"""
+        SELECT sp.post_id, sp.platform, sp.post_url, sp.username, sp.caption,
+               sp.likes, sp.comments, sp.shares, sp.created_at
+        FROM caption_fts
+        JOIN social_posts sp ON sp.post_id = caption_fts.rowid
+        WHERE {where}
+        ORDER BY caption_fts.rank
+        """
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return pd.read_sql_query(sql, conn, params=params)
+
+    def engagement(self, conn, query, start_date=None, end_date=None, platform=None, by='day',
+                   include_duplicates=False, raw=False):
+        """Matching posts and their likes, comments and shares per day (or 'platform', or None for totals)."""
+        groups = {'day': "DATE(sp.created_at)", 'platform': "sp.platform", None: None}
+        if by not in groups:
+            raise ValueError(f"Can't group engagement by {by!r}; use 'day', 'platform' or None")
+
+        where, params = self.filters(query, start_date, end_date, platform, include_duplicates, raw)
+        select = f"{groups[by]} AS {by}, " if by else ""
+        sql = f"""
+        SELECT {select}COUNT(*) AS posts,
+               COALESCE(SUM(sp.likes), 0) AS likes,
+               COALESCE(SUM(sp.comments), 0) AS comments,
+               COALESCE(SUM(sp.shares), 0) AS shares
+        FROM caption_fts
+        JOIN social_posts sp ON sp.post_id = caption_fts.rowid
+        WHERE {where}
+        """
+        if by:
+            sql += f" GROUP BY {by} ORDER BY {by}"
+        return pd.read_sql_query(sql, conn, params=params)
+
+    def term_frequencies(self, conn, limit=50, min_posts=1, prefix=None):
+        """Most common caption words from the index vocabulary: term, posts, mentions.
+
+        Counts cover every indexed caption, near-duplicates included.
+        """
+        sql = "SELECT term, doc AS posts, cnt AS mentions FROM caption_vocab WHERE doc >= ?"
+        params = [min_posts]
+        if prefix is not None:
+            # Terms are stored lowercased; a range scan avoids LIKE's escaping rules
+            sql += " AND term >= ? AND term < ?"
+            params += [prefix.lower(), prefix.lower() + '\U0010ffff']
+        sql += " ORDER BY doc DESC, term"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return pd.read_sql_query(sql, conn, params=params)
+
+    def suspend_triggers(self, conn):
+        """Drop the sync triggers (e.g. for a bulk load) and return their SQL for resume_triggers()."""
+        triggers = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'social_posts' "
+            "AND name LIKE ? ORDER BY name", (CAPTION_TRIGGER_PREFIX + '%',)
+        ).fetchall()
+        for name, _ in triggers:
+            conn.execute(f"DROP TRIGGER {name}")
+        return [sql for _, sql in triggers]
+
+    def resume_triggers(self, conn, trigger_sql, first_post_id=None):
+        """Recreate suspended triggers after indexing the posts from first_post_id on.
+
+        Only inserts may happen while the triggers are suspended, and only of
+        posts with IDs from first_post_id; anything else needs rebuild().
+        """
+        if first_post_id is not None:
+            conn.execute("INSERT INTO caption_fts (rowid, caption) "
+                         "SELECT post_id, caption FROM social_posts WHERE post_id >= ?", (first_post_id,))
+        for sql in trigger_sql:
+            conn.execute(sql)
+
+    def rebuild(self, conn):
+        """Re-index every caption from social_posts."""
+        conn.execute("INSERT INTO caption_fts (caption_fts) VALUES ('rebuild')")
+        conn.commit()
+
+    def optimize(self, conn):
+        """Merge the index's segments, which speeds up queries after many small inserts."""
+        conn.execute("INSERT INTO caption_fts (caption_fts) VALUES ('optimize')")
+        conn.commit()
+
+    def check(self, conn):
+        """True if the index matches the captions in social_posts."""
+        try:
+            conn.execute("INSERT INTO caption_fts (caption_fts, rank) VALUES ('integrity-check', 1)")
+            return True
+        except sqlite3.DatabaseError as e:
+            print(f"Caption index check failed: {e}")
+            return False
+
+
+if __name__ == "__main__":
+    from src.database.database_setup import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Search post captions, or list the most common caption words.")
+    parser.add_argument('query', nargs='?', help="words that must all appear in the caption (append * for a prefix)")
+    parser.add_argument('--from', dest='start_date', default=None, help="first day, YYYY-MM-DD")
+    parser.add_argument('--to', dest='end_date', default=None, help="last day, YYYY-MM-DD")
+    parser.add_argument('--platform', default=None, help="only posts from this platform")
+    parser.add_argument('--raw', action='store_true', help="treat the query as FTS5 syntax")
+    parser.add_argument('--limit', type=int, default=10, help="posts (or terms) to list")
+    parser.add_argument('--terms', action='store_true', help="list the most common caption words instead")
+    parser.add_argument('--rebuild', action='store_true', help="re-index every caption first")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    conn = sqlite3.connect(db.db_path)
+    search = CaptionSearch()
+
+    if args.rebuild:
+        search.rebuild(conn)
+        print("Caption index rebuilt")
+
+    if args.terms:
+        print(search.term_frequencies(conn, limit=args.limit).to_string(index=False))
+    elif args.query:
+        filters = dict(start_date=args.start_date, end_date=args.end_date, platform=args.platform, raw=args.raw)
+        totals = search.engagement(conn, args.query, by=None, **filters).iloc[0]
+        print(f"{totals['posts']} posts mention '{args.query}': {totals['likes']} likes, "
+              f"{totals['comments']} comments, {totals['shares']} shares")
+        print(search.engagement(conn, args.query, **filters).to_string(index=False))
+        print()
+        print(search.search(conn, args.query, limit=args.limit, **filters)[
+            ['created_at', 'platform', 'likes', 'caption']].to_string(index=False))
+    elif not args.rebuild:
+        parser.print_help()
+    conn.close()
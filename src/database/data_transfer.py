@@ -0,0 +1,396 @@
+# src/database/data_transfer.py
+
+import argparse
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from src.database.caption_search import CaptionSearch
+from src.database.migrations import latest_version
+from src.database.table_stats import TableStats
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_FORMAT = 1
+
+# Bookkeeping tables recreated by the target's own migrations, never exported
+SKIPPED_TABLES = {'schema_version', 'table_stats', 'sqlite_sequence', 'sqlite_stat1', 'sqlite_stat4'}
+
+DEFAULT_CHUNK_ROWS = 100000
+ROWS_PER_TRANSACTION = 500000
+ZSTD_LEVEL = 3
+
+# Durability is relaxed during an import: a crash mid-import means importing again.
+# Temporary storage stays on disk, so rebuilding the indexes of a huge table sorts
+# within the page cache and spills the rest instead of growing memory.
+IMPORT_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=FILE",
+    "PRAGMA cache_size=-262144"  # 256 MB
+]
+
+# Values are written as CSV text. NULL is \N, a BLOB is \x followed by its hex digits, and a
+# string that starts with a backslash gets a second one, so the three can't be confused.
+NULL_MARKER = '\\N'
+BLOB_PREFIX = '\\x'
+
+
+def encode_value(value):
+    if value is None:
+        return NULL_MARKER
+    if isinstance(value, str):
+        return '\\' + value if value.startswith('\\') else value
+    if isinstance(value, bytes):
+        return BLOB_PREFIX + value.hex()
+    # repr of a float is the shortest string that reads back as the same float
+    return repr(value)
+
+
+def decode_value(field):
+    if not field.startswith('\\'):
+        return field
+    if field == NULL_MARKER:
+        return None
+    if field.startswith(BLOB_PREFIX):
+        return bytes.fromhex(field[2:])
+    return field[1:]
+
+
+def default_compression():
+    """zstd when the zstandard package is installed, else gzip."""
+    return 'zstd' if zstandard is not None else 'gzip'
+
+
+def compress(data, compression):
+    if compression == 'zstd':
+        # Compressor objects aren't thread-safe, so each call gets its own
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def open_decompressed(f, compression):
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("This export is zstd-compressed; install the zstandard package to import it")
+        return zstandard.ZstdDecompressor().stream_reader(f)
+    return gzip.GzipFile(fileobj=f)
+
+
+def exportable_tables(conn):
+    """Ordinary tables of a database, leaving out FTS shadow tables, virtual tables and bookkeeping."""
+    kinds = {name: kind for _, name, kind, _, _, _ in conn.execute("PRAGMA main.table_list")}
+    # In creation order, so referenced tables come before the tables pointing at them
+    return [name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY rowid")
+            if kinds.get(name) == 'table' and name not in SKIPPED_TABLES and not name.startswith('sqlite_')]
+
+
+def read_only_uri(db_path):
+    # Read-only, so exporting never takes a write lock or creates an empty database by mistake
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"No database at {db_path}")
+    return Path(db_path).resolve().as_uri() + '?mode=ro'
+
+
+def quoted(names):
+    return ', '.join(f'"{name}"' for name in names)
+
+
+def table_columns(conn, table):
+    return [(name, declared) for _, name, declared, _, _, _ in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def write_chunk(path, rows, compression):
+    """Compress one chunk's CSV text and write it; runs in the export's worker threads."""
+    data = compress(rows.encode('utf-8'), compression)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data), hashlib.sha256(data).hexdigest()
+
+
+def chunk_csv(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+    writer.writerows([encode_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def export_database(db_path, out_dir, tables=None, chunk_rows=DEFAULT_CHUNK_ROWS, workers=None, compression=None):
+    """Stream tables of a database into compressed CSV chunks in out_dir, with a manifest.
+
+    Each table goes to `<table>/part-NNNNN.csv.zst` (or .csv.gz), chunk_rows
+    rows per file. Rows are read and formatted here while a pool of `workers`
+    threads compresses and writes finished chunks; at most two chunks per
+    worker are in flight, so memory use doesn't grow with table size. The
+    manifest is written last, so a directory without one is an incomplete export.
+
+    Returns the manifest.
+    """
+    compression = compression or default_compression()
+    if compression == 'zstd' and zstandard is None:
+        raise ImportError("zstd compression needs the zstandard package (pip install zstandard)")
+    workers = workers or os.cpu_count() or 1
+    extension = '.csv.zst' if compression == 'zstd' else '.csv.gz'
+
+    if os.path.exists(os.path.join(out_dir, MANIFEST_NAME)):
+        raise FileExistsError(f"{out_dir} already holds an export")
+    os.makedirs(out_dir, exist_ok=True)
+
+    conn = sqlite3.connect(read_only_uri(db_path), uri=True)
+    started = time.perf_counter()
+    manifest = {
+        'format': MANIFEST_FORMAT,
+        'source': os.path.abspath(db_path),
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'schema_version': conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0],
+        'sqlite_version': sqlite3.sqlite_version,
+        'compression': compression,
+        'tables': {}
+    }
+
+    try:
+        available = exportable_tables(conn)
+        if tables is None:
+            tables = available
+        missing = [table for table in tables if table not in available]
+        if missing:
+            raise ValueError(f"No such table to export: {', '.join(missing)}")
+
+        # One read transaction, so every table comes from the same moment even while writers carry on
+        conn.execute("BEGIN")
+        # AUTOINCREMENT counters can be ahead of the highest ID (archived or deleted rows); IDs are never reused
+        try:
+            sequences = dict(conn.execute("SELECT name, seq FROM sqlite_sequence"))
+        except sqlite3.OperationalError:
+            sequences = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for table in tables:
+                columns = table_columns(conn, table)
+                names = [name for name, _ in columns]
+                table_dir = os.path.join(out_dir, table)
+                os.makedirs(table_dir, exist_ok=True)
+
+                chunks = []
+                pending = deque()
+                cursor = conn.execute(f"SELECT {quoted(names)} FROM {table}")
+                while True:
+                    rows = cursor.fetchmany(chunk_rows)
+                    if not rows:
+                        break
+                    file_name = f"{table}/part-{len(chunks):05d}{extension}"
+                    chunks.append({'file': file_name, 'rows': len(rows)})
+                    pending.append((chunks[-1], pool.submit(write_chunk, os.path.join(out_dir, file_name),
+                                                            chunk_csv(names, rows), compression)))
+                    while len(pending) >= 2 * workers:
+                        chunk, future = pending.popleft()
+                        chunk['bytes'], chunk['sha256'] = future.result()
+                while pending:
+                    chunk, future = pending.popleft()
+                    chunk['bytes'], chunk['sha256'] = future.result()
+
+                manifest['tables'][table] = {
+                    'columns': [{'name': name, 'type': declared} for name, declared in columns],
+                    'rows': sum(chunk['rows'] for chunk in chunks),
+                    'sequence': sequences.get(table),
+                    'chunks': chunks
+                }
+                print(f"Exported {manifest['tables'][table]['rows']:,} rows from {table} "
+                      f"in {len(chunks)} chunks ({sum(chunk['bytes'] for chunk in chunks) / 1e6:.1f} MB)")
+        conn.rollback()
+    finally:
+        conn.close()
+
+    tmp_path = os.path.join(out_dir, MANIFEST_NAME + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(out_dir, MANIFEST_NAME))
+    print(f"Export finished in {time.perf_counter() - started:.1f}s")
+    return manifest
+
+
+def read_manifest(in_dir):
+    path = os.path.join(in_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No {MANIFEST_NAME} in {in_dir}; is it a finished export?")
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != MANIFEST_FORMAT:
+        raise ValueError(f"Unsupported export format {manifest.get('format')}")
+    return manifest
+
+
+def read_chunk(in_dir, chunk, compression):
+    """Rows of one chunk file, decoded, after checking its checksum."""
+    with open(os.path.join(in_dir, chunk['file']), 'rb') as f:
+        data = f.read()
+    if hashlib.sha256(data).hexdigest() != chunk['sha256']:
+        raise ValueError(f"{chunk['file']} is corrupt (checksum mismatch)")
+
+    text = io.TextIOWrapper(open_decompressed(io.BytesIO(data), compression), encoding='utf-8', newline='')
+    reader = csv.reader(text)
+    next(reader)  # header
+    for row in reader:
+        yield [decode_value(field) for field in row]
+
+
+def import_database(db_path, in_dir, tables=None, replace=False):
+    """Bulk-insert an export made by export_database() into the database at db_path.
+
+    The database is created and migrated first if needed. Tables to import
+    must be empty unless `replace=True`, which deletes their rows. Secondary
+    indexes and the caption index are rebuilt once at the end instead of row
+    by row. Returns {table: rows imported}.
+    """
+    from src.database.database_setup import DatabaseManager
+
+    manifest = read_manifest(in_dir)
+    if manifest['schema_version'] > latest_version():
+        raise ValueError(f"The export has schema version {manifest['schema_version']}, newer than this "
+                         f"code's {latest_version()}; update before importing")
+    if tables is None:
+        tables = list(manifest['tables'])
+    missing = [table for table in tables if table not in manifest['tables']]
+    if missing:
+        raise ValueError(f"Not in the export: {', '.join(missing)}")
+
+    # Migrations bring the target to the latest schema; columns added since the export keep their defaults
+    DatabaseManager(db_path).close()
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    for pragma in IMPORT_PRAGMAS:
+        conn.execute(pragma)
+
+    started = time.perf_counter()
+    imported = {}
+    dropped_indexes = []
+    caption_search = CaptionSearch()
+    caption_triggers = []
+    table_stats = TableStats()
+    stats_triggers = []
+    completed = False
+    try:
+        for table in tables:
+            existing = {name for name, _ in table_columns(conn, table)}
+            columns = [column['name'] for column in manifest['tables'][table]['columns']]
+            unknown = [name for name in columns if name not in existing]
+            if unknown:
+                raise ValueError(f"{table} has no column {', '.join(unknown)} in {db_path}")
+            if not replace and conn.execute(f"SELECT EXISTS (SELECT 1 FROM {table})").fetchone()[0]:
+                raise ValueError(f"{table} in {db_path} already has rows; import with replace to overwrite them")
+
+        # Indexes are rebuilt once after the load, which is much faster than maintaining them per row
+        placeholders = ', '.join('?' for _ in tables)
+        for name, sql in conn.execute(
+            f"SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+            f"AND tbl_name IN ({placeholders})", tables
+        ).fetchall():
+            conn.execute(f"DROP INDEX {name}")
+            dropped_indexes.append(sql)
+        if 'social_posts' in tables:
+            caption_triggers = caption_search.suspend_triggers(conn)
+        # Row counts are taken once at the end rather than bumped by a trigger per row
+        stats_triggers = table_stats.suspend_triggers(conn)
+
+        for table in tables:
+            info = manifest['tables'][table]
+            columns = [column['name'] for column in info['columns']]
+            sql = f"INSERT INTO {table} ({quoted(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+
+            table_started = time.perf_counter()
+            rows_in_transaction = 0
+            conn.execute("BEGIN")
+            if replace:
+                conn.execute(f"DELETE FROM {table}")
+            for chunk in info['chunks']:
+                # Rows are decoded as executemany consumes them, never held as a list
+                inserted = conn.executemany(sql, read_chunk(in_dir, chunk, manifest['compression'])).rowcount
+                if inserted != chunk['rows']:
+                    raise ValueError(f"{chunk['file']} has {inserted} rows, the manifest says {chunk['rows']}")
+                rows_in_transaction += inserted
+                if rows_in_transaction >= ROWS_PER_TRANSACTION:
+                    conn.execute("COMMIT")
+                    conn.execute("BEGIN")
+                    rows_in_transaction = 0
+            if info['sequence'] is not None:
+                conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (info['sequence'], table))
+                conn.execute("INSERT INTO sqlite_sequence (name, seq) SELECT ?, ? "
+                             "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = ?)",
+                             (table, info['sequence'], table))
+            conn.execute("COMMIT")
+
+            imported[table] = info['rows']
+            elapsed = time.perf_counter() - table_started
+            rate = info['rows'] / elapsed if elapsed > 0 else 0
+            print(f"Imported {info['rows']:,} rows into {table} in {elapsed:.1f}s ({rate:,.0f} rows/sec)")
+        completed = True
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        for sql in dropped_indexes:
+            conn.execute(sql)
+        if caption_triggers:
+            caption_search.resume_triggers(conn, caption_triggers)
+            caption_search.rebuild(conn)
+        if stats_triggers:
+            # After a failure any table may hold committed batches, so all of them are recounted
+            tracked = set(table_stats.row_counts(conn))
+            written = [table for table in tables
+                       if table in tracked and (imported.get(table) or replace or not completed)]
+            table_stats.resume_triggers(conn, stats_triggers, tables=written)
+        if completed:
+            # Planner statistics for the new rows and indexes
+            conn.execute("ANALYZE")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.close()
+
+    print(f"Import finished in {time.perf_counter() - started:.1f}s")
+    return imported
+
+
+if __name__ == "__main__":
+    from src.database.database_setup import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Export the database to compressed CSV chunks, or import an export.")
+    parser.add_argument('command', choices=['export', 'import'])
+    parser.add_argument('directory', help="export directory (holds manifest.json)")
+    parser.add_argument('--db', default=None, help="database to export from or import into (default: the project's)")
+    parser.add_argument('--tables', nargs='+', default=None, help="only these tables")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help="export: rows per chunk file")
+    parser.add_argument('--workers', type=int, default=None, help="export: compression threads (default: one per core)")
+    parser.add_argument('--compression', choices=['zstd', 'gzip'], default=None,
+                        help="export: zstd if zstandard is installed, else gzip")
+    parser.add_argument('--replace', action='store_true', help="import: overwrite tables that already have rows")
+    args = parser.parse_args()
+
+    db_path = args.db or DatabaseManager(migrate=False).db_path
+
+    try:
+        if args.command == 'export':
+            export_database(db_path, args.directory, tables=args.tables, chunk_rows=args.chunk_rows,
+                            workers=args.workers, compression=args.compression)
+        else:
+            import_database(db_path, args.directory, tables=args.tables, replace=args.replace)
+    except (ValueError, FileExistsError, FileNotFoundError, ImportError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
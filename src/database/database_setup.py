@@ -2,62 +2,373 @@
 
 import sqlite3
 import os
-from sqlalchemy import create_engine
+import sys
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from sqlalchemy import create_engine, event
 import pandas as pd
 
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from src.database.analytics_backend import DuckDBBackend, SQLiteBackend, available_backends
+from src.database.migrations import ensure_migrated, migrate
+from src.database.query_stats import InstrumentedCursor, enabled_by_environment, get_recorder
+from src.database.table_stats import TableStats
+
+logger = logging.getLogger(__name__)
+
+# Idle connections kept in the pool; more are closed when returned
+MAX_IDLE_CONNECTIONS = 8
+
+# Per-connection PRAGMAs by workload. WAL (set on the database file, not per
+# connection) lets readers keep reading while a writer commits.
+#   default    scrapers, analyzers and tools
+#   ingest     long write-heavy runs: bigger cache, fewer automatic checkpoints
+#              (run a CheckpointManager alongside)
+#   analytics  the dashboard and reports: read-only, memory-mapped reads
+PRAGMA_PROFILES = {
+    'default': {
+        'read_only': False,
+        'pragmas': {
+            'synchronous': 'NORMAL',
+            'cache_size': -65536,  # 64 MB
+            'mmap_size': 268435456,  # 256 MB
+            'temp_store': 'MEMORY',
+            'busy_timeout': 30000
+        }
+    },
+    'ingest': {
+        'read_only': False,
+        'pragmas': {
+            'synchronous': 'NORMAL',
+            'cache_size': -262144,  # 256 MB
+            'mmap_size': 268435456,
+            'temp_store': 'MEMORY',
+            'busy_timeout': 60000,
+            'wal_autocheckpoint': 10000  # pages, about 40 MB of WAL
+        }
+    },
+    'analytics': {
+        'read_only': True,
+        'pragmas': {
+            'cache_size': -131072,  # 128 MB
+            'mmap_size': 1073741824,  # 1 GB
+            'temp_store': 'MEMORY',
+            'busy_timeout': 5000,
+            'query_only': 'ON'
+        }
+    }
+}
+
+
+def enable_wal(db_path):
+    """Switch the database file to WAL journaling (a no-op if it already uses it)."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        if mode != 'wal':
+            conn.execute("PRAGMA journal_mode=WAL")
+            logger.info("Switched %s from %s to WAL journaling", db_path, mode)
+    finally:
+        conn.close()
+
+
+def configure_connection(conn, pragmas):
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name}={value}")
+
+
+class CheckpointManager:
+    """Background thread that checkpoints the WAL so it doesn't grow while readers keep it pinned.
+
+    Every `interval` seconds it runs a PASSIVE checkpoint, which never blocks
+    readers or writers. When the WAL file has grown past `truncate_bytes` it
+    tries a TRUNCATE checkpoint instead, which waits up to `busy_timeout_ms`
+    for readers to finish.
+    """
+
+    def __init__(self, db_path, interval=30.0, truncate_bytes=64 * 1024 * 1024, busy_timeout_ms=2000):
+        self.db_path = db_path
+        self.interval = interval
+        self.truncate_bytes = truncate_bytes
+        self.busy_timeout_ms = busy_timeout_ms
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.stats = {'checkpoints': 0, 'truncations': 0, 'busy': 0, 'pages_checkpointed': 0}
+
+    def wal_size(self):
+        wal_path = self.db_path + '-wal'
+        return os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+
+    def checkpoint(self):
+        """Run one checkpoint; returns (busy, wal pages, pages checkpointed)."""
+        mode = 'TRUNCATE' if self.wal_size() > self.truncate_bytes else 'PASSIVE'
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000)
+        try:
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            busy, log_pages, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        finally:
+            conn.close()
+
+        self.stats['checkpoints'] += 1
+        self.stats['busy'] += busy
+        self.stats['pages_checkpointed'] += max(checkpointed, 0)
+        if mode == 'TRUNCATE' and not busy:
+            self.stats['truncations'] += 1
+        return busy, log_pages, checkpointed
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.checkpoint()
+            except Exception as e:
+                logger.warning("Checkpoint of %s failed: %s", self.db_path, e)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name='sqlite-checkpoints', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to its DatabaseManager's pool.
+
+    Like a real close, returning it discards any uncommitted transaction.
+    With a recorder set, statements run through InstrumentedCursor.
+    """
+
+    pool = None
+    recorder = None
+
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = InstrumentedCursor if self.recorder is not None else sqlite3.Cursor
+        return super().cursor(factory)
+
+    # The sqlite3 shortcuts don't go through cursor(), so route them there when instrumented
+    def execute(self, sql, parameters=()):
+        if self.recorder is None:
+            return super().execute(sql, parameters)
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        if self.recorder is None:
+            return super().executemany(sql, seq_of_parameters)
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        if self.recorder is None:
+            return super().executescript(sql_script)
+        return self.cursor().executescript(sql_script)
+
+    def close(self):
+        if self.pool is None:
+            super().close()
+        else:
+            self.pool.release(self)
+
+    def close_for_real(self):
+        self.pool = None
+        super().close()
+
 
 class DatabaseManager:
-    def __init__(self, db_path=None):
+    """Paths, schema and pooled connections for the project database.
+
+    Connections are opened once and reused: create_connection() (or the
+    connection() context manager) checks one out of a shared idle pool, and
+    close() returns it there; at most MAX_IDLE_CONNECTIONS stay open while
+    idle, so threads that come and go don't leave connections behind. A
+    single SQLAlchemy engine is shared by all callers. Every connection is
+    configured with the PRAGMAs of the manager's profile (see
+    PRAGMA_PROFILES).
+
+    With `query_stats=True` (or FASHION_TRENDS_QUERY_STATS=1 in the
+    environment) every statement on its connections and engine is timed and
+    tagged with the code that issued it; see src/database/query_stats.py.
+
+    read_frame() runs analytical queries on the configured backend:
+    'sqlite' (the default) or 'duckdb', a columnar snapshot of the database
+    (see src/database/analytics_backend.py). FASHION_TRENDS_ANALYTICS_BACKEND
+    sets the default for the process.
+    """
+
+    def __init__(self, db_path=None, migrate=True, profile='default', query_stats=None,
+                 analytics_backend=None, **backend_options):
         if db_path is None:
             # Use the correct database path
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
             self.db_path = os.path.join(project_root, 'src', 'database', 'data', 'fashion_trends.db')
         else:
             self.db_path = db_path
 
+        if profile not in PRAGMA_PROFILES:
+            raise ValueError(f"Unknown PRAGMA profile '{profile}'. Choose from: {', '.join(PRAGMA_PROFILES)}")
+        self.profile = profile
         self.engine = None
-        self.conn = None
+        self.checkpoint_manager = None
+        if query_stats is None:
+            query_stats = enabled_by_environment()
+        self.recorder = get_recorder(self.db_path) if query_stats else None
+
+        if analytics_backend is None:
+            analytics_backend = os.environ.get('FASHION_TRENDS_ANALYTICS_BACKEND', 'sqlite')
+        if analytics_backend not in ('sqlite', 'duckdb'):
+            raise ValueError(f"Unknown analytics backend '{analytics_backend}'. Choose from: sqlite, duckdb")
+        if analytics_backend not in available_backends():
+            raise ImportError(f"The {analytics_backend} analytics backend needs the {analytics_backend} package")
+        self.analytics_backend = analytics_backend
+        self.backend_options = backend_options
+        self.backend = None
+
+        self.lock = threading.Lock()
+        self.idle = []
+        self.all_connections = []
+        self.counts = {'opened': 0, 'reused': 0, 'returned': 0, 'closed': 0}
 
         # Ensure the data directory exists
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
 
+        # Schema changes happen once here, so the rest of the process can assume the latest layout
+        if migrate:
+            ensure_migrated(self.db_path)
+        if not PRAGMA_PROFILES[profile]['read_only'] and os.path.exists(self.db_path):
+            enable_wal(self.db_path)
+
+    def open_connection(self):
+        settings = PRAGMA_PROFILES[self.profile]
+        if settings['read_only']:
+            conn = sqlite3.connect(Path(self.db_path).resolve().as_uri() + '?mode=ro', uri=True, timeout=30,
+                                   factory=PooledConnection, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=30, factory=PooledConnection, check_same_thread=False)
+        configure_connection(conn, settings['pragmas'])
+        conn.pool = self
+        conn.recorder = self.recorder
+        with self.lock:
+            self.all_connections.append(conn)
+            self.counts['opened'] += 1
+        logger.debug("Opened SQLite connection to %s", self.db_path)
+        return conn
+
     def create_connection(self):
-        """Create a connection to the SQLite database."""
+        """Check out a connection to the SQLite database from the pool.
+
+        Call close() on it when done to return it to the pool.
+        """
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            print(f"Connection to SQLite database successful at {self.db_path}")
-            return self.conn
+            with self.lock:
+                if self.idle:
+                    self.counts['reused'] += 1
+                    return self.idle.pop()
+            return self.open_connection()
         except Exception as e:
-            print(f"Error connecting to SQLite database: {e}")
+            logger.error("Error connecting to SQLite database at %s: %s", self.db_path, e)
             return None
 
-    def setup_database(self, schema_file='sql/schema.sql'):
-        """Set up the database using the SQL schema file."""
+    def release(self, conn):
+        """Return a checked-out connection to the pool."""
+        if conn.in_transaction:
+            conn.rollback()
+        # The next borrower gets a connection configured like a fresh one
+        conn.row_factory = None
+        conn.isolation_level = ''
+
+        with self.lock:
+            if len(self.idle) < MAX_IDLE_CONNECTIONS:
+                self.idle.append(conn)
+                self.counts['returned'] += 1
+                return
+            self.all_connections.remove(conn)
+            self.counts['closed'] += 1
+        conn.close_for_real()
+
+    @contextmanager
+    def connection(self):
+        """Pooled connection for a with-block: committed on success, rolled back on error."""
+        conn = self.create_connection()
+        if conn is None:
+            raise sqlite3.OperationalError(f"Could not connect to {self.db_path}")
         try:
-            # Create a new connection for setup
-            conn = sqlite3.connect(self.db_path)
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
 
-            # Get the absolute path to the schema file
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            schema_path = os.path.join(project_root, schema_file)
+    def pool_stats(self):
+        """Connection counts: opened, reused, returned and closed so far, and how many are open now."""
+        with self.lock:
+            return dict(self.counts, open=len(self.all_connections),
+                        engine_pool=self.engine.pool.status() if self.engine is not None else None)
 
-            # Check if schema file exists
-            if not os.path.exists(schema_path):
-                print(f"Schema file not found at: {schema_path}")
-                return False
+    def start_checkpoints(self, interval=30.0, **kwargs):
+        """Start a background CheckpointManager for this database (once) and return it."""
+        with self.lock:
+            if self.checkpoint_manager is None:
+                self.checkpoint_manager = CheckpointManager(self.db_path, interval=interval, **kwargs)
+                self.checkpoint_manager.start()
+            return self.checkpoint_manager
 
-            print(f"Reading schema from: {schema_path}")
+    def analytics(self):
+        """The analytical backend, created on first use."""
+        with self.lock:
+            if self.backend is None:
+                if self.analytics_backend == 'duckdb':
+                    self.backend = DuckDBBackend(self.db_path, **self.backend_options)
+                else:
+                    self.backend = SQLiteBackend(self)
+            return self.backend
 
-            with open(schema_path, 'r') as file:
-                sql_commands = file.read()
+    def read_frame(self, query, params=None):
+        """Run an analytical query on the configured backend and return a DataFrame.
 
-            cursor = conn.cursor()
-            cursor.executescript(sql_commands)
+        Use `?` placeholders with a list of params, and SQL that both SQLite
+        and DuckDB accept.
+        """
+        return self.analytics().read_frame(query, params)
 
-            conn.commit()
-            print("SQLite database setup successful")
+    def close(self):
+        """Close every pooled connection and dispose of the engine."""
+        if self.backend is not None:
+            self.backend.close()
+            self.backend = None
+        if self.checkpoint_manager is not None:
+            self.checkpoint_manager.stop()
+            self.checkpoint_manager = None
+        with self.lock:
+            connections, self.all_connections = self.all_connections, []
+            self.idle = []
+            self.counts['closed'] += len(connections)
+            if self.engine is not None:
+                self.engine.dispose()
+                self.engine = None
+        for conn in connections:
+            conn.close_for_real()
+        if self.recorder is not None:
+            self.recorder.flush()
+
+    def setup_database(self, applied_at=None):
+        """Create or upgrade the database schema by applying pending migrations."""
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            applied = migrate(conn, applied_at=applied_at)
+            print(f"SQLite database setup successful ({len(applied)} migrations applied)")
 
             # Verify tables were created
+            cursor = conn.cursor()
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
             tables = cursor.fetchall()
             print(f"Created tables: {tables}")
@@ -71,35 +382,52 @@ class DatabaseManager:
                 conn.close()
 
     def create_sqlalchemy_engine(self):
-        """Create a SQLAlchemy engine for database operations."""
-        connection_string = f"sqlite:///{self.db_path}"
-        try:
-            self.engine = create_engine(connection_string)
-            print("SQLAlchemy engine created successfully")
-            return self.engine
-        except Exception as e:
-            print(f"Error creating SQLAlchemy engine: {e}")
-            return None
+        """Create a SQLAlchemy engine for database operations, reusing it on later calls."""
+        with self.lock:
+            if self.engine is not None:
+                return self.engine
+
+            connection_string = f"sqlite:///{self.db_path}"
+            try:
+                # The engine's DBAPI connections are PooledConnections outside the pool, so they
+                # close normally and can be instrumented like the manager's own
+                self.engine = create_engine(connection_string, connect_args={'factory': PooledConnection})
+                pragmas = PRAGMA_PROFILES[self.profile]['pragmas']
+                recorder = self.recorder
+
+                @event.listens_for(self.engine, 'connect')
+                def configure(dbapi_connection, connection_record):
+                    configure_connection(dbapi_connection, pragmas)
+                    dbapi_connection.recorder = recorder
+
+                logger.debug("SQLAlchemy engine created for %s", self.db_path)
+                return self.engine
+            except Exception as e:
+                logger.error("Error creating SQLAlchemy engine: %s", e)
+                return None
+
+    def table_stats(self):
+        """Row counts, sizes and last writes per table, from the trigger-maintained table_stats (no scans)."""
+        with self.connection() as conn:
+            return TableStats().summary(conn)
 
     def test_connection(self):
         """Test the database connection and show tables."""
+        conn = None
         try:
             conn = sqlite3.connect(self.db_path)  # Create a new connection for testing
-            cursor = conn.cursor()
 
-            # Get list of tables
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = cursor.fetchall()
+            # Record counts come from table_stats, so this is instant on any size of database
+            counts = TableStats().row_counts(conn)
+            tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()
 
             print("\nTables in the database:")
             for table in tables:
                 print(f"- {table[0]}")
 
-            # Get count of records in each table
             for table in tables:
-                cursor.execute(f"SELECT COUNT(*) FROM {table[0]}")
-                count = cursor.fetchone()[0]
-                print(f"  Records in {table[0]}: {count}")
+                if table[0] in counts:
+                    print(f"  Records in {table[0]}: {counts[table[0]]}")
 
             return True
         except Exception as e:
@@ -0,0 +1,171 @@
+# src/database/migrations.py
+
+import argparse
+import importlib.util
+import os
+import re
+import sqlite3
+import sys
+import threading
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+MIGRATIONS_DIR = os.path.join(project_root, 'sql', 'migrations')
+
+# NNN_name.sql holds statements; NNN_name.py defines upgrade(cursor)
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d{3})_(\w+)\.(sql|py)$')
+
+SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# Databases already brought up to date by this process
+_migrated_paths = set()
+_migrated_lock = threading.Lock()
+
+
+def list_migrations(migrations_dir=MIGRATIONS_DIR):
+    """Migration files as (version, name, path), in version order."""
+    migrations = []
+    for filename in os.listdir(migrations_dir):
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), f"{match.group(1)}_{match.group(2)}",
+                               os.path.join(migrations_dir, filename)))
+    migrations.sort()
+
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {migrations_dir}")
+    return migrations
+
+
+def latest_version(migrations_dir=MIGRATIONS_DIR):
+    migrations = list_migrations(migrations_dir)
+    return migrations[-1][0] if migrations else 0
+
+
+def split_statements(sql):
+    """Split a SQL script into complete statements (trigger bodies stay whole)."""
+    statements, current = [], ''
+    for line in sql.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            if current.strip():
+                statements.append(current.strip())
+            current = ''
+    if current.strip() and not all(line.strip().startswith('--') or not line.strip()
+                                   for line in current.splitlines()):
+        raise ValueError(f"Incomplete SQL statement: {current.strip()[:80]}")
+    return statements
+
+
+def apply_migration(cursor, path):
+    if path.endswith('.sql'):
+        with open(path) as f:
+            # executescript would commit; run statement by statement inside the migration's transaction
+            for statement in split_statements(f.read()):
+                cursor.execute(statement)
+    else:
+        spec = importlib.util.spec_from_file_location(f"migration_{os.path.basename(path)[:-3]}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.upgrade(cursor)
+
+
+def current_version(conn):
+    """Highest applied migration version, 0 for a database without schema_version."""
+    row = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'").fetchone()
+    if row is None:
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate(conn, migrations_dir=MIGRATIONS_DIR, applied_at=None):
+    """Apply pending migrations to an open connection, each in its own transaction.
+
+    Concurrent processes serialize on the write lock, and whichever gets it
+    second finds the migration already recorded. Pass `applied_at` to record a
+    fixed timestamp (for reproducible database files). Returns the names of
+    the migrations applied.
+    """
+    isolation_level = conn.isolation_level
+    conn.commit()
+    conn.isolation_level = None
+    cursor = conn.cursor()
+
+    applied = []
+    try:
+        cursor.execute(SCHEMA_VERSION_TABLE)
+        for version, name, path in list_migrations(migrations_dir):
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute("SELECT 1 FROM schema_version WHERE version = ?", (version,))
+                if cursor.fetchone():
+                    cursor.execute("COMMIT")
+                    continue
+
+                apply_migration(cursor, path)
+                if applied_at is None:
+                    cursor.execute("INSERT INTO schema_version (version, name) VALUES (?, ?)", (version, name))
+                else:
+                    cursor.execute("INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                                   (version, name, applied_at))
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            applied.append(name)
+            print(f"Applied migration {name}")
+    finally:
+        conn.isolation_level = isolation_level
+
+    return applied
+
+
+def database_key(db_path):
+    # The inode tells a database file deleted and recreated at the same path from the one migrated
+    path = os.path.abspath(db_path)
+    return path, os.stat(path).st_ino if os.path.exists(path) else None
+
+
+def ensure_migrated(db_path):
+    """Bring the database at db_path up to date, once per process."""
+    with _migrated_lock:
+        if database_key(db_path) in _migrated_paths:
+            return []
+        conn = sqlite3.connect(db_path, timeout=30)
+        try:
+            applied = migrate(conn)
+        finally:
+            conn.close()
+        _migrated_paths.add(database_key(db_path))
+        return applied
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show or apply database schema migrations.")
+    parser.add_argument('--db-path', default=None, help="database to migrate (defaults to the project database)")
+    parser.add_argument('--status', action='store_true', help="only show applied and pending migrations")
+    args = parser.parse_args()
+
+    from src.database.database_setup import DatabaseManager
+    db_path = args.db_path or DatabaseManager(migrate=False).db_path
+
+    conn = sqlite3.connect(db_path)
+    if not args.status:
+        applied = migrate(conn)
+        print(f"Applied {len(applied)} migrations")
+
+    applied_versions = set()
+    if current_version(conn):
+        applied_versions = {row[0] for row in conn.execute("SELECT version FROM schema_version")}
+    for number, name, _ in list_migrations():
+        print(f"  {'applied' if number in applied_versions else 'pending'}  {name}")
+    conn.close()
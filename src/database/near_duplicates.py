@@ -0,0 +1,268 @@
+# src/database/near_duplicates.py
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+# Signatures are cut into BANDS bands of ROWS values; posts sharing any band
+# are candidates, and a candidate is a near-duplicate when the fraction of
+# equal MinHash values (the estimated Jaccard similarity of their words and
+# word pairs) reaches the threshold. Captions with similarity 0.8 share a band
+# 98.5% of the time, 0.9 over 99.9%, while unrelated captions rarely do.
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.8
+
+# Shorter captions ("love this!") repeat by chance, not by reposting
+MIN_TOKENS = 5
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+TOKEN_PATTERN = re.compile(r'#?\w+')
+
+# Fixed seed: signatures stored by earlier runs must stay comparable
+_rng = np.random.default_rng(20240611)
+PERM_MULTIPLIERS = _rng.integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+PERM_OFFSETS = _rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+BAND_MULTIPLIERS = _rng.integers(1, 2 ** 63, ROWS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+
+# Captions hashed together per block, which bounds the (features x NUM_PERM) matrix
+MINHASH_BLOCK_SIZE = 2000
+
+PAIR_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+NO_FEATURE = np.uint64(2 ** 64 - 1)
+
+
+@lru_cache(maxsize=200000)
+def token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def caption_tokens(caption):
+    """Lowercased words and hashtags of a caption, or None if it is missing or too short to compare."""
+    if not caption or not isinstance(caption, str):
+        return None
+    tokens = TOKEN_PATTERN.findall(caption.lower())
+    return tokens if len(tokens) >= MIN_TOKENS else None
+
+
+def permute(hashes):
+    # Multiply-shift hashing: one universal hash per permutation, keeping the top 32 bits
+    with np.errstate(over='ignore'):
+        return (hashes[:, None] * PERM_MULTIPLIERS + PERM_OFFSETS) >> np.uint64(32)
+
+
+def minhash_block(token_lists):
+    """Signatures over each caption's words and adjacent word pairs."""
+    counts = np.array([len(tokens) for tokens in token_lists])
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    hashes = np.fromiter((token_hash(token) for tokens in token_lists for token in tokens),
+                         dtype=np.uint64, count=int(counts.sum()))
+
+    with np.errstate(over='ignore'):
+        pairs = hashes[:-1] * PAIR_MULTIPLIER + hashes[1:]
+    pair_values = permute(pairs)
+    # The pair spanning the end of one caption and the start of the next is not a feature
+    pair_values[starts[1:] - 1] = NO_FEATURE
+
+    signatures = np.minimum(np.minimum.reduceat(permute(hashes), starts, axis=0),
+                            np.minimum.reduceat(pair_values, starts, axis=0))
+    return signatures.astype(np.uint32)
+
+
+def minhash_batch(captions):
+    """MinHash signatures for a list of captions: a (len, NUM_PERM) uint32 array and a mask of
+    the captions that had one (short or missing captions do not)."""
+    token_lists = [caption_tokens(caption) for caption in captions]
+    has_signature = np.array([tokens is not None for tokens in token_lists], dtype=bool)
+    signatures = np.zeros((len(captions), NUM_PERM), dtype=np.uint32)
+
+    token_lists = [tokens for tokens in token_lists if tokens is not None]
+    if token_lists:
+        signatures[has_signature] = np.concatenate([
+            minhash_block(token_lists[start:start + MINHASH_BLOCK_SIZE])
+            for start in range(0, len(token_lists), MINHASH_BLOCK_SIZE)
+        ])
+    return signatures, has_signature
+
+
+def minhash(caption):
+    """MinHash signature of a caption (NUM_PERM uint32 values), or None for short or missing captions."""
+    signatures, has_signature = minhash_batch([caption])
+    return signatures[0] if has_signature[0] else None
+
+
+def band_buckets(signatures):
+    """Bucket of each band for a (len, NUM_PERM) signature array, as signed 64-bit ints for SQLite."""
+    with np.errstate(over='ignore'):
+        rows = signatures.astype(np.uint64).reshape(len(signatures), BANDS, ROWS)
+        buckets = (rows * BAND_MULTIPLIERS).sum(axis=2, dtype=np.uint64)
+    return buckets.view(np.int64)
+
+
+class DuplicateDetector:
+    """Flag reposted and copy-pasted captions at ingest.
+
+    Each original post's caption MinHash is indexed by band in
+    minhash_bands (tables created by migration 008). A new post whose estimated similarity to an indexed post
+    reaches `threshold` gets social_posts.duplicate_of set to that post and is
+    left out of trend scoring; only originals are indexed.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+
+    def candidates(self, cursor, buckets):
+        """Indexed (post_id, signature) pairs sharing any of the (band, bucket) pairs, keyed by the pair."""
+        by_band = {}
+        for band, bucket in buckets:
+            by_band.setdefault(band, set()).add(bucket)
+
+        found = {}
+        for band, values in by_band.items():
+            values = sorted(values)
+            for start in range(0, len(values), LOOKUP_CHUNK_SIZE):
+                chunk = values[start:start + LOOKUP_CHUNK_SIZE]
+                cursor.execute(f"""
+                SELECT b.bucket, s.post_id, s.minhash
+                FROM minhash_bands b
+                JOIN caption_signatures s ON s.post_id = b.post_id
+                WHERE b.band = ? AND b.bucket IN ({', '.join('?' * len(chunk))})
+                """, [band] + chunk)
+                for bucket, post_id, signature in cursor.fetchall():
+                    found.setdefault((band, bucket), []).append((post_id, np.frombuffer(signature, dtype=np.uint32)))
+        return found
+
+    def mark_posts(self, cursor, posts_df):
+        """Check a DataFrame of stored posts (post_id, caption) against the index and each other.
+
+        Duplicates get duplicate_of set; originals are added to the index.
+        Returns the number of duplicates flagged.
+        """
+        signatures, has_signature = minhash_batch(posts_df['caption'].tolist())
+        if not has_signature.any():
+            return 0
+        post_ids = [int(post_id) for post_id in posts_df['post_id'].to_numpy()[has_signature]]
+        signatures = signatures[has_signature]
+        bucket_lists = [list(enumerate(buckets)) for buckets in band_buckets(signatures).tolist()]
+
+        index = self.candidates(cursor, {pair for buckets in bucket_lists for pair in buckets})
+
+        duplicates, originals = [], []
+        for post_id, signature, buckets in zip(post_ids, signatures, bucket_lists):
+            candidates = {}
+            for pair in buckets:
+                for other_id, other in index.get(pair, []):
+                    if other_id != post_id:
+                        candidates[other_id] = other
+
+            if candidates:
+                other_ids = sorted(candidates)
+                scores = (np.stack([candidates[other_id] for other_id in other_ids]) == signature).mean(axis=1)
+                # Most similar wins; argmax picks the older post on ties
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    duplicates.append((other_ids[best], post_id))
+                    continue
+
+            originals.append((post_id, signature, buckets))
+            # Later posts in the same batch are checked against this one too
+            for pair in buckets:
+                index.setdefault(pair, []).append((post_id, signature))
+
+        cursor.executemany("INSERT OR IGNORE INTO caption_signatures (post_id, minhash) VALUES (?, ?)",
+                           [(post_id, signature.tobytes()) for post_id, signature, _ in originals])
+        cursor.executemany("INSERT OR IGNORE INTO minhash_bands (band, bucket, post_id) VALUES (?, ?, ?)",
+                           [(band, bucket, post_id) for post_id, _, buckets in originals
+                            for band, bucket in buckets])
+        cursor.executemany("UPDATE social_posts SET duplicate_of = ? WHERE post_id = ?", duplicates)
+
+        return len(duplicates)
+
+    def mark_for_urls(self, cursor, posts):
+        """Check posts (dicts or a DataFrame) already saved, matching them by post_url."""
+        posts_df = pd.DataFrame(posts)
+        if posts_df.empty or 'post_url' not in posts_df.columns:
+            return 0
+
+        urls = posts_df['post_url'].dropna().unique().tolist()
+        post_ids = {}
+        for start in range(0, len(urls), LOOKUP_CHUNK_SIZE):
+            chunk = urls[start:start + LOOKUP_CHUNK_SIZE]
+            cursor.execute(f"""
+            SELECT post_url, post_id FROM social_posts
+            WHERE post_url IN ({', '.join('?' * len(chunk))})
+              AND duplicate_of IS NULL
+              AND post_id NOT IN (SELECT post_id FROM caption_signatures)
+            """, chunk)
+            post_ids.update(cursor.fetchall())
+
+        posts_df = posts_df.assign(post_id=posts_df['post_url'].map(post_ids)).dropna(subset=['post_id'])
+        return self.mark_posts(cursor, posts_df)
+
+    def backfill(self, conn, platform=None, chunk_size=50000):
+        """Check stored posts that have not been checked yet, oldest first."""
+        cursor = conn.cursor()
+
+        query = """
+        SELECT post_id, caption FROM social_posts
+        WHERE duplicate_of IS NULL AND post_id NOT IN (SELECT post_id FROM caption_signatures)
+        """
+        params = []
+        if platform is not None:
+            query += " AND platform = ?"
+            params.append(platform)
+        query += " ORDER BY post_id"
+
+        # Read everything first; flagging rows while a SELECT over them is open would skip some
+        chunks = list(pd.read_sql_query(query, conn, params=params, chunksize=chunk_size))
+        flagged = 0
+        for chunk in chunks:
+            flagged += self.mark_posts(cursor, chunk)
+            conn.commit()
+        return flagged
+
+    def reset(self, conn):
+        """Forget all signatures and flags, e.g. before re-checking with a different threshold."""
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM minhash_bands")
+        cursor.execute("DELETE FROM caption_signatures")
+        cursor.execute("UPDATE social_posts SET duplicate_of = NULL WHERE duplicate_of IS NOT NULL")
+        conn.commit()
+
+
+if __name__ == "__main__":
+    from src.database.database_setup import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Flag near-duplicate social posts that have not been checked yet.")
+    parser.add_argument('--platform', default=None, help="only check posts from this platform")
+    parser.add_argument('--threshold', type=float, default=SIMILARITY_THRESHOLD,
+                        help="estimated caption similarity (0-1) at which posts count as duplicates")
+    parser.add_argument('--reset', action='store_true', help="clear earlier results and check every post again")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    conn = sqlite3.connect(db.db_path)
+    detector = DuplicateDetector(threshold=args.threshold)
+
+    if args.reset:
+        detector.reset(conn)
+
+    flagged = detector.backfill(conn, platform=args.platform)
+    total = conn.execute("SELECT COUNT(*) FROM social_posts WHERE duplicate_of IS NOT NULL").fetchone()[0]
+    print(f"Flagged {flagged} new near-duplicate posts ({total} in total)")
+    conn.close()
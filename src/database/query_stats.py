@@ -0,0 +1,356 @@
+# src/database/query_stats.py
+
+import argparse
+import atexit
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+# Set to 1 to instrument every DatabaseManager in the process without code changes
+ENV_ENABLE = 'FASHION_TRENDS_QUERY_STATS'
+ENV_SLOW_MS = 'FASHION_TRENDS_SLOW_QUERY_MS'
+
+SLOW_QUERY_MS = 250
+
+STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS query_stats (
+    statement TEXT NOT NULL,
+    call_site TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    total_ms REAL NOT NULL,
+    max_ms REAL NOT NULL,
+    rows INTEGER NOT NULL,
+    slow_calls INTEGER NOT NULL,
+    last_seen TIMESTAMP,
+    PRIMARY KEY (statement, call_site)
+)
+"""
+
+# Frames in these files are the instrumentation itself, not the caller
+INSTRUMENTATION_FILES = {
+    os.path.abspath(__file__),
+    os.path.join(project_root, 'src', 'database', 'database_setup.py'),
+    os.path.join(project_root, 'src', 'database', 'analytics_backend.py')
+}
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+PLACEHOLDER_LIST_PATTERN = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+EXPLAINABLE_PATTERN = re.compile(r'^\s*(SELECT|WITH|INSERT|UPDATE|DELETE|REPLACE)\b', re.IGNORECASE)
+
+slow_logger = logging.getLogger('src.database.slow_queries')
+
+
+def normalize_statement(sql):
+    """One-line form of a statement; IN (?, ?, ...) lists of any length count as the same statement."""
+    return PLACEHOLDER_LIST_PATTERN.sub('(?, ...)', WHITESPACE_PATTERN.sub(' ', sql).strip())
+
+
+def call_site():
+    """'path:line function' of the project code that issued the statement."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(project_root) and filename not in INSTRUMENTATION_FILES:
+            return f"{os.path.relpath(filename, project_root)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return '<outside project>'
+
+
+class QueryRecorder:
+    """Per-statement timings for one database, aggregated in memory by (statement, call site).
+
+    Totals are added to `stats_path` (a small SQLite file) by flush(), which
+    runs at exit, so the summary covers every instrumented process. Statements
+    slower than `slow_ms` are logged with their EXPLAIN QUERY PLAN to
+    `slow_log_path`.
+    """
+
+    def __init__(self, stats_path, slow_ms=SLOW_QUERY_MS, slow_log_path=None):
+        self.stats_path = stats_path
+        self.slow_ms = slow_ms
+        self.lock = threading.Lock()
+        self.stats = {}
+
+        if slow_log_path is not None:
+            slow_log_path = os.path.abspath(slow_log_path)
+            if not any(getattr(handler, 'baseFilename', None) == slow_log_path for handler in slow_logger.handlers):
+                handler = logging.FileHandler(slow_log_path)
+                handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+                slow_logger.addHandler(handler)
+            slow_logger.setLevel(logging.INFO)
+
+    def begin(self, sql, site):
+        """Count a call of a statement; returns its key for add() and end()."""
+        key = (normalize_statement(sql), site)
+        with self.lock:
+            entry = self.stats.get(key)
+            if entry is None:
+                entry = self.stats[key] = [0, 0.0, 0.0, 0, 0]
+            entry[0] += 1
+        return key
+
+    def add(self, key, seconds, rows):
+        """Add time spent and rows returned or changed, as they happen."""
+        with self.lock:
+            entry = self.stats.setdefault(key, [0, 0.0, 0.0, 0, 0])
+            entry[1] += seconds * 1000
+            entry[3] += max(rows, 0)
+
+    def end(self, conn, key, sql, parameters, seconds, rows):
+        """Finish a call that took `seconds` in all, logging it if it was slow."""
+        ms = seconds * 1000
+        slow = ms >= self.slow_ms
+        with self.lock:
+            entry = self.stats.setdefault(key, [0, 0.0, 0.0, 0, 0])
+            entry[2] = max(entry[2], ms)
+            entry[4] += slow
+
+        if slow:
+            plan = self.explain(conn, sql, parameters)
+            slow_logger.info("%.1f ms, %d rows, %s\n  %s\n%s", ms, max(rows, 0), key[1], key[0],
+                             '\n'.join(f"    {line}" for line in plan))
+
+    def record(self, conn, sql, parameters, seconds, rows, site):
+        """Count a statement that has completed."""
+        key = self.begin(sql, site)
+        self.add(key, seconds, rows)
+        self.end(conn, key, sql, parameters, seconds, rows)
+
+    def explain(self, conn, sql, parameters):
+        if parameters is None or not EXPLAINABLE_PATTERN.match(sql):
+            return []
+        try:
+            # The plain sqlite3 method, so the EXPLAIN itself isn't recorded
+            rows = sqlite3.Connection.execute(conn, 'EXPLAIN QUERY PLAN ' + sql, parameters).fetchall()
+            return [row[-1] for row in rows]
+        except sqlite3.Error as e:
+            return [f"(no plan: {e})"]
+
+    def flush(self):
+        """Add the in-memory totals to the stats file and start over."""
+        with self.lock:
+            stats, self.stats = self.stats, {}
+        if not stats:
+            return
+
+        try:
+            conn = sqlite3.connect(self.stats_path, timeout=30)
+            try:
+                conn.execute(STATS_SCHEMA)
+                conn.executemany("""
+                INSERT INTO query_stats (statement, call_site, calls, total_ms, max_ms, rows, slow_calls, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (statement, call_site) DO UPDATE SET
+                    calls = calls + excluded.calls,
+                    total_ms = total_ms + excluded.total_ms,
+                    max_ms = MAX(max_ms, excluded.max_ms),
+                    rows = rows + excluded.rows,
+                    slow_calls = slow_calls + excluded.slow_calls,
+                    last_seen = excluded.last_seen
+                """, [(statement, site, *entry, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                      for (statement, site), entry in stats.items()])
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error saving query stats to {self.stats_path}: {e}")
+
+
+# One recorder per database file, shared by every DatabaseManager in the process
+_recorders = {}
+_recorders_lock = threading.Lock()
+
+
+def get_recorder(db_path, slow_ms=None):
+    """The process-wide recorder for a database, writing next to it."""
+    key = os.path.abspath(db_path)
+    with _recorders_lock:
+        recorder = _recorders.get(key)
+        if recorder is None:
+            if slow_ms is None:
+                slow_ms = float(os.environ.get(ENV_SLOW_MS, SLOW_QUERY_MS))
+            data_dir = os.path.dirname(key)
+            recorder = _recorders[key] = QueryRecorder(os.path.join(data_dir, 'query_stats.db'), slow_ms=slow_ms,
+                                                       slow_log_path=os.path.join(data_dir, 'slow_queries.log'))
+            if len(_recorders) == 1:
+                atexit.register(flush_all)
+        return recorder
+
+
+def flush_all():
+    for recorder in list(_recorders.values()):
+        recorder.flush()
+
+
+def enabled_by_environment():
+    return os.environ.get(ENV_ENABLE, '').lower() in ('1', 'true', 'yes')
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """sqlite3 cursor that reports each statement to its connection's recorder.
+
+    A SELECT's time includes fetching its rows. Its slowest-call time and the
+    slow-query check are settled once the results are exhausted, the cursor is
+    closed or it runs the next statement.
+    """
+
+    pending = None
+
+    def execute(self, sql, parameters=()):
+        self.finish()
+        site = call_site()
+        started = time.perf_counter()
+        super().execute(sql, parameters)
+        self.begin(sql, parameters, site, time.perf_counter() - started)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self.finish()
+        site = call_site()
+        started = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        self.connection.recorder.record(self.connection, sql, None, time.perf_counter() - started,
+                                        self.rowcount, site)
+        return self
+
+    def executescript(self, sql_script):
+        self.finish()
+        site = call_site()
+        started = time.perf_counter()
+        super().executescript(sql_script)
+        self.connection.recorder.record(self.connection, sql_script, None, time.perf_counter() - started, 0, site)
+        return self
+
+    def begin(self, sql, parameters, site, seconds):
+        recorder = self.connection.recorder
+        if self.description is None:
+            recorder.record(self.connection, sql, parameters, seconds, self.rowcount, site)
+        else:
+            # Counted now, so a result set that is never read to the end still shows up
+            key = recorder.begin(sql, site)
+            recorder.add(key, seconds, 0)
+            self.pending = [key, sql, parameters, seconds, 0]
+
+    def finish(self):
+        pending, self.pending = self.pending, None
+        if pending is not None:
+            key, sql, parameters, seconds, rows = pending
+            self.connection.recorder.end(self.connection, key, sql, parameters, seconds, rows)
+
+    def timed_fetch(self, fetch, *args):
+        started = time.perf_counter()
+        result = fetch(*args)
+        if self.pending is not None:
+            seconds = time.perf_counter() - started
+            rows = 0 if result is None else len(result) if isinstance(result, list) else 1
+            self.pending[3] += seconds
+            self.pending[4] += rows
+            self.connection.recorder.add(self.pending[0], seconds, rows)
+        return result
+
+    def fetchone(self):
+        row = self.timed_fetch(super().fetchone)
+        if row is None:
+            self.finish()
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        rows = self.timed_fetch(super().fetchmany, size)
+        if len(rows) < size:
+            self.finish()
+        return rows
+
+    def fetchall(self):
+        rows = self.timed_fetch(super().fetchall)
+        self.finish()
+        return rows
+
+    def __next__(self):
+        try:
+            return self.timed_fetch(super().__next__)
+        except StopIteration:
+            self.finish()
+            raise
+
+    def close(self):
+        self.finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self.finish()
+        except Exception:
+            pass
+
+
+def summary(stats_path, top=20, order_by='total_ms', by_site=True):
+    """Top statements from a stats file as a DataFrame, by total time unless `order_by` says otherwise."""
+    if order_by not in ('total_ms', 'mean_ms', 'max_ms', 'calls', 'rows'):
+        raise ValueError(f"Can't order query stats by {order_by!r}")
+    if not os.path.exists(stats_path):
+        return pd.DataFrame(columns=['statement', 'call_site', 'calls', 'total_ms', 'mean_ms', 'max_ms', 'rows'])
+
+    site = "call_site" if by_site else "COUNT(DISTINCT call_site) AS call_sites"
+    conn = sqlite3.connect(stats_path)
+    try:
+        return pd.read_sql_query(f"""
+        SELECT statement, {site}, SUM(calls) AS calls, ROUND(SUM(total_ms), 1) AS total_ms,
+               ROUND(SUM(total_ms) / SUM(calls), 2) AS mean_ms, ROUND(MAX(max_ms), 1) AS max_ms,
+               SUM(rows) AS rows, SUM(slow_calls) AS slow_calls
+        FROM query_stats
+        GROUP BY statement{', call_site' if by_site else ''}
+        ORDER BY {order_by} DESC
+        LIMIT ?
+        """, conn, params=[top])
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    from src.database.database_setup import DatabaseManager
+
+    parser = argparse.ArgumentParser(
+        description=f"Summarize SQL timings recorded with {ENV_ENABLE}=1 (or DatabaseManager(query_stats=True))."
+    )
+    parser.add_argument('command', nargs='?', default='summary', choices=['summary', 'slow', 'reset'])
+    parser.add_argument('--top', type=int, default=20, help="statements to list")
+    parser.add_argument('--order-by', default='total_ms', choices=['total_ms', 'mean_ms', 'max_ms', 'calls', 'rows'])
+    parser.add_argument('--by-statement', action='store_true', help="merge call sites of the same statement")
+    parser.add_argument('--width', type=int, default=100, help="characters of each statement to show")
+    args = parser.parse_args()
+
+    data_dir = os.path.dirname(DatabaseManager(migrate=False).db_path)
+    stats_path = os.path.join(data_dir, 'query_stats.db')
+    slow_log_path = os.path.join(data_dir, 'slow_queries.log')
+
+    if args.command == 'summary':
+        top = summary(stats_path, top=args.top, order_by=args.order_by, by_site=not args.by_statement)
+        if top.empty:
+            print(f"No query stats recorded yet; run with {ENV_ENABLE}=1 to collect them")
+        else:
+            top['statement'] = top['statement'].str.slice(0, args.width)
+            with pd.option_context('display.max_colwidth', args.width, 'display.width', 250):
+                print(top.to_string(index=False))
+    elif args.command == 'slow':
+        if os.path.exists(slow_log_path):
+            with open(slow_log_path) as f:
+                print(f.read()[-20000:])
+        else:
+            print("No slow queries logged")
+    else:
+        for path in (stats_path, slow_log_path):
+            if os.path.exists(path):
+                os.remove(path)
+        print("Query stats cleared")
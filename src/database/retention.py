@@ -0,0 +1,384 @@
+# src/database/retention.py
+
+import argparse
+import glob
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from src.database.caption_search import CaptionSearch
+from src.database.table_stats import TableStats
+
+# Posts and trend scores older than this move to the archive
+DEFAULT_RETENTION_DAYS = 180
+
+# Archived tables and the column that dates their rows; post_terms follow their posts
+DATE_COLUMNS = {'social_posts': 'created_at', 'trend_history': 'date_recorded'}
+ARCHIVE_TABLES = ['social_posts', 'post_terms', 'trend_history']
+
+# Indexes created in each archive file for historical queries
+ARCHIVE_INDEXES = {
+    'idx_archive_posts_created': 'social_posts(created_at)',
+    'idx_archive_post_terms_term': 'post_terms(term_id)'
+}
+
+ARCHIVE_FILE_PATTERN = re.compile(r'^(\d{4})-(\d{2})\.db$')
+
+# Free pages released per transaction by an incremental vacuum; writers get the lock in between
+VACUUM_PAGES_PER_STEP = 2000
+
+
+def month_start(value):
+    """'YYYY-MM-01' of the month a date (or 'YYYY-MM...' string) falls in."""
+    if isinstance(value, str):
+        return value[:7] + '-01'
+    return value.strftime('%Y-%m-01')
+
+
+def next_month(month):
+    """'YYYY-MM-01' of the month after `month` ('YYYY-MM')."""
+    year, number = int(month[:4]), int(month[5:7])
+    return f"{year + number // 12}-{number % 12 + 1:02d}-01"
+
+
+def months_between(start_date, end_date):
+    """'YYYY-MM' strings of every month from start_date to end_date (inclusive)."""
+    month, last = month_start(start_date)[:7], month_start(end_date)[:7]
+    months = []
+    while month <= last:
+        months.append(month)
+        month = next_month(month)[:7]
+    return months
+
+
+class RetentionManager:
+    """Move old posts and trend scores out of the hot database into monthly archive files.
+
+    Each month goes into `<archive_dir>/YYYY-MM.db`, an ordinary SQLite
+    database holding that month's social_posts (with their post_terms) and
+    trend_history rows. Only whole months older than the retention horizon
+    are archived. Rows are copied and committed to the archive before they are
+    deleted from the hot database, so an interrupted run loses nothing and
+    the next run finishes it.
+
+    Historical queries can attach the archives next to the hot tables
+    (attach_archives) or read them file by file (load_history).
+    """
+
+    def __init__(self, db_path, archive_dir=None, retention_days=DEFAULT_RETENTION_DAYS):
+        self.db_path = db_path
+        if archive_dir is None:
+            archive_dir = os.path.join(os.path.dirname(os.path.abspath(db_path)), 'archive')
+        self.archive_dir = archive_dir
+        self.retention_days = retention_days
+
+    def connect(self):
+        # Autocommit: transactions are opened explicitly, and ATTACH can't run inside one
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def cutoff(self, now=None):
+        """First day of the oldest month kept in the hot database."""
+        now = now or datetime.now()
+        return month_start(now - timedelta(days=self.retention_days))
+
+    def archive_path(self, month):
+        return os.path.join(self.archive_dir, f"{month}.db")
+
+    def archived_months(self):
+        """'YYYY-MM' of every archive file, oldest first."""
+        months = []
+        for path in glob.glob(os.path.join(self.archive_dir, '*.db')):
+            match = ARCHIVE_FILE_PATTERN.match(os.path.basename(path))
+            if match:
+                months.append(f"{match.group(1)}-{match.group(2)}")
+        return sorted(months)
+
+    def months_to_archive(self, conn, cutoff):
+        """Months with posts or trend scores dated before the cutoff."""
+        months = set()
+        for table, column in DATE_COLUMNS.items():
+            rows = conn.execute(f"""
+            SELECT DISTINCT strftime('%Y-%m', {column}) FROM {table}
+            WHERE {column} < ? AND strftime('%Y-%m', {column}) IS NOT NULL
+            """, (cutoff,))
+            months.update(month for (month,) in rows)
+        return sorted(months)
+
+    def prepare_archive(self, conn, schema):
+        """Create the archived tables in an attached archive, adding columns the hot tables have gained since."""
+        for table in ARCHIVE_TABLES:
+            create_sql = conn.execute(
+                "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()[0]
+            conn.execute(re.sub(r'^CREATE TABLE\s+("?\w+"?)', f'CREATE TABLE IF NOT EXISTS {schema}.{table}',
+                                create_sql, count=1))
+
+            archived = {row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")}
+            for _, name, column_type, _, _, _ in conn.execute(f"PRAGMA main.table_info({table})"):
+                if name not in archived:
+                    conn.execute(f"ALTER TABLE {schema}.{table} ADD COLUMN {name} {column_type}")
+
+        for name, definition in ARCHIVE_INDEXES.items():
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.{name} ON {definition}")
+
+    def columns(self, conn, table, schema='main'):
+        return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+    def archive_month(self, conn, month):
+        """Copy one month into its archive file, then delete it from the hot database.
+
+        Returns the number of posts and trend rows moved.
+        """
+        os.makedirs(self.archive_dir, exist_ok=True)
+        start, end = f"{month}-01", next_month(month)
+        posts_in_month = "SELECT post_id FROM main.social_posts WHERE created_at >= ? AND created_at < ?"
+
+        conn.execute("ATTACH DATABASE ? AS archive", (self.archive_path(month),))
+        try:
+            self.prepare_archive(conn, 'archive')
+
+            # Only the archive is written here, so the copy commits on its own
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for table in ['social_posts', 'trend_history']:
+                    columns = ', '.join(self.columns(conn, table))
+                    date_column = DATE_COLUMNS[table]
+                    # Trend scores recomputed after an earlier archive run replace the archived ones
+                    conflict = 'REPLACE' if table == 'trend_history' else 'IGNORE'
+                    conn.execute(f"""
+                    INSERT OR {conflict} INTO archive.{table} ({columns})
+                    SELECT {columns} FROM main.{table} WHERE {date_column} >= ? AND {date_column} < ?
+                    """, (start, end))
+                conn.execute(f"""
+                INSERT OR IGNORE INTO archive.post_terms
+                SELECT * FROM main.post_terms WHERE post_id IN ({posts_in_month})
+                """, (start, end))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                missing = conn.execute(f"""
+                SELECT
+                  (SELECT COUNT(*) FROM ({posts_in_month})
+                   WHERE post_id NOT IN (SELECT post_id FROM archive.social_posts)),
+                  (SELECT COUNT(*) FROM main.trend_history
+                   WHERE date_recorded >= ? AND date_recorded < ?
+                     AND trend_id NOT IN (SELECT trend_id FROM archive.trend_history))
+                """, (start, end, start, end)).fetchone()
+                if any(missing):
+                    raise RuntimeError(f"Archive {self.archive_path(month)} is missing {missing[0]} posts "
+                                       f"and {missing[1]} trend rows; nothing was deleted")
+
+                for table in ['post_terms', 'caption_signatures', 'minhash_bands']:
+                    conn.execute(f"DELETE FROM main.{table} WHERE post_id IN ({posts_in_month})", (start, end))
+                # The caption index follows through its delete trigger
+                posts = conn.execute("DELETE FROM main.social_posts WHERE created_at >= ? AND created_at < ?",
+                                     (start, end)).rowcount
+                trends = conn.execute("DELETE FROM main.trend_history WHERE date_recorded >= ? AND date_recorded < ?",
+                                      (start, end)).rowcount
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.execute("DETACH DATABASE archive")
+
+        return posts, trends
+
+    def archive(self, cutoff=None, dry_run=False):
+        """Archive every month before the cutoff (by default, the retention horizon).
+
+        Returns {month: (posts, trend rows)} moved, or that would be moved with dry_run.
+        """
+        cutoff = month_start(cutoff) if cutoff is not None else self.cutoff()
+        conn = self.connect()
+        moved = {}
+        try:
+            for month in self.months_to_archive(conn, cutoff):
+                if dry_run:
+                    start, end = f"{month}-01", next_month(month)
+                    moved[month] = tuple(
+                        conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {column} >= ? AND {column} < ?",
+                                     (start, end)).fetchone()[0]
+                        for table, column in DATE_COLUMNS.items()
+                    )
+                    continue
+
+                started = time.perf_counter()
+                moved[month] = self.archive_month(conn, month)
+                print(f"Archived {month}: {moved[month][0]} posts and {moved[month][1]} trend rows "
+                      f"to {self.archive_path(month)} in {time.perf_counter() - started:.1f}s")
+        finally:
+            conn.close()
+        return moved
+
+    def attach_archives(self, conn, start_date=None, end_date=None):
+        """Attach the archives for a date range to conn and create TEMP views over hot and archived rows.
+
+        The views all_social_posts, all_post_terms and all_trend_history have
+        the hot tables' columns (NULL where an older archive lacks one).
+        SQLite attaches at most 10 databases per connection, so long ranges
+        should use load_history instead. Returns the attached schema names.
+        """
+        months = self.archived_months()
+        if start_date is not None:
+            months = [month for month in months if month >= str(start_date)[:7]]
+        if end_date is not None:
+            months = [month for month in months if month <= str(end_date)[:7]]
+
+        attached = {row[1] for row in conn.execute("PRAGMA database_list")}
+        available = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) - (len(attached) - 2)  # main and temp don't count
+        if len(months) > available:
+            raise ValueError(f"{len(months)} archived months in range but only {available} databases can be "
+                             f"attached; narrow the range or use load_history()")
+
+        schemas = []
+        for month in months:
+            schema = f"archive_{month.replace('-', '_')}"
+            if schema not in attached:
+                conn.execute("ATTACH DATABASE ? AS " + schema, (self.archive_path(month),))
+            schemas.append(schema)
+
+        for table in ARCHIVE_TABLES:
+            columns = self.columns(conn, table)
+            selects = [f"SELECT {', '.join(columns)} FROM main.{table}"]
+            for schema in schemas:
+                archived = set(self.columns(conn, table, schema))
+                selects.append("SELECT " + ', '.join(column if column in archived else f"NULL AS {column}"
+                                                     for column in columns) + f" FROM {schema}.{table}")
+            conn.execute(f"DROP VIEW IF EXISTS temp.all_{table}")
+            conn.execute(f"CREATE TEMP VIEW all_{table} AS " + "\nUNION ALL\n".join(selects))
+
+        return schemas
+
+    def load_history(self, table, start_date=None, end_date=None, columns=None):
+        """Rows of a dated table (social_posts or trend_history) from the hot database and every
+        archive in the range, as one DataFrame. Reads one archive at a time, so any range works."""
+        if table not in DATE_COLUMNS:
+            raise ValueError(f"Can't load history of {table}; choose from: {', '.join(DATE_COLUMNS)}")
+        date_column = DATE_COLUMNS[table]
+
+        conditions, params = [], []
+        if start_date is not None:
+            conditions.append(f"{date_column} >= ?")
+            params.append(str(start_date))
+        if end_date is not None:
+            conditions.append(f"{date_column} < DATE(?, '+1 day')")
+            params.append(str(end_date))
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+        paths = [self.db_path] + [self.archive_path(month) for month in self.archived_months()
+                                  if (start_date is None or month >= str(start_date)[:7])
+                                  and (end_date is None or month <= str(end_date)[:7])]
+        frames = []
+        for path in paths:
+            conn = sqlite3.connect(path)
+            try:
+                selected = ', '.join(columns) if columns else '*'
+                frames.append(pd.read_sql_query(f"SELECT {selected} FROM {table}{where}", conn, params=params))
+            finally:
+                conn.close()
+
+        # Archives made before a column was added lack it; concat fills it with NaN
+        return pd.concat(frames, ignore_index=True).sort_values(date_column, kind='stable', ignore_index=True)
+
+    def maintain(self, full=False, analyze=True):
+        """Reclaim the space freed by archiving and refresh the query planner's statistics.
+
+        Once the database uses auto_vacuum=INCREMENTAL, free pages are released
+        a few thousand at a time, each step a short write transaction, so
+        scrapers can keep writing meanwhile. `full` switches the database to
+        incremental auto-vacuum with a one-off VACUUM, which rewrites the file
+        and blocks writers while it runs.
+        """
+        conn = self.connect()
+        try:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            size_before = conn.execute("PRAGMA page_count").fetchone()[0] * page_size
+            free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+            if full:
+                started = time.perf_counter()
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+                print(f"Vacuumed {self.db_path} in {time.perf_counter() - started:.1f}s")
+            elif conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                while conn.execute("PRAGMA freelist_count").fetchone()[0] > 0:
+                    conn.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES_PER_STEP})").fetchall()
+                    time.sleep(0.01)
+            elif free_pages:
+                print(f"{free_pages} free pages left in place; run with --full once to enable incremental vacuuming")
+
+            # Archiving deletes from the caption index too; merging its segments keeps searches fast
+            CaptionSearch().optimize(conn)
+            if analyze:
+                conn.execute("ANALYZE")
+            # Table and index sizes in table_stats (row counts are kept current by triggers)
+            TableStats().refresh_sizes(conn)
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+            size_after = conn.execute("PRAGMA page_count").fetchone()[0] * page_size
+            print(f"Database size {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB")
+            return size_before, size_after
+        finally:
+            conn.close()
+
+    def status(self):
+        """Rows per table and date range in the hot database and in each archive file, as a DataFrame."""
+        rows = []
+        for month, path in [('hot', self.db_path)] + [(month, self.archive_path(month))
+                                                      for month in self.archived_months()]:
+            conn = sqlite3.connect(path)
+            try:
+                row = {'month': month, 'size_mb': round(os.path.getsize(path) / 1e6, 1)}
+                for table, column in DATE_COLUMNS.items():
+                    count, oldest = conn.execute(f"SELECT COUNT(*), MIN({column}) FROM {table}").fetchone()
+                    row[table] = count
+                    if month == 'hot':
+                        row[f'oldest_{table}'] = oldest
+                rows.append(row)
+            finally:
+                conn.close()
+        return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    from src.database.database_setup import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Archive old posts and trend scores, and compact the database.")
+    parser.add_argument('command', choices=['archive', 'maintain', 'status'])
+    parser.add_argument('--days', type=int, default=DEFAULT_RETENTION_DAYS,
+                        help="keep this many days (rounded to whole months) in the hot database")
+    parser.add_argument('--archive-dir', default=None, help="where monthly archive files go")
+    parser.add_argument('--dry-run', action='store_true', help="show what would be archived")
+    parser.add_argument('--full', action='store_true',
+                        help="maintain: VACUUM the whole file and switch it to incremental vacuuming")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    retention = RetentionManager(db.db_path, archive_dir=args.archive_dir, retention_days=args.days)
+
+    if args.command == 'archive':
+        moved = retention.archive(dry_run=args.dry_run)
+        verb = 'Would archive' if args.dry_run else 'Archived'
+        for month, (posts, trends) in moved.items():
+            if args.dry_run:
+                print(f"{verb} {month}: {posts} posts and {trends} trend rows")
+        print(f"{verb} {sum(posts for posts, _ in moved.values())} posts from {len(moved)} months "
+              f"older than {retention.cutoff()}")
+    elif args.command == 'maintain':
+        retention.maintain(full=args.full)
+    else:
+        print(retention.status().to_string(index=False))
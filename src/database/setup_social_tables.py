@@ -8,19 +8,20 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.append(project_root)
 
 from src.database.database_setup import DatabaseManager
-from src.analysis.social_trend_analyzer import create_social_schema
 
 
 def setup_social_tables():
     """Create social media tables in the database."""
-    db = DatabaseManager()
-    schema_sql = create_social_schema()
+    # The social tables are created by the schema migrations, which DatabaseManager applies
+    db = DatabaseManager(migrate=False)
 
+    conn = None
     try:
+        if not db.setup_database():
+            return
+
         conn = db.create_connection()
         cursor = conn.cursor()
-        cursor.executescript(schema_sql)
-        conn.commit()
         print("Social media tables created successfully")
 
         # Verify tables were created
@@ -38,4 +39,4 @@ def setup_social_tables():
 
 
 if __name__ == "__main__":
-    setup_social_tables()
\ No newline at end of file
+    setup_social_tables()
@@ -0,0 +1,156 @@
+# src/database/table_stats.py
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from src.database.migrations import latest_version
+
+# Triggers that keep table_stats in step with the tracked tables (migration 012)
+STATS_TRIGGER_PREFIX = 'table_stats_'
+
+
+class TableStats:
+    """Row counts, sizes and last-write times per table, read from the table_stats table.
+
+    Triggers on every tracked table keep row_count and last_write_at current
+    as rows are written, so reading them costs the same however big the
+    tables are. Sizes come from the dbstat virtual table, which reads every
+    page; they are only as fresh as the last refresh_sizes().
+    """
+
+    def summary(self, conn):
+        """Stats of every tracked table as a DataFrame, largest first."""
+        return pd.read_sql_query("""
+        SELECT table_name, row_count, last_write_at, table_bytes, index_bytes, sized_at
+        FROM table_stats
+        ORDER BY row_count DESC, table_name
+        """, conn)
+
+    def row_counts(self, conn):
+        """{table: row count} for the tracked tables."""
+        return dict(conn.execute("SELECT table_name, row_count FROM table_stats"))
+
+    def health(self, conn, db_path):
+        """Quick status of the database without scanning any table."""
+        schema_version = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+        total_rows, last_write_at = conn.execute(
+            "SELECT COALESCE(SUM(row_count), 0), MAX(last_write_at) FROM table_stats").fetchone()
+        tracked = {row[0] for row in conn.execute("SELECT table_name FROM table_stats")}
+        untracked = [name for _, name, kind, _, _, _ in conn.execute("PRAGMA main.table_list")
+                     if kind == 'table' and name not in tracked and not name.startswith('sqlite_')
+                     and name not in ('schema_version', 'table_stats')]
+        wal_path = db_path + '-wal'
+        return {
+            'schema_version': schema_version,
+            'pending_migrations': latest_version() - schema_version,
+            'file_bytes': os.path.getsize(db_path),
+            'wal_bytes': os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+            'total_rows': total_rows,
+            'last_write_at': last_write_at,
+            'untracked_tables': untracked
+        }
+
+    def refresh_sizes(self, conn):
+        """Store each tracked table's size and the size of its indexes, measured with dbstat."""
+        sizes = {}
+        for _, table, kind, size in conn.execute("""
+        SELECT s.name, m.tbl_name, m.type, s.pgsize
+        FROM dbstat s
+        JOIN sqlite_master m ON m.name = s.name
+        WHERE s.aggregate = TRUE
+        """):
+            table_bytes, index_bytes = sizes.get(table, (0, 0))
+            if kind == 'index':
+                index_bytes += size
+            else:
+                table_bytes += size
+            sizes[table] = (table_bytes, index_bytes)
+
+        conn.executemany("""
+        UPDATE table_stats SET table_bytes = ?, index_bytes = ?, sized_at = CURRENT_TIMESTAMP
+        WHERE table_name = ?
+        """, [(table_bytes, index_bytes, table) for table, (table_bytes, index_bytes) in sizes.items()])
+        conn.commit()
+
+    def recount(self, conn, tables=None, written_at=None):
+        """Reset row counts from COUNT(*), e.g. after writes made with the triggers suspended.
+
+        With `written_at`, last_write_at is set to it as well.
+        """
+        if tables is None:
+            tables = [row[0] for row in conn.execute("SELECT table_name FROM table_stats")]
+        for table in tables:
+            count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            conn.execute("UPDATE table_stats SET row_count = ?, last_write_at = COALESCE(?, last_write_at) "
+                         "WHERE table_name = ?", (count, written_at, table))
+        if conn.in_transaction:
+            conn.commit()
+
+    def suspend_triggers(self, conn):
+        """Drop the stats triggers (e.g. for a bulk load) and return their SQL for resume_triggers()."""
+        triggers = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE ? ORDER BY name",
+            (STATS_TRIGGER_PREFIX + '%',)
+        ).fetchall()
+        for name, _ in triggers:
+            conn.execute(f"DROP TRIGGER {name}")
+        return [sql for _, sql in triggers]
+
+    def resume_triggers(self, conn, trigger_sql, tables=None, written_at=None):
+        """Recreate suspended triggers and recount the tables written meanwhile (all by default).
+
+        last_write_at of those tables becomes `written_at`, or the current time.
+        """
+        for sql in trigger_sql:
+            conn.execute(sql)
+        if written_at is None:
+            written_at = conn.execute("SELECT CURRENT_TIMESTAMP").fetchone()[0]
+        self.recount(conn, tables, written_at=written_at)
+
+
+def format_bytes(size):
+    if size is None or pd.isna(size):
+        return '-'
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+if __name__ == "__main__":
+    from src.database.database_setup import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Show row counts, sizes and last writes per table, without scanning.")
+    parser.add_argument('--db', default=None, help="database to inspect (default: the project's)")
+    parser.add_argument('--sizes', action='store_true', help="measure table and index sizes first (reads every page)")
+    parser.add_argument('--recount', action='store_true', help="recount every table's rows first (full scans)")
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db)
+    stats = TableStats()
+    with db.connection() as conn:
+        if args.recount:
+            stats.recount(conn)
+        if args.sizes:
+            stats.refresh_sizes(conn)
+
+        health = stats.health(conn, db.db_path)
+        summary = stats.summary(conn)
+
+    for column in ('table_bytes', 'index_bytes'):
+        summary[column] = summary[column].map(format_bytes)
+    print(summary.fillna('-').to_string(index=False))
+    print(f"\n{health['total_rows']:,} rows, file {format_bytes(health['file_bytes'])} "
+          f"(+ {format_bytes(health['wal_bytes'])} WAL), schema version {health['schema_version']}, "
+          f"last write {health['last_write_at'] or 'never'}")
+    if health['pending_migrations']:
+        print(f"{health['pending_migrations']} migrations pending")
+    if health['untracked_tables']:
+        print(f"Not tracked: {', '.join(health['untracked_tables'])}")
@@ -0,0 +1,181 @@
+# src/database/term_store.py
+
+import re
+
+import pandas as pd
+
+# Keywords picked out of captions at ingest (the same list SocialTrendAnalyzer scores)
+CAPTION_KEYWORDS = [
+    'baggy', 'oversized', 'vintage', 'y2k', 'cargo',
+    'platform', 'chunky', 'streetwear', 'aesthetic'
+]
+
+# Comma-separated term columns some sources store on social_posts
+TERM_COLUMNS = {'hashtags': 'hashtag', 'keywords': 'keyword', 'brands': 'brand'}
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+HASHTAG_PATTERN = re.compile(r'#\w+')
+
+
+def split_terms(value, term_type):
+    """Normalized (term, term_type) pairs from a comma-separated column value."""
+    terms = []
+    for term in value.split(','):
+        term = term.strip().lower()
+        if term:
+            terms.append(('#' + term.lstrip('#') if term_type == 'hashtag' else term, term_type))
+    return terms
+
+
+def post_term_rows(posts_df):
+    """Distinct (post_id, term, term_type) rows for a DataFrame of posts with a post_id column.
+
+    Terms come from the hashtags/keywords/brands columns when present, plus
+    hashtags and CAPTION_KEYWORDS found in the caption.
+    """
+    columns = [(posts_df[column].tolist(), term_type)
+               for column, term_type in TERM_COLUMNS.items() if column in posts_df.columns]
+    captions = posts_df['caption'].tolist() if 'caption' in posts_df.columns else None
+
+    # Term columns repeat the same strings a lot; split each distinct value once
+    split_cache = {}
+
+    rows = []
+    for index, post_id in enumerate(posts_df['post_id'].tolist()):
+        post_id = int(post_id)
+        terms = []
+
+        for values, term_type in columns:
+            value = values[index]
+            if value and isinstance(value, str):
+                split = split_cache.get((value, term_type))
+                if split is None:
+                    split = split_cache[(value, term_type)] = split_terms(value, term_type)
+                terms.extend(split)
+
+        caption = captions[index] if captions is not None else None
+        if caption and isinstance(caption, str):
+            caption = caption.lower()
+            terms.extend((tag, 'hashtag') for tag in HASHTAG_PATTERN.findall(caption))
+            terms.extend((keyword, 'keyword') for keyword in CAPTION_KEYWORDS if keyword in caption)
+
+        # dict.fromkeys dedupes in a stable order, so rows are written identically in every process
+        rows.extend((post_id, term, term_type) for term, term_type in dict.fromkeys(terms))
+
+    return rows
+
+
+class TermStore:
+    """Normalized post terms, written once at ingest.
+
+    `terms` is the dictionary of distinct (term, term_type) pairs and
+    `post_terms` links posts to them (tables created by migration 007). Term IDs are cached in memory, so only
+    unseen terms cost a database round trip; callers that roll back a save must call clear_cache().
+    """
+
+    def __init__(self):
+        self.term_ids = {}
+
+    def clear_cache(self):
+        """Forget cached term IDs, e.g. after a rollback: terms inserted in it may get their IDs reused."""
+        self.term_ids = {}
+
+    def resolve_terms(self, cursor, pairs):
+        """Map (term, term_type) pairs to term IDs, inserting unseen ones."""
+        missing = sorted({pair for pair in pairs if pair not in self.term_ids})
+        if missing:
+            cursor.executemany("INSERT OR IGNORE INTO terms (term, term_type) VALUES (?, ?)", missing)
+            terms = sorted({term for term, _ in missing})
+            for start in range(0, len(terms), LOOKUP_CHUNK_SIZE):
+                chunk = terms[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ', '.join('?' * len(chunk))
+                cursor.execute(
+                    f"SELECT term, term_type, term_id FROM terms WHERE term IN ({placeholders})", chunk
+                )
+                for term, term_type, term_id in cursor.fetchall():
+                    self.term_ids[(term, term_type)] = term_id
+
+        return self.term_ids
+
+    def write_post_terms(self, cursor, posts_df):
+        """Extract and store the terms for a DataFrame of posts that has a post_id column.
+
+        Returns the number of post/term links written.
+        """
+        rows = post_term_rows(posts_df)
+        if not rows:
+            return 0
+
+        term_ids = self.resolve_terms(cursor, {(term, term_type) for _, term, term_type in rows})
+        cursor.executemany(
+            "INSERT OR IGNORE INTO post_terms (post_id, term_id, term_type) VALUES (?, ?, ?)",
+            [(post_id, term_ids[(term, term_type)], term_type) for post_id, term, term_type in rows]
+        )
+        return len(rows)
+
+    def write_for_urls(self, cursor, posts):
+        """Store terms for posts (dicts or a DataFrame) already saved, matching them by post_url."""
+        posts_df = pd.DataFrame(posts)
+        if posts_df.empty or 'post_url' not in posts_df.columns:
+            return 0
+
+        urls = posts_df['post_url'].dropna().unique().tolist()
+        post_ids = {}
+        for start in range(0, len(urls), LOOKUP_CHUNK_SIZE):
+            chunk = urls[start:start + LOOKUP_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f"SELECT post_url, post_id FROM social_posts WHERE post_url IN ({placeholders})", chunk)
+            post_ids.update(cursor.fetchall())
+
+        posts_df = posts_df.assign(post_id=posts_df['post_url'].map(post_ids)).dropna(subset=['post_id'])
+        return self.write_post_terms(cursor, posts_df)
+
+    def backfill(self, conn, platform=None, chunk_size=50000):
+        """Extract terms for stored posts that have none yet (e.g. saved before post_terms existed)."""
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(social_posts)")]
+        selected = ['post_id', 'caption'] + [column for column in TERM_COLUMNS if column in columns]
+
+        query = f"""
+        SELECT {', '.join(selected)} FROM social_posts
+        WHERE post_id NOT IN (SELECT post_id FROM post_terms)
+        """
+        params = []
+        if platform is not None:
+            query += " AND platform = ?"
+            params.append(platform)
+
+        cursor = conn.cursor()
+        links = 0
+        for chunk in pd.read_sql_query(query, conn, params=params, chunksize=chunk_size):
+            links += self.write_post_terms(cursor, chunk)
+        conn.commit()
+        return links
+
+    def remove_orphans(self, cursor):
+        """Drop links to posts that no longer exist."""
+        cursor.execute("DELETE FROM post_terms WHERE post_id NOT IN (SELECT post_id FROM social_posts)")
+        return cursor.rowcount
+
+    def term_counts(self, conn, term_type=None, platform=None):
+        """Posts per term as a DataFrame (term, term_type, posts), most mentioned first."""
+        query = """
+        SELECT t.term, t.term_type, COUNT(*) AS posts
+        FROM post_terms pt
+        JOIN terms t ON t.term_id = pt.term_id
+        """
+        conditions, params = [], []
+        if platform is not None:
+            query += " JOIN social_posts sp ON sp.post_id = pt.post_id"
+            conditions.append("sp.platform = ?")
+            params.append(platform)
+        if term_type is not None:
+            conditions.append("pt.term_type = ?")
+            params.append(term_type)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " GROUP BY pt.term_id ORDER BY posts DESC"
+
+        return pd.read_sql_query(query, conn, params=params)
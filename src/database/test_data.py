@@ -2,6 +2,15 @@ import sqlite3
 import pandas as pd
 from sqlalchemy import create_engine
 import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.database.table_stats import TableStats
+
+# Rows shown per table; counts come from table_stats, so large tables are never read in full
+SAMPLE_ROWS = 10
 
 
 def check_database_content(db_path='data/fashion_trends.db'):
@@ -14,34 +23,37 @@ def check_database_content(db_path='data/fashion_trends.db'):
         print(f"Checking database at: {full_db_path}")
 
         conn = sqlite3.connect(full_db_path)
+        counts = TableStats().row_counts(conn)
 
-        # Get all brands
-        brands_df = pd.read_sql_query("SELECT * FROM brands", conn)
-        print("\nBrands:")
+        # Get the first brands
+        brands_df = pd.read_sql_query("SELECT * FROM brands LIMIT ?", conn, params=[SAMPLE_ROWS])
+        print(f"\nBrands ({counts.get('brands', 0)} in total):")
         print(brands_df)
 
-        # Get all categories
-        categories_df = pd.read_sql_query("SELECT * FROM categories", conn)
-        print("\nCategories:")
+        # Get the first categories
+        categories_df = pd.read_sql_query("SELECT * FROM categories LIMIT ?", conn, params=[SAMPLE_ROWS])
+        print(f"\nCategories ({counts.get('categories', 0)} in total):")
         print(categories_df)
 
-        # Get all products
+        # Get the first products
         products_df = pd.read_sql_query("""
             SELECT p.*, b.brand_name, c.category_name 
             FROM products p
             LEFT JOIN brands b ON p.brand_id = b.brand_id
             LEFT JOIN categories c ON p.category_id = c.category_id
-        """, conn)
-        print("\nProducts:")
+            LIMIT ?
+        """, conn, params=[SAMPLE_ROWS])
+        print(f"\nProducts ({counts.get('products', 0)} in total):")
         print(products_df)
 
-        # Get price history
+        # Get the first price history rows
         prices_df = pd.read_sql_query("""
             SELECT ph.*, p.product_name 
             FROM price_history ph
             LEFT JOIN products p ON ph.product_id = p.product_id
-        """, conn)
-        print("\nPrice History:")
+            LIMIT ?
+        """, conn, params=[SAMPLE_ROWS])
+        print(f"\nPrice History ({counts.get('price_history', 0)} in total):")
         print(prices_df)
 
         conn.close()
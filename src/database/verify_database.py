@@ -9,6 +9,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.append(project_root)
 
 from src.database.database_setup import DatabaseManager
+from src.database.table_stats import TableStats
 from sqlalchemy import text
 
 
@@ -26,6 +27,14 @@ def verify_database():
         tables = cursor.fetchall()
         print(f"Database tables: {[t[0] for t in tables]}")
 
+        # Row counts and health come from table_stats instead of counting every table
+        stats = TableStats()
+        health = stats.health(conn, db.db_path)
+        print(f"\nSchema version {health['schema_version']} ({health['pending_migrations']} pending), "
+              f"{health['total_rows']} rows, last write {health['last_write_at'] or 'never'}")
+        for table, count in sorted(stats.row_counts(conn).items()):
+            print(f"  {table}: {count} rows")
+
         # Check social_posts table structure
         cursor.execute("PRAGMA table_info(social_posts);")
         columns = cursor.fetchall()
@@ -33,6 +42,7 @@ def verify_database():
         for col in columns:
             print(f"  {col[1]} ({col[2]})")
 
+        posts_before = stats.row_counts(conn)['social_posts']
         conn.close()
 
         # Test SQLAlchemy connection
@@ -69,6 +79,12 @@ def verify_database():
             conn.commit()
             print("Test data cleanup: SUCCESS")
 
+        # The insert and delete went through the stats triggers, which should leave the count where it was
+        conn = sqlite3.connect(db.db_path)
+        posts_after = stats.row_counts(conn)['social_posts']
+        conn.close()
+        print(f"Row count tracking: {'SUCCESS' if posts_after == posts_before else 'MISMATCH'}")
+
     except Exception as e:
         print(f"Error verifying database: {e}")
 
@@ -0,0 +1,186 @@
+# src/pipeline/dag.py
+
+import hashlib
+import json
+import os
+import pickle
+import time
+
+
+class PipelineStage:
+    """A single step of the pipeline with named inputs and outputs.
+
+    `func` is called with the stage's inputs as keyword arguments and must
+    return a dict with one entry per name in `outputs`.
+
+    `source_fingerprints`, if given, makes the stage a source: it is called
+    with no arguments and returns a fingerprint per output, which is how the
+    pipeline detects changes in data that lives outside the DAG (e.g. tables).
+
+    Stages with `always_run=True` run on every pipeline run (e.g. data
+    collection). Stages with `persist=True` have their outputs pickled to the
+    cache directory so later runs can skip them when their inputs are unchanged.
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), params=None, version=1,
+                 source_fingerprints=None, always_run=False, persist=True):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.params = params or {}
+        self.version = version
+        self.source_fingerprints = source_fingerprints
+        self.always_run = always_run
+        self.persist = persist
+
+
+class Pipeline:
+    """Run PipelineStages in dependency order, skipping stages whose inputs haven't changed.
+
+    Every artifact (stage output) carries a fingerprint. A stage's cache key is
+    derived from its name, version, params and input fingerprints, and its output
+    fingerprints are derived from that key, so a change anywhere upstream
+    propagates downstream without hashing the data itself.
+
+    Artifacts are materialized lazily: a cached stage is only loaded from disk if
+    a downstream stage actually needs to run, and a source stage (e.g. loading
+    tables) is only executed when something consumes its outputs.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.stages = []
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def add_stage(self, stage):
+        """Register a stage. Its inputs must be outputs of previously added stages."""
+        known_outputs = {output for s in self.stages for output in s.outputs}
+        missing = [name for name in stage.inputs if name not in known_outputs]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown inputs: {missing}")
+
+        duplicated = [name for name in stage.outputs if name in known_outputs]
+        if duplicated:
+            raise ValueError(f"Stage '{stage.name}' redefines outputs: {duplicated}")
+
+        self.stages.append(stage)
+        return stage
+
+    def _cache_path(self, stage, key):
+        return os.path.join(self.cache_dir, f"{stage.name}-{key}.pkl")
+
+    def _stage_key(self, stage, fingerprints):
+        payload = json.dumps({
+            'stage': stage.name,
+            'version': stage.version,
+            'params': stage.params,
+            'inputs': {name: fingerprints[name] for name in stage.inputs}
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def _save_outputs(self, stage, key, outputs):
+        # Keep only the latest entry per stage so the cache doesn't grow without bound
+        for filename in os.listdir(self.cache_dir):
+            if filename.startswith(f"{stage.name}-") and filename.endswith('.pkl'):
+                os.remove(os.path.join(self.cache_dir, filename))
+
+        with open(self._cache_path(stage, key), 'wb') as f:
+            pickle.dump(outputs, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def run(self, force=False):
+        """Run the pipeline and return (artifacts, timings).
+
+        `artifacts` maps every materialized output name to its value; `timings`
+        is a list of (stage name, status, seconds) in execution order, where
+        status is 'ran', 'cached' or 'skipped'.
+        """
+        fingerprints = {}
+        artifacts = {}
+        producers = {}
+        keys = {}
+        timings = {}
+
+        def materialize(name):
+            if name not in artifacts:
+                execute(producers[name])
+            return artifacts[name]
+
+        def execute(stage):
+            key = keys[stage.name]
+            cache_path = self._cache_path(stage, key)
+
+            started = time.perf_counter()
+            if stage.persist and not force and not stage.always_run and os.path.exists(cache_path):
+                with open(cache_path, 'rb') as f:
+                    outputs = pickle.load(f)
+                status = 'cached'
+            else:
+                inputs = {name: materialize(name) for name in stage.inputs}
+                # Time the stage itself, not the upstream work pulled in by its inputs
+                started = time.perf_counter()
+                outputs = stage.func(**inputs)
+
+                missing = [name for name in stage.outputs if name not in outputs]
+                if missing:
+                    raise ValueError(f"Stage '{stage.name}' did not produce outputs: {missing}")
+
+                if stage.persist:
+                    self._save_outputs(stage, key, outputs)
+                status = 'ran'
+
+            for name in stage.outputs:
+                artifacts[name] = outputs[name]
+            timings[stage.name] = (status, time.perf_counter() - started)
+
+        for stage in self.stages:
+            for name in stage.outputs:
+                producers[name] = stage
+
+            if stage.source_fingerprints is not None:
+                # Sources are fingerprinted by the data they read, not by their inputs
+                keys[stage.name] = self._stage_key(stage, fingerprints)
+                source_fps = stage.source_fingerprints()
+                for name in stage.outputs:
+                    fingerprints[name] = f"{stage.name}:{source_fps[name]}"
+                continue
+
+            key = self._stage_key(stage, fingerprints)
+            keys[stage.name] = key
+
+            if stage.always_run:
+                # Stages with side effects run eagerly, before anything downstream is fingerprinted
+                execute(stage)
+                run_id = time.time_ns()
+                for name in stage.outputs:
+                    fingerprints[name] = f"{key}:{name}:{run_id}"
+                continue
+
+            for name in stage.outputs:
+                fingerprints[name] = f"{key}:{name}"
+
+            cached = stage.persist and not force and os.path.exists(self._cache_path(stage, key))
+            if not cached:
+                execute(stage)
+
+        # Cached stages nobody needed to load still count as satisfied from cache
+        for stage in self.stages:
+            if stage.name not in timings:
+                cached = stage.persist and not force and stage.source_fingerprints is None
+                timings[stage.name] = ('cached' if cached else 'skipped', 0.0)
+
+        ordered_timings = [(stage.name,) + timings[stage.name] for stage in self.stages]
+        return artifacts, ordered_timings
+
+
+def print_timings(timings):
+    """Print a per-stage timing table."""
+    total = sum(seconds for _, _, seconds in timings)
+
+    print("\nPipeline stage timings:")
+    print("-" * 40)
+    for name, status, seconds in timings:
+        print(f"{name:<15} {status:<8} {seconds:>8.2f}s")
+    print("-" * 40)
+    print(f"{'total':<24} {total:>8.2f}s")
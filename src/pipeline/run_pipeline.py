@@ -0,0 +1,217 @@
+# src/pipeline/run_pipeline.py
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from src.database.database_setup import DatabaseManager
+from src.data_collection.enhanced_data_generator import EnhancedFashionDataGenerator
+from src.analysis.social_trend_analyzer import SocialTrendAnalyzer
+from src.analysis.run_trend_analysis import (
+    count_social_posts, score_social_trends, save_trend_scores, print_trend_report, create_trend_visualizations
+)
+from src.analysis.trend_predictor import FashionTrendPredictor
+from src.visualization.chart_renderer import ChartRenderer
+from src.pipeline.dag import Pipeline, PipelineStage, print_timings
+
+SOURCE_TABLES = ['social_posts', 'trend_history']
+
+# Unique key of trend_history rows
+TREND_KEY = ['trend_name', 'platform', 'date_recorded']
+
+
+def table_fingerprint(conn, table):
+    """Cheap change marker for a table: row count plus the highest rowid."""
+    try:
+        count, max_rowid = conn.execute(f"SELECT COUNT(*), MAX(rowid) FROM {table}").fetchone()
+        return f"{count}-{max_rowid}"
+    except Exception:
+        return 'missing'
+
+
+def table_watermarks(db):
+    """Highest rowid per source table, used to split stored rows from freshly generated ones."""
+    conn = db.create_connection()
+    watermarks = {}
+    for table in SOURCE_TABLES:
+        try:
+            watermarks[table] = conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0] or 0
+        except Exception:
+            watermarks[table] = 0
+    conn.close()
+    return watermarks
+
+
+def build_pipeline(db, collect=False, days=60, num_posts=100, prediction_days=14, cache_dir=None,
+                   renderer=None):
+    """Build the collect -> count/load -> analyze -> predict -> visualize pipeline.
+
+    If a ChartRenderer is given, the visualize stage only queues its charts on it.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(project_root, 'data', 'pipeline_cache')
+
+    pipeline = Pipeline(cache_dir)
+
+    trend_inputs = []
+    if collect:
+        def collect_stage():
+            generator = EnhancedFashionDataGenerator(db)
+            trend_df = generator.generate_trend_history(days=days)
+            posts_df = generator.generate_social_posts(num_posts=num_posts)
+
+            # Remember what was stored before this run so load doesn't read the new rows back
+            watermarks = table_watermarks(db)
+            generator.write_to_database(trend_df, posts_df)
+            print(f"Generated {len(trend_df)} trend records and {len(posts_df)} social posts")
+
+            return {'generated_trends': trend_df, 'watermarks': watermarks}
+
+        pipeline.add_stage(PipelineStage(
+            'collect', collect_stage,
+            outputs=['generated_trends', 'watermarks'],
+            params={'days': days, 'num_posts': num_posts},
+            always_run=True, persist=False
+        ))
+        trend_inputs = ['generated_trends', 'watermarks']
+
+    def table_fingerprints(table, output):
+        """Source fingerprint function reporting `table`'s change marker as `output`."""
+        def fingerprints():
+            conn = db.create_connection()
+            fingerprint = table_fingerprint(conn, table)
+            conn.close()
+            return {output: fingerprint}
+
+        return fingerprints
+
+    def source_stage(table, generated_name, key):
+        """Stage function and fingerprint for reading one source table with unique columns `key`."""
+        fingerprints = table_fingerprints(table, table)
+
+        def load(watermarks=None, **generated):
+            conn = db.create_connection()
+            query = f"SELECT * FROM {table}"
+            if watermarks is not None:
+                query += f" WHERE rowid <= {int(watermarks[table])}"
+            frame = pd.read_sql_query(query, conn)
+            conn.close()
+
+            # Freshly generated rows are appended in memory instead of being read back. They were
+            # written with INSERT OR IGNORE, so where a key repeats the row stored first is kept
+            if generated.get(generated_name) is not None:
+                frame = pd.concat([frame, generated[generated_name]], ignore_index=True)
+                frame = frame.drop_duplicates(subset=key, keep='first', ignore_index=True)
+
+            print(f"Loaded {len(frame)} rows from {table}")
+            return {table: frame}
+
+        return load, fingerprints
+
+    # Scoring reads the terms stored with the posts, so only the number of posts is loaded here
+    def count_posts():
+        total_posts = count_social_posts(db)
+        print(f"Found {total_posts} posts in social_posts")
+        return {'total_posts': total_posts}
+
+    pipeline.add_stage(PipelineStage(
+        'count_posts', count_posts, outputs=['total_posts'],
+        source_fingerprints=table_fingerprints('social_posts', 'total_posts'), persist=False
+    ))
+
+    def analyze_stage(total_posts):
+        if total_posts == 0:
+            print("No posts found. Please run the scrapers first.")
+            return {'trend_scores': {}, 'report': None, 'new_trend_rows': pd.DataFrame()}
+
+        analyzer = SocialTrendAnalyzer(db)
+        trend_scores, report = score_social_trends(analyzer, total_posts)
+        print_trend_report(trend_scores, report)
+        new_trend_rows = save_trend_scores(db, trend_scores)
+
+        return {'trend_scores': dict(trend_scores), 'report': report, 'new_trend_rows': new_trend_rows}
+
+    pipeline.add_stage(PipelineStage(
+        'analyze', analyze_stage, inputs=['total_posts'],
+        outputs=['trend_scores', 'report', 'new_trend_rows'], version=3
+    ))
+
+    # analyze writes trend_history, so the table is fingerprinted after it has run;
+    # otherwise every run following an analysis would see a change and re-run predict
+    load_trends, trend_fingerprints = source_stage('trend_history', 'generated_trends', TREND_KEY)
+    pipeline.add_stage(PipelineStage(
+        'load_trends', load_trends, inputs=trend_inputs, outputs=['trend_history'],
+        source_fingerprints=trend_fingerprints, persist=False
+    ))
+
+    def predict_stage(trend_history, new_trend_rows):
+        # The analyze stage's rows are merged in memory rather than reloaded from trend_history
+        trend_df = pd.concat([trend_history, new_trend_rows], ignore_index=True)
+        # analyze upserts its scores, so they replace stored rows with the same key
+        trend_df = trend_df.drop_duplicates(subset=TREND_KEY, keep='last')
+
+        predictor = FashionTrendPredictor(db)
+        if not predictor.train_models(trend_df=trend_df):
+            return {'predictions': None}
+
+        return {'predictions': predictor.predict_future_trends(days=prediction_days, trend_df=trend_df)}
+
+    pipeline.add_stage(PipelineStage(
+        'predict', predict_stage, inputs=['trend_history', 'new_trend_rows'], outputs=['predictions'],
+        params={'prediction_days': prediction_days}
+    ))
+
+    def visualize_stage(trend_scores, report, predictions):
+        chart_paths = []
+        if trend_scores and report is not None:
+            chart_paths.extend(create_trend_visualizations(trend_scores, report, renderer=renderer))
+
+        predictor = FashionTrendPredictor(db)
+        prediction_chart = predictor.visualize_predictions(predictions, renderer=renderer)
+        if prediction_chart:
+            chart_paths.append(prediction_chart)
+
+        return {'chart_paths': chart_paths}
+
+    pipeline.add_stage(PipelineStage(
+        'visualize', visualize_stage, inputs=['trend_scores', 'report', 'predictions'],
+        outputs=['chart_paths'], version=2
+    ))
+
+    return pipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the fashion trend pipeline end to end.")
+    parser.add_argument('--collect', action='store_true', help="generate new synthetic data before analysis")
+    parser.add_argument('--days', type=int, default=60, help="days of trend history to generate")
+    parser.add_argument('--num-posts', type=int, default=100, help="number of social posts to generate")
+    parser.add_argument('--prediction-days', type=int, default=14, help="days ahead to predict")
+    parser.add_argument('--force', action='store_true', help="ignore the stage cache and run every stage")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    renderer = ChartRenderer(os.path.join(project_root, 'data', 'visualizations'))
+    pipeline = build_pipeline(
+        db, collect=args.collect, days=args.days, num_posts=args.num_posts,
+        prediction_days=args.prediction_days, renderer=renderer
+    )
+
+    artifacts, timings = pipeline.run(force=args.force)
+    print_timings(timings)
+
+    # Charts render in the background while the pipeline runs; wait for any still in flight
+    manifest = renderer.wait()
+    renderer.close()
+    if manifest['images']:
+        print(f"\nRendered {len(manifest['images'])} charts, manifest at {manifest['manifest_path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# src/visualization/chart_renderer.py
+
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import matplotlib
+from matplotlib.figure import Figure
+import seaborn as sns
+
+
+def top_trends_figure(trend_scores):
+    """Bar chart of the top 10 trends by score."""
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+
+    trends = sorted(trend_scores.items(), key=lambda x: x[1], reverse=True)[:10]
+    x = [t[0] for t in trends]
+    y = [t[1] for t in trends]
+
+    bars = ax.bar(x, y, color=sns.color_palette("viridis", len(trends)))
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    ax.set_title('Top Fashion Trends by Score', fontsize=16)
+    ax.set_xlabel('Trend', fontsize=14)
+    ax.set_ylabel('Score', fontsize=14)
+
+    # Add value labels
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2., height + 0.1,
+                f'{height:.2f}', ha='center', va='bottom', fontsize=10)
+
+    fig.tight_layout()
+    return fig
+
+
+def trend_categories_figure(category_scores):
+    """Pie chart of summed trend scores per category."""
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
+
+    ax.pie(
+        list(category_scores.values()),
+        labels=list(category_scores.keys()),
+        autopct='%1.1f%%',
+        colors=sns.color_palette("viridis", len(category_scores))
+    )
+    ax.set_title('Fashion Trends by Category', fontsize=16)
+    ax.axis('equal')
+    fig.tight_layout()
+    return fig
+
+
+def trend_predictions_figure(predictions_df):
+    """Line chart of predicted scores for the top 10 trends."""
+    fig = Figure(figsize=(14, 10))
+    ax = fig.subplots()
+
+    # Get top predicted trends
+    top_trends = (
+        predictions_df[predictions_df['days_ahead'] == predictions_df['days_ahead'].max()]
+        .sort_values('predicted_score', ascending=False)
+        .head(10)['trend_name'].unique()
+    )
+
+    for trend in top_trends:
+        trend_data = predictions_df[predictions_df['trend_name'] == trend]
+        ax.plot(trend_data['days_ahead'], trend_data['predicted_score'], marker='o', linewidth=2, label=trend)
+
+    ax.set_title('Fashion Trend Prediction', fontsize=16)
+    ax.set_xlabel('Days in Future', fontsize=14)
+    ax.set_ylabel('Predicted Score', fontsize=14)
+    ax.legend(loc='best')
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def category_distribution_figure(category_counts):
+    """Pie chart of the number of products per category."""
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
+
+    ax.pie(category_counts.values, labels=category_counts.index, autopct='%1.1f%%')
+    ax.set_title('Distribution of Products by Category')
+    ax.axis('equal')
+    return fig
+
+
+def price_range_by_category_figure(price_df):
+    """Box plot of price ranges per category."""
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+
+    sns.boxplot(data=price_df, x='category_name', y='price', ax=ax)
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.set_title('Price Range by Category')
+    ax.set_xlabel('Category')
+    ax.set_ylabel('Price ($)')
+    fig.tight_layout()
+    return fig
+
+
+CHART_BUILDERS = {
+    'top_trends': top_trends_figure,
+    'trend_categories': trend_categories_figure,
+    'trend_predictions': trend_predictions_figure,
+    'category_distribution': category_distribution_figure,
+    'price_range_by_category': price_range_by_category_figure
+}
+
+
+def init_worker():
+    """Select the non-interactive backend in each worker process, which has no display.
+
+    Only the workers switch backends, so importing this module leaves the
+    caller's own backend (e.g. a notebook's) alone.
+    """
+    matplotlib.use('Agg')
+
+
+def render_chart(chart_type, path, data):
+    """Build a chart and save it to `path`. Runs inside a worker process."""
+    fig = CHART_BUILDERS[chart_type](data)
+    fig.savefig(path)
+    return path
+
+
+class ChartRenderer:
+    """Render charts in a background process pool.
+
+    Jobs are queued with `submit` and rendered off the caller's critical path.
+    Once every queued job has finished, a JSON manifest of the images is written
+    to the output directory. `wait` blocks until then and returns the manifest.
+    """
+
+    def __init__(self, output_dir, max_workers=None, manifest_name='manifest.json'):
+        self.output_dir = output_dir
+        self.manifest_path = os.path.join(output_dir, manifest_name)
+        self.executor = ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker)
+
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.results = []
+        self.done = threading.Event()
+        self.done.set()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def submit(self, chart_type, filename, data):
+        """Queue a chart for rendering and return its output path.
+
+        `filename` is relative to the output directory unless it is absolute.
+        """
+        if chart_type not in CHART_BUILDERS:
+            raise ValueError(f"Unknown chart type: {chart_type}")
+
+        path = os.path.join(self.output_dir, filename)
+        with self.lock:
+            self.pending += 1
+            self.done.clear()
+
+        future = self.executor.submit(render_chart, chart_type, path, data)
+        future.add_done_callback(lambda f: self._job_finished(chart_type, path, f))
+        return path
+
+    def _job_finished(self, chart_type, path, future):
+        error = future.exception()
+        entry = {
+            'chart_type': chart_type,
+            'path': path,
+            'status': 'error' if error else 'ok',
+            'finished_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        if error:
+            entry['error'] = str(error)
+            print(f"Error rendering {chart_type} chart: {error}")
+
+        with self.lock:
+            self.results.append(entry)
+            self.pending -= 1
+            if self.pending == 0:
+                self._write_manifest()
+                self.done.set()
+
+    def _write_manifest(self):
+        manifest = {
+            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'images': sorted(self.results, key=lambda entry: entry['path'])
+        }
+        with open(self.manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=4)
+
+    def wait(self, timeout=None):
+        """Block until all queued charts are rendered and return the manifest."""
+        self.done.wait(timeout)
+        with self.lock:
+            return {'manifest_path': self.manifest_path, 'images': list(self.results)}
+
+    def close(self):
+        """Wait for outstanding jobs and shut down the worker processes."""
+        self.wait()
+        self.executor.shutdown()
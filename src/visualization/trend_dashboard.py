@@ -5,7 +5,6 @@ from dash import dcc, html
 from dash.dependencies import Input, Output
 import plotly.express as px
 import plotly.graph_objects as go
-import pandas as pd
 import sqlite3
 import os
 import sys
@@ -20,24 +19,21 @@ from src.database.database_setup import DatabaseManager
 # Initialize the Dash app
 app = dash.Dash(__name__, title="Fashion Trend Analyzer")
 
-# Database connection
-db = DatabaseManager()
+# Database connection; read-only, so refreshes never hold up a scraper that is writing.
+# Set FASHION_TRENDS_ANALYTICS_BACKEND=duckdb to run the queries on a DuckDB snapshot instead.
+db = DatabaseManager(profile='analytics')
 
 
 # Get the data
 def get_trend_data():
     """Get trend data from the database."""
-    conn = db.create_connection()
-
     # Get trend history
     trend_query = "SELECT * FROM trend_history ORDER BY date_recorded DESC, score DESC"
-    trend_df = pd.read_sql_query(trend_query, conn)
+    trend_df = db.read_frame(trend_query)
 
     # Get social posts
     posts_query = "SELECT * FROM social_posts"
-    posts_df = pd.read_sql_query(posts_query, conn)
-
-    conn.close()
+    posts_df = db.read_frame(posts_query)
 
     return trend_df, posts_df
 